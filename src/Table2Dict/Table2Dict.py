@@ -6,14 +6,58 @@ to a raw list.
 """
 
 from .utils.customLogging import moduleLogging
-from bs4 import BeautifulSoup
+from .incremental import createSnapshot, updateSnapshot
+from .sparseGrid import SpanColumn, SparseGrid
+from .validation import validateTable
+from .tableIndex import TableIndex
+from .records import recordType, tableKeys, iterRows, iterRecords
+from .headerMemo import headerMemo, headerKey
+from .watchdog import watched
 from collections import namedtuple, OrderedDict
-import json
-import bs4
+from types import MappingProxyType
+import sys
+import os
+
+# Note : bs4, json and modules of optional features (wikitext, parallel, spill) are imported when first needed (in methods),
+# importing this module stays cheap.
 
 # Set up logging for module
 logger = moduleLogging()
 
+
+def isSpilledColumn(column):
+    """
+    Returns True if column is a `spill.SpilledColumn` (spill module is only imported by tables over memory budget).
+    """
+    spill = sys.modules.get(f"{__package__}.spill")
+    return spill != None and isinstance(column, spill.SpilledColumn)
+
+
+class TableResult(namedtuple("TableResult", ["tableType", "header", "body"])):
+    """
+    Immutable resolved table (returned by `Table.getTableResult()`), safe to share between threads or to cache.
+
+    Attributes
+    ----------
+        `tableType` : `<class 'mappingproxy'>`
+            Read-only table infos (see `Table.getTableType()`)
+
+        `header` : `tuple`
+            Table header columns as tuples (see `Table.getTableHeader()`)
+
+        `body` : `tuple`
+            Table body columns as tuples (see `Table.getTableBody()`)
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, tableType, header, body):
+        return super().__new__(cls, MappingProxyType(dict(tableType)), header, body)
+
+    def __reduce__(self):
+        # Mapping proxies can't be pickled, pickle a plain dict instead
+        return (TableResult, (dict(self.tableType), self.header, self.body))
+
 class Table:
     """
     Class that is capable of converting an html table (1D or 2D) in a list or a dictionnary or simply give informations about passed table.
@@ -28,6 +72,22 @@ class Table:
         `table` : `<class 'str'>`
             Absolute path to html file containing the table (only one table at the time)
 
+        `table` : `WikiTable`
+            Table parsed from MediaWiki wikitext (see `fromWikitext`)
+
+        `maxRowspan` / `maxColspan` : `<class 'int'>`
+            Caps of cell spans, bigger spans are clamped (defaults to html standard maximums, None to disable)
+
+        `parser` : `<class 'str'>`
+            BS4 parser used to parse html file, "html.parser" (default) or "lxml" for instance
+
+        `workers` : `<class 'int'>`
+            Number of threads resolving table body of very large tables on free-threaded Python builds (see `parallel` module), None
+            (default) to resolve it sequentially. It's ignored when the GIL is enabled (threads can't speed up body resolution)
+
+        `memoryBudget` : `<class 'int'>`
+            Bytes a resolved table body may use, bigger bodies are spilled to disk (see `spill` module), None (default) for no budget
+
     Methods
     -------
         `getTableType`
@@ -47,30 +107,120 @@ class Table:
 
         `getTableJson` : indent = <n>
             Returns a json object with chosen indent.
+
+        `getTableSnapshot` : dictType="normal" (default) OR dictType="ordered"
+            Returns converted dictionnary along with per-row hashes, to later re-convert only what changed with `getTableUpdate`.
+
+        `getTableUpdate` : previousSnapshot
+            Returns a new snapshot and a row-level diff, re-using unchanged rows of previous snapshot.
+
+        `getTableResult`
+            Returns immutable `TableResult` (table type, header & body as tuples), safe to share between threads.
+
+        `validate`
+            Returns a `ValidationReport` with structural diagnostics of table, without converting it.
+
+        `getTableRecords` / `iterTableRecords`
+            Returns (or streams) table body as per-row records sharing one key schema (named tuples).
+
+        `column` / `row` / `cell`
+            Look up a body column, a row or a cell by key without building table dictionnary (see `getTableIndex`).
+
+        `getMemoryStats`
+            Returns memory budget, spill infos & resident memory of table conversion.
+
+        `fromWikitext` : wikitext, index=0
+            Creates a table straight from MediaWiki wikitext markup (no html rendering or parsing).
+
+    > Note : Table is resolved only once and kept in an immutable cache, all methods can be called concurrently from several threads
+    and returned lists are always new ones (caller can modify them).
     """
 
-    def __init__(self, table):
-        # 1. Determine if passed arg is of type beautiful soup
-        if isinstance(table, bs4.element.Tag):
+    # Default caps of spans (maximum values allowed by html standard)
+    MAX_ROWSPAN = 65534
+    MAX_COLSPAN = 1000
+
+    def __init__(
+        self,
+        table,
+        maxRowspan=MAX_ROWSPAN,
+        maxColspan=MAX_COLSPAN,
+        parser="html.parser",
+        workers=None,
+        memoryBudget=None,
+    ):
+        # Wikitext tables don't go through bs4 at all (a `WikiTable` can only exist once wikitext module is imported)
+        wikitext = sys.modules.get(f"{__package__}.wikitext")
+        isWikiTable = wikitext != None and isinstance(table, wikitext.WikiTable)
+        if not isWikiTable:
+            import bs4
+
+        # 1. Determine if passed arg is a table parsed from wikitext (see `fromWikitext()`)
+        if isWikiTable:
+            logger.info("Passed argument type is 'WikiTable'")
+            self.table = table
+        # 2. Determine if passed arg is of type beautiful soup
+        elif isinstance(table, bs4.element.Tag):
             logger.info("Passed argument type is 'bs4.element.Tag'")
             self.table = table
-        # 2. Determine if passed arg is an html file
+        # 3. Determine if passed arg is an html file
         elif isinstance(table, str):
             logger.info(f"Passed argument type is 'str'. Passed argument : '{table}'")
             # Absolute path or file
             filename = table
             # Open html file
             with open(filename, "r") as htmlTestFile:
-                soup = BeautifulSoup(htmlTestFile, "html.parser")
+                soup = bs4.BeautifulSoup(htmlTestFile, parser)
             # Get table tag in soup
             self.table = soup.find("table")
         else:
             logger.error(f"{type(table)} argument type was a valid type !")
             raise TypeError(
-                f"{type(table)} argument type is not a valid type ! Type of class can be either 'str' or 'bs4.BeautifulSoup'"
+                f"{type(table)} argument type is not a valid type ! Type of class can be either 'str', 'bs4.BeautifulSoup' or 'WikiTable'"
             )
-        # 3. Extract rows (<tr>) from table soup
+        # 4. Extract rows (<tr>) from table soup
         self.allRows = self.table.find_all("tr")
+        # 5. Caps of spans (None to disable)
+        self.maxRowspan = maxRowspan
+        self.maxColspan = maxColspan
+        self.workers = workers
+        # Default budget is read from environment (`spill.MEMORY_BUDGET_ENV`), spill module is only imported if it's set
+        if memoryBudget == None and os.environ.get("TABLE2DICT_MEMORY_BUDGET"):
+            from .spill import DEFAULT_MEMORY_BUDGET as memoryBudget
+        self.memoryBudget = memoryBudget
+        # 6. Cache of resolved table parts, values are immutable so concurrent readers never see a partial result
+        # (worst case two threads resolve the same part at the same time and store equal values)
+        self.cache = {}
+
+    @classmethod
+    def fromWikitext(cls, wikitext, index=0, **kwargs):
+        """
+        Creates a table from MediaWiki wikitext, without any html rendering or parsing (see `wikitext` module).
+
+        Params
+        ------
+        wikitext : `str`
+            Wikitext of a page or of a table.
+
+        index : `int`
+            Index of table in page (first table by default).
+
+        **kwargs
+            Keyword arguments passed to `Table` (`maxRowspan`, `maxColspan`, `workers`).
+
+        Returns
+        -------
+        `Table`
+            Table object, all methods behave as with the html table.
+        """
+        from .wikitext import parseWikitext
+
+        tables = parseWikitext(wikitext)
+        if not -len(tables) <= index < len(tables):
+            raise ValueError(
+                f"No table at index {index} in wikitext ({len(tables)} table(s) found) !"
+            )
+        return cls(tables[index], **kwargs)
 
     # ===================================== #
     # ========= UTILITY FUNCTIONS ========= #
@@ -128,15 +278,22 @@ class Table:
         return resTable
 
     @staticmethod
-    def getSpans(cell):
+    def getSpans(cell, maxRowspan=None, maxColspan=None):
         """
-        This function returns number of rowspan or colspan from a given cell.
+        This function returns number of rowspan or colspan from a given cell. Spans bigger than given caps are clamped to
+        caps (like browsers do) to avoid any memory blow-up with a huge span.
 
         Params
         ------
         cell : `<class 'bs4.element.Tag'>`
             BS4 cell from table (like `<th rowspan="2">Year</th>`).
 
+        maxRowspan : `int`
+            Optional cap of rowspan.
+
+        maxColspan : `int`
+            Optional cap of colspan.
+
         Returns
         -------
         tuple
@@ -144,10 +301,62 @@ class Table:
         """
         rowspan = int(cell.get("rowspan")) if (cell.get("rowspan") != None) else None
         colspan = int(cell.get("colspan")) if (cell.get("colspan") != None) else None
+        if maxRowspan != None and rowspan != None and rowspan > maxRowspan:
+            logger.warning(f"Rowspan {rowspan} is over cap, clamped to {maxRowspan}")
+            rowspan = maxRowspan
+        if maxColspan != None and colspan != None and colspan > maxColspan:
+            logger.warning(f"Colspan {colspan} is over cap, clamped to {maxColspan}")
+            colspan = maxColspan
         return (rowspan, colspan)
 
     @staticmethod
-    def insertRows(cell_data, rowSpan, colSpan, row_index, table_repr, whichRow):
+    def cellText(cell):
+        """
+        This function returns text content of a given cell cleaned of new line chars.
+
+        Params
+        ------
+        cell : `<class 'bs4.element.Tag'>`
+            BS4 cell from table (like `<th rowspan="2">Year</th>`).
+
+        Returns
+        -------
+        str
+            Cleaned cell text
+        """
+        return cell.text.replace("\n", "")
+
+    @staticmethod
+    def repeatCell(columnList, cellText, count, index=None):
+        """
+        This function inserts cell text `count` times in a column (rowspans). Text is appended at the end of column, or inserted at
+        `index` if column already goes further than `index`. A `SpanColumn` stores repeated text only once.
+
+        Params
+        ------
+        columnList : `list` or `SpanColumn`
+            Column where text is inserted.
+
+        cellText : `str`
+            Cleaned cell text.
+
+        count : `int`
+            Number of times text is inserted.
+
+        index : `int`
+            Optional index where text is inserted (default is at the end of column).
+        """
+        if index == None or index >= len(columnList):
+            index = len(columnList)
+        if isinstance(columnList, SpanColumn):
+            columnList.insertRun(index, cellText, count)
+        else:
+            columnList[index:index] = [cellText] * count
+
+    @staticmethod
+    def insertRows(
+        cell_data, rowSpan, colSpan, row_index, table_repr, whichRow, newColumn=list
+    ):
         """
         This utility method is the core of both `getTableHeader()` and `getTableHeader()` methods, it's here to keep code as DRY as possible.
         It insert cell data (content cleaned of any new line char) in given table list reprentation and take into account if there's rowspan
@@ -157,7 +366,7 @@ class Table:
         Params
         ------
         `cell` : `<class 'bs4.element.Tag'>`
-            BS4 cell from table (like `<th rowspan="2">Year</th>`).
+            BS4 cell from table (like `<th rowspan="2">Year</th>`) or its already cleaned text.
 
         `rowSpan` : `int`
             Rowspan attribute of cell (number of rowpsan).
@@ -177,68 +386,88 @@ class Table:
             - Select `firstBodyRow` if this is the very first row of table body.
             - Select `bodyRow` if this is the second (or following) row of table body.
 
+        `newColumn` : `type`
+            Type of created column lists, either `list` (default) or `SpanColumn` for a sparse table representation.
+
         Returns
         -------
         tuple
             Tuple with rowspan and colspan (return None if there's no rowspan/colspan)
         """
-        logger.debug(f"-------------------------------------")
-        logger.debug(f"[START] Entered insertRows() method !")
+        logger.debug("-------------------------------------")
+        logger.debug("[START] Entered insertRows() method !")
+        # Lazy formatting, table representation is only turned to string if debug logging is enabled
         logger.debug(
-            f"[PARAMS] cell : {cell_data}, rowspan/colspan : {rowSpan}/{colSpan}, row index {row_index}, table : {table_repr}, which row : {whichRow}"
+            "[PARAMS] cell : %s, rowspan/colspan : %s/%s, row index %s, table : %s, which row : %s",
+            cell_data,
+            rowSpan,
+            colSpan,
+            row_index,
+            table_repr,
+            whichRow,
         )
         # Clean cell and convert to text
-        cleanedCell = cell_data.text.replace("\n", "")
+        if type(cell_data) is str:
+            cleanedCell = cell_data
+        else:
+            cleanedCell = Table.cellText(cell_data)
         # === CONDITION TREE === #
         if whichRow == "firstHeaderRow":
-            logger.debug(f"[*] TEST CELL {cell_data}")
+            logger.debug("[*] TEST CELL %s", cell_data)
             # === CASE 1 - Normal cell with NO rowspans and NO colspan === #
             if rowSpan == None and colSpan == None:
-                logger.debug(f"[*] CASE 1 - NO ROWSPAN, NO COLSPAN")
-                columnReprList = []
+                logger.debug("[*] CASE 1 - NO ROWSPAN, NO COLSPAN")
+                columnReprList = newColumn()
                 columnReprList.append(cleanedCell)
                 table_repr.append(columnReprList)
                 logger.debug(
-                    f"[OK] Value '{cleanedCell}' inserted in table list representation !"
+                    "[OK] Value '%s' inserted in table list representation !",
+                    cleanedCell,
                 )
             # === CASE 2 - Cell WITH rowspan BUT NO colspan === #
             elif rowSpan != None and colSpan == None:
-                logger.debug(f"[*] CASE 2 - ROWSPAN, NO COLSPAN")
-                columnReprList = []
+                logger.debug("[*] CASE 2 - ROWSPAN, NO COLSPAN")
+                columnReprList = newColumn()
                 # Insert element n times in column list representation according to rowspan
-                for i in range(rowSpan):
-                    columnReprList.append(cleanedCell)
+                Table.repeatCell(columnReprList, cleanedCell, rowSpan)
                 table_repr.append(columnReprList)
                 logger.debug(
-                    f"[OK] Value '{cleanedCell}' inserted {rowSpan} times in table list representation !"
+                    "[OK] Value '%s' inserted %s times in table list representation !",
+                    cleanedCell,
+                    rowSpan,
                 )
             # === CASE 3 - Cell WITH colspan BUT NO rowspan === #
             elif colSpan != None and rowSpan == None:
-                logger.debug(f"[*] CASE 3 - COLSPAN, NO ROWSPAN")
+                logger.debug("[*] CASE 3 - COLSPAN, NO ROWSPAN")
                 # Create new column list with element n times (depending on colspans)
                 for i in range(colSpan):
-                    columnReprList = []
+                    columnReprList = newColumn()
                     columnReprList.append(cleanedCell)
                     table_repr.append(columnReprList)
                     logger.debug(
-                        f"[OK] Value '{cleanedCell}' inserted in {colSpan} columns in table list representation !"
+                        "[OK] Value '%s' inserted in %s columns in table list representation !",
+                        cleanedCell,
+                        colSpan,
                     )
             # === CASE 4 - Cell WITH colspan AND rowspan === #
             elif colSpan != None and rowSpan != None:
-                logger.debug(f"\t[*] CASE 4 - COLSPAN, ROWSPAN")
+                logger.debug("\t[*] CASE 4 - COLSPAN, ROWSPAN")
                 # Create new column list with element n times (depending on colspans)
                 for i in range(colSpan):
-                    columnReprList = []
+                    columnReprList = newColumn()
                     # Insert element in column list n times (depending on rowspan)
-                    for j in range(rowSpan):
-                        columnReprList.append(cleanedCell)
+                    Table.repeatCell(columnReprList, cleanedCell, rowSpan)
                     logger.debug(
-                        f"[OK] Value '{cleanedCell}' inserted {rowSpan} times in table list representation !"
+                        "[OK] Value '%s' inserted %s times in table list representation !",
+                        cleanedCell,
+                        rowSpan,
                     )
                     # Insert column list
                     table_repr.append(columnReprList)
                     logger.debug(
-                        f"[OK] Value '{cleanedCell}' inserted in {colSpan} columns in table list representation !"
+                        "[OK] Value '%s' inserted in %s columns in table list representation !",
+                        cleanedCell,
+                        colSpan,
                     )
             # Return modified list
             return table_repr
@@ -248,78 +477,95 @@ class Table:
                 try:
                     # -> Check if index exists in column
                     logger.debug(
-                        f"[*] TRY CELL '{cell_data}' FOR COLUMN INDEX {colIndex} AT ROW INDEX {row_index}"
+                        "[*] TRY CELL '%s' FOR COLUMN INDEX %s AT ROW INDEX %s",
+                        cell_data,
+                        colIndex,
+                        row_index,
                     )
                     columnList[row_index]
                 # If an error occurs we then narrow to exact case scenario
                 except IndexError:
                     # -> If index error then a spot is available for this element
-                    logger.debug(f"[*] COLUMN : {columnList} AT INDEX {row_index}")
-                    logger.debug(f"[*] VALUE TO BE INSERTED : {cleanedCell}")
+                    logger.debug("[*] COLUMN : %s AT INDEX %s", columnList, row_index)
+                    logger.debug("[*] VALUE TO BE INSERTED : %s", cleanedCell)
                     # === CASE 1 - Normal cell with NO rowspans and NO colspan === #
                     if rowSpan == None and colSpan == None:
-                        logger.debug(f"[*] CASE 1 - NO ROWSPAN, NO COLSPAN")
+                        logger.debug("[*] CASE 1 - NO ROWSPAN, NO COLSPAN")
                         columnList.insert(row_index, cleanedCell)
                         logger.debug(
-                            f"\tValue '{cleanedCell}' inserted in column {columnList} !"
+                            "\tValue '%s' inserted in column %s !", cleanedCell, columnList
                         )
                     # === CASE 2 - Cell WITH rowspan BUT NO colspan === #
                     elif rowSpan != None and colSpan == None:
-                        logger.debug(f"\t[*] CASE 2 - ROWSPAN, NO COLSPAN")
-                        for spans in range(rowSpan):
-                            columnList.insert(row_index + rowSpan, cleanedCell)
+                        logger.debug("\t[*] CASE 2 - ROWSPAN, NO COLSPAN")
+                        Table.repeatCell(
+                            columnList, cleanedCell, rowSpan, row_index + rowSpan
+                        )
                         logger.debug(
-                            f"\tValue '{cleanedCell}' inserted {rowSpan} times in column {columnList} !"
+                            "\tValue '%s' inserted %s times in column %s !",
+                            cleanedCell,
+                            rowSpan,
+                            columnList,
                         )
                     # === CASE 3 - Cell WITH colspan BUT NO rowspan === #
                     elif colSpan != None and rowSpan == None:
-                        logger.debug(f"\t[*] CASE 3 - COLSPAN, NO ROWSPAN")
+                        logger.debug("\t[*] CASE 3 - COLSPAN, NO ROWSPAN")
                         columnList.insert(row_index, cleanedCell)
                         logger.debug(
-                            f"\tValue '{cleanedCell}' inserted in column {columnList} !"
+                            "\tValue '%s' inserted in column %s !", cleanedCell, columnList
                         )
                         table_repr[colIndex + (colSpan - 1)].insert(
                             row_index, cleanedCell
                         )
                         logger.debug(
-                            f"\tValue '{cleanedCell}' inserted in column at index {table_repr[colIndex + (colSpan - 1)]} !"
+                            "\tValue '%s' inserted in column at index %s !",
+                            cleanedCell,
+                            table_repr[colIndex + (colSpan - 1)],
                         )
                     # === CASE 4 - Cell WITH colspan AND rowspan === #
                     elif colSpan != None and rowSpan != None:
-                        logger.debug(f"\t[*] CASE 4 - COLSPAN, ROWSPAN")
-                        for spans in range(rowSpan):
-                            columnList.insert(row_index + rowSpan, cleanedCell)
-                            table_repr[colIndex + (colSpan - 1)].insert(
-                                row_index + rowSpan, cleanedCell
-                            )
+                        logger.debug("\t[*] CASE 4 - COLSPAN, ROWSPAN")
+                        Table.repeatCell(
+                            columnList, cleanedCell, rowSpan, row_index + rowSpan
+                        )
+                        Table.repeatCell(
+                            table_repr[colIndex + (colSpan - 1)],
+                            cleanedCell,
+                            rowSpan,
+                            row_index + rowSpan,
+                        )
                     # -> Spot has been found so break loop
                     break
                 else:
                     logger.debug(
-                        f"[*] COLUMN {colIndex} AT ROW {row_index} OCCUPIED, GO TO NEXT"
+                        "[*] COLUMN %s AT ROW %s OCCUPIED, GO TO NEXT",
+                        colIndex,
+                        row_index,
                     )
                     # Continue searching a spot in column lists
                     continue
             # Return modified list
             return table_repr
         elif whichRow == "firstBodyRow":
-            columnList = []
+            columnList = newColumn()
             # === CASE 1 - Normal cell with NO rowspans === #
             if rowSpan == None:
-                logger.debug(f"[*] CASE 1 - NO ROWSPAN")
+                logger.debug("[*] CASE 1 - NO ROWSPAN")
                 columnList.append(cleanedCell)
                 table_repr.append(columnList)
                 logger.debug(
-                    f"[OK] Value '{cleanedCell}' inserted in table list representation !"
+                    "[OK] Value '%s' inserted in table list representation !",
+                    cleanedCell,
                 )
             # === CASE 2 - Cell WITH rowspan === #
             elif rowSpan != None:
-                logger.debug(f"[*] CASE 2 - ROWSPAN")
-                for i in range(rowSpan):
-                    columnList.append(cleanedCell)
+                logger.debug("[*] CASE 2 - ROWSPAN")
+                Table.repeatCell(columnList, cleanedCell, rowSpan)
                 table_repr.append(columnList)
                 logger.debug(
-                    f"[OK] Value '{cleanedCell}' inserted {rowSpan} times in table list representation !"
+                    "[OK] Value '%s' inserted %s times in table list representation !",
+                    cleanedCell,
+                    rowSpan,
                 )
             # Return modified list
             return table_repr
@@ -328,30 +574,37 @@ class Table:
                 try:
                     # -> Check if index exists in column
                     logger.debug(
-                        f"[*] TRY CELL '{cell_data}' FOR COLUMN INDEX {colIndex} AT ROW INDEX {row_index}"
+                        "[*] TRY CELL '%s' FOR COLUMN INDEX %s AT ROW INDEX %s",
+                        cell_data,
+                        colIndex,
+                        row_index,
                     )
                     columnList[row_index]
                 # If an error occurs we then narrow to exact case scenario
                 except IndexError:
                     # === CASE 1 - Normal cell with NO rowspans === #
                     if rowSpan == None:
-                        logger.debug(f"[*] CASE 1 - NO ROWSPAN")
+                        logger.debug("[*] CASE 1 - NO ROWSPAN")
                         table_repr[colIndex].append(cleanedCell)
                         logger.debug(
-                            f"[OK] Value '{cleanedCell}' inserted in table list representation !"
+                            "[OK] Value '%s' inserted in table list representation !",
+                            cleanedCell,
                         )
                     # === CASE 2 - Cell WITH rowspan === #
                     elif rowSpan != None:
-                        logger.debug(f"[*] CASE 2 - ROWSPAN")
-                        for i in range(rowSpan):
-                            table_repr[colIndex].append(cleanedCell)
+                        logger.debug("[*] CASE 2 - ROWSPAN")
+                        Table.repeatCell(table_repr[colIndex], cleanedCell, rowSpan)
                         logger.debug(
-                            f"[OK] Value '{cleanedCell}' inserted {rowSpan} times in table list representation !"
+                            "[OK] Value '%s' inserted %s times in table list representation !",
+                            cleanedCell,
+                            rowSpan,
                         )
                     break
                 else:
                     logger.debug(
-                        f"[*] COLUMN {colIndex} AT ROW {row_index} OCCUPIED, GO TO NEXT"
+                        "[*] COLUMN %s AT ROW %s OCCUPIED, GO TO NEXT",
+                        colIndex,
+                        row_index,
                     )
                     # Index already exists, ok continue searching for a spot in columns (lists)
                     continue
@@ -365,10 +618,227 @@ class Table:
                 f"'{whichRow}' is not a valid argument for 'whichRow' parameter ! \nIt should be either 'firstHeaderRow', 'headerRow', 'firstBodyRow' or 'bodyRow'."
             )
 
+    @staticmethod
+    def createDictKeys(headerList, headerRows):
+        """
+        Creates ordered dictionnary and add keys according to table header list. It can handle spans (rowspan & colspan) present in header list.
+
+        > Note : For rowspans, it's simply remove any duplicated info in column lists (created by other method in this class) and for colspans, nothing special
+        (see content of header lists returned by `getTableHeader()` method to better understand).
+
+        Parameters
+        ----------
+        `headerList` : `list`
+            Nested list of column in table header (returned by `getTableHeader()` method)
+        `headerRows` : `int`
+            Number of header rows
+
+        Returns
+        -------
+        `OrderedDict`
+            An ordered dict that preserves order of insertion (essential to later link columns to right data in columns)
+
+        """
+        # IMPORTANT : Ordered dict will preserve insertion order to later easily identify & populate proper columns with according data.
+        resDict = OrderedDict()
+        # a. It's a simple table header with one header row
+        if headerRows == 1:
+            logger.debug("Table header has only one row.")
+            for colList in headerList:
+                # Prepare dict (insert keys)
+                resDict[colList[0]] = ""
+                logger.debug(f"Created key : {colList[0]}")
+            return resDict
+        # b. It's a more complex table header with one multiple header rows
+        elif headerRows > 1:
+            logger.debug(f"Table header has {headerRows} rows.")
+            for colList in headerList:
+                # Remove duplicates from column list (rowspans)
+                col = []
+                [col.append(i) for i in colList if i not in col]
+                # If there's only one element (column title) then create key
+                if len(col) == 1:
+                    logger.debug(
+                        f"[*] Header column list has only one element : {col}"
+                    )
+                    # Prepare dict (insert keys)
+                    resDict[colList[0]] = ""
+                    logger.debug(f"[*] Dictionnary key '{colList[0]}' created !")
+                elif len(col) == 2:
+                    logger.debug(f"[*] Header column list has two elements : {col}")
+                    # Concatenate two elements to create dict key like label (Company) : ""
+                    resDict[f"{colList[0]} ({colList[1]})"] = ""
+                    logger.debug(
+                        f"[*] Dictionnary key '{colList[0]} ({colList[1]})' created !"
+                    )
+                elif len(col) > 2:
+                    logger.debug(
+                        f"[*] Header column list has {len(col)} elements : {col}"
+                    )
+                    # Place elements in parenthesis (except for the first one)
+                    otherElements = [i for i in colList[1:]]
+                    formattedStr = ", ".join(otherElements)
+                    # Concatenate two elements to create dict key like Album (Release, Record, ...) : ""
+                    resDict[f"{colList[0]} ({formattedStr})"] = ""
+                    logger.debug(
+                        f"[*] Dictionnary key '{colList[0]} ({formattedStr})' created !"
+                    )
+            logger.info(f"Created keys in dictionnary : {dict(resDict)}")
+            return resDict
+
+    @staticmethod
+    def insertColData(orderedResDict, bodyList, rowIndex=None):
+        """
+        Inserts list of data in corresponding key in ordred dictionnary (arg) and return a normal dictionnary with full
+        table (header, body) converted.
+
+        Parameters
+        ----------
+        `orderedResDict` : `OrderedDict`
+            Ordered dictionnary with table header turned into keys (returned by `createDictKeys()` function)
+        `bodyList` : `list`
+            Nested list of all table body data (returned by getTableBody() method)
+        `rowIndex` : `int`
+            Optional argument to indicate whether it's a 1D or 2D table. For 2D tables, we only need one element from column where
+            with 1D table we need all the elements in column. Set to None if it's a 1D table or give row index if it's a 2D table.
+
+        Returns
+        -------
+        `Dict`
+            Full table (header + body) converted to a normal dictionnary
+        """
+        # Since insertion order in ordred dict was preserved we can easily fill according column
+        for key, colList in zip(orderedResDict, bodyList):
+            if rowIndex != None:
+                # Get only one element from column at specific row index (2D Tables), column isn't copied
+                orderedResDict[key] = colList[rowIndex]
+            else:
+                # Get all row data
+                # Spilled columns stay on disk (read-only, nothing to copy)
+                orderedResDict[key] = (
+                    colList if isSpilledColumn(colList) else list(colList)
+                )
+            logger.debug("[*] %s : %s", key, orderedResDict[key])
+        logger.debug("Dictionnary returned : %s", orderedResDict)
+        return orderedResDict
+
+    @staticmethod
+    def buildTableDict(tableHeaderList, tableBodyList, tableType, dictType="normal"):
+        """
+        This utility method is the core of `getTableDict()`, it turns table header & body list representations into a 1D or 2D dictionnary.
+        It's separated from `getTableDict()` so that any other way of resolving table header & body (incremental conversion for instance)
+        ends up with exactly the same dictionnary.
+
+        Params
+        ------
+        `tableHeaderList` : `list`
+            Nested list of column in table header (returned by `getTableHeader()` method)
+
+        `tableBodyList` : `list`
+            Nested list of all table body data (returned by `getTableBody()` method)
+
+        `tableType` : `dict`
+            Table infos (returned by `getTableType()` method)
+
+        `dictType` : `<class 'str'>`
+            Type of dictionnary that will be returned, can be either "normal" or "ordered"
+
+        Returns
+        -------
+        `dict` or `OrderedDict`
+            Dictionnary representation of table
+        """
+        orderedKeyDict = Table.createDictKeys(
+            tableHeaderList, tableType["total_header_rows"]
+        )
+        return Table.fillTableDict(
+            orderedKeyDict, tableBodyList, tableType["dimensions"], dictType
+        )
+
+    @staticmethod
+    def fillTableDict(orderedKeyDict, tableBodyList, dimensions, dictType="normal"):
+        """
+        This utility method fills dictionnary keys created from table header (see `createDictKeys()`) with table body data.
+        For a 2D table, first key is dropped and main keys are taken from first column of table body instead.
+
+        Params
+        ------
+        `orderedKeyDict` : `OrderedDict`
+            Ordered dictionnary with table header turned into keys (returned by `createDictKeys()`)
+
+        `tableBodyList` : `list`
+            Nested list of all table body data (returned by `getTableBody()` method)
+
+        `dimensions` : `<class 'str'>`
+            Either "1D" or "2D" (see `getTableType()`)
+
+        `dictType` : `<class 'str'>`
+            Type of dictionnary that will be returned, can be either "normal" or "ordered"
+
+        Returns
+        -------
+        `dict` or `OrderedDict`
+            Dictionnary representation of table
+        """
+
+        def finalCondition(_finalDict, dimensions):
+            # Final condition to determine type of dict to be returned
+            if dictType == "normal":
+                # Convert ordered dictionnary to normal dict & return it
+                logger.info("Created %s dictionnary (normal) : %s", dimensions, _finalDict)
+                return dict(_finalDict)
+            elif dictType == "ordered":
+                logger.info("Created %s dictionnary (ordered) : %s", dimensions, _finalDict)
+                return _finalDict
+            else:
+                logger.error(f"Dictionnary type '{dictType}' is not valid !")
+                raise TypeError(
+                    "Dictionnary type is not valid ! It can be either 'normal' or 'ordered' !"
+                )
+
+        # It's a one dimensional table
+        if dimensions == "1D":
+            logger.debug("This a 1D table")
+            # === Insert data from table body in dict & return === #
+            finalDict = Table.insertColData(orderedKeyDict, tableBodyList)
+            # Final condition to determine type of dict to be returned
+            return finalCondition(finalDict, dimensions)
+        # It's a two dimensional table
+        elif dimensions == "2D":
+            finalKeyDict = OrderedDict()
+            logger.debug("This a 2D table")
+            # === 1. Create an ordered dict keys with left column <th> cells in table body === #
+            firstCol = tableBodyList[0]
+            logger.debug("First column data : %s", firstCol)
+            for element in firstCol:
+                finalKeyDict[element] = ""
+                logger.debug("Inserted following key in dict : %s", element)
+            logger.debug("Keys Inserted ! Dictionnary : %s", finalKeyDict)
+            # === 2. Prepare sub keys with table header & pop its first column === #
+            headerOrdKeyDict = orderedKeyDict
+            logger.debug(f"Created ordered dict with sub keys : {headerOrdKeyDict}")
+            # Pop first column from key ordred dict (it's the first column, we don't want it in final dict since it's already a key)
+            poppedHeader = headerOrdKeyDict.popitem(last=False)
+            logger.debug(
+                f"Popped first header from dict (column data are keys in main dict) : {poppedHeader}"
+            )
+            # === 3. Go through keys and pass row index to get a single element (keys are equal to table body rows here) === #
+            for rowIndex, key in enumerate(finalKeyDict.keys()):
+                # Create row with header and row data (except for first column)
+                rowDict = Table.insertColData(
+                    headerOrdKeyDict, tableBodyList[1:], rowIndex
+                )
+                # Insert row at corresponding key
+                finalKeyDict[key] = dict(rowDict)
+                logger.debug('[*] At key "%s" inserted %s', key, finalKeyDict[key])
+            # Final condition to determine type of dict to be returned
+            return finalCondition(finalKeyDict, dimensions)
+
     # ============================== #
     # ========= MAIN FUNCS ========= #
     # ============================== #
 
+    @watched
     def getTableType(self):
         """
         This method role is to determine table type and give some useful infos about table.
@@ -402,6 +872,8 @@ class Table:
             - `total_th_cells` : Total `<th>` cells in table
             - `total_td_cells` : Total `<td>` cells in table
         """
+        if "tableType" in self.cache:
+            return dict(self.cache["tableType"])
         resultDict = {}
         totalHeaderRows = 0  # Row with only <th>
         totalTitledRow = 0  # Row with one <th> and then <td>
@@ -454,10 +926,12 @@ class Table:
         resultDict["total_columns"] = totalColumns
         resultDict["total_th_cells"] = totalThCells
         resultDict["total_td_cells"] = totalTdCells
+        self.cache["tableType"] = dict(resultDict)
 
         return resultDict
 
-    def getTableHeader(self):
+    @watched
+    def getTableHeader(self, sparse=False):
         """
         This method returns header table in a list reprentation. The "table list reprentation" is a nested list that look like
         this `[['Year'], ['Album'], ['Label']]` (were "Year", "Album", "Label" are columns in first row). The second row would be
@@ -470,28 +944,48 @@ class Table:
         `self.allRows` : `<class 'bs4.element.ResultSet'>`
             BS4 result set, look like this : [<tr><th>Year</th><th>Album</th><th>Label</th></tr>, etc...]
 
+        `sparse` : `bool`
+            If True, returns a `SparseGrid` where spans are stored once instead of a nested list.
+
         Returns
         -------
-        `list`
+        `list` or `SparseGrid`
             Nested list representing table columns.
         """
+        if not sparse and "header" in self.cache:
+            return [list(column) for column in self.cache["header"]]
         # Get table type dict
         tableType = self.getTableType()
         logger.info(
             f"[TABLE INFO] Type : {tableType['dimensions']}, Header length : {tableType['total_header_rows']}, Total columns : {tableType['total_columns']}"
         )
         headerRowLength = tableType["total_header_rows"]
+        # Same header markup was already resolved (by any table), re-use it
+        memoKey = None
+        if not sparse and headerMemo.enabled:
+            memoKey = headerKey(
+                self.allRows[: max(headerRowLength, 1)],
+                headerRowLength,
+                self.maxRowspan,
+                self.maxColspan,
+            )
+            entry = headerMemo.get(memoKey)
+            if entry != None:
+                self.cache["header"] = entry.header
+                self.cache["headerKeys"] = entry.keys
+                return [list(column) for column in entry.header]
         # Init table reprentation
         tableRepr = []
+        newColumn = SpanColumn if sparse else list
         headerFirstRow = Table.removeNewLines(self.allRows[0].contents)
         # === 1. Get data of first row and start table list reprentation === #
         for cell in headerFirstRow:
             columnReprList = []
             # Get rowspans and colspans (if any the convert to int or return None)
-            rowspan, colspan = Table.getSpans(cell)
+            rowspan, colspan = Table.getSpans(cell, self.maxRowspan, self.maxColspan)
             # Insert data in table reprentation
             tableRepr = Table.insertRows(
-                cell, rowspan, colspan, 0, tableRepr, "firstHeaderRow"
+                cell, rowspan, colspan, 0, tableRepr, "firstHeaderRow", newColumn
             )
 
         # Log result so far
@@ -513,14 +1007,46 @@ class Table:
                 # Loop through elements and insert them in table list representation
                 for cell in rowChildren:
                     # Get rowspans and colspans (if any the convert to int or return None)
-                    rowspan, colspan = Table.getSpans(cell)
+                    rowspan, colspan = Table.getSpans(
+                        cell, self.maxRowspan, self.maxColspan
+                    )
                     tableRepr = Table.insertRows(
                         cell, rowspan, colspan, rowIndex, tableRepr, "headerRow"
                     )
         logger.debug(f"[getTableHeader] TABLE FINAL RESULT :\n{tableRepr}")
+        if sparse:
+            return SparseGrid(tableRepr)
+        self.cache["header"] = tuple(tuple(column) for column in tableRepr)
+        if memoKey != None:
+            headerMemo.put(memoKey, self.cache["header"], self.getKeysTuple())
         return tableRepr
 
-    def getTableBody(self):
+    def getKeysTuple(self):
+        # Dictionnary keys of table header as a tuple (None if table has no header), created once
+        if "headerKeys" not in self.cache:
+            if "header" not in self.cache:
+                self.getTableHeader()
+            keys = Table.createDictKeys(
+                self.cache["header"], self.getTableType()["total_header_rows"]
+            )
+            self.cache["headerKeys"] = tuple(keys) if keys != None else None
+        return self.cache["headerKeys"]
+
+    def getDictKeys(self):
+        """
+        Returns dictionnary keys of table (see `createDictKeys()`). Keys are created once per header markup, they are shared
+        between tables through header memo (see `headerMemo` module).
+
+        Returns
+        -------
+        `OrderedDict`
+            New ordered dict with keys of table (None if table has no header).
+        """
+        keys = self.getKeysTuple()
+        return OrderedDict.fromkeys(keys, "") if keys != None else None
+
+    @watched
+    def getTableBody(self, sparse=False):
         """
         This method returns table body (not header) in a list reprentation. The "table list reprentation" is a nested list that look like
         this `[['1991'], ['Bullhead'], ['Lysol Records']]` (were "1991", "Bullhead", "Lysol" are columns in first body row). The second row would be
@@ -533,15 +1059,53 @@ class Table:
         `self.allRows` : `<class 'bs4.element.ResultSet'>`
             BS4 result set, look like this : [<tr><th>Year</th><th>Album</th><th>Label</th></tr>, etc...]
 
+        `sparse` : `bool`
+            If True, returns a `SparseGrid` where rowspans are stored once instead of a nested list.
+
         Returns
         -------
-        `list`
+        `list` or `SparseGrid`
             Nested list representing table columns.
         """
+        if not sparse and "body" in self.cache:
+            if "spill" in self.cache:
+                # Spilled columns are read-only, they're not copied to lists
+                return list(self.cache["body"])
+            return [list(column) for column in self.cache["body"]]
         tableBodyRepr = []
+        newColumn = SpanColumn if sparse else list
         # Get table type dict
         tableType = self.getTableType()
         headerRowLength = tableType["total_header_rows"]
+        # Body over memory budget, resolve it to disk (see `spill` module)
+        if not sparse and self.memoryBudget != None:
+            from .spill import estimateBodyBytes, spillTableBody
+
+            estimatedBytes = estimateBodyBytes(self)
+            if estimatedBytes > self.memoryBudget:
+                logger.warning(
+                    "Table body (~%d bytes) is over memory budget (%d bytes), spilling it to disk",
+                    estimatedBytes,
+                    self.memoryBudget,
+                )
+                tableBodyRepr, spillStats = spillTableBody(self)
+                spillStats["estimatedBytes"] = estimatedBytes
+                self.cache["spill"] = spillStats
+                self.cache["body"] = tuple(tableBodyRepr)
+                return tableBodyRepr
+        # Very large table, split body rows between threads (see `parallel` module)
+        if not sparse and self.workers != None and self.workers > 1:
+            from .parallel import parallelTableBody, isFreeThreaded, PARALLEL_MIN_ROWS
+
+            if not isFreeThreaded():
+                logger.info(
+                    "GIL is enabled, table body is resolved sequentially (workers=%d ignored)",
+                    self.workers,
+                )
+            elif len(self.allRows) - headerRowLength >= PARALLEL_MIN_ROWS:
+                tableBodyRepr = parallelTableBody(self, self.workers)
+                self.cache["body"] = tuple(tuple(column) for column in tableBodyRepr)
+                return tableBodyRepr
         for rowIndex, row in enumerate(self.allRows[headerRowLength:]):
             # Since we skipped header, row index is out whack so re-adjust rowIndex at correct index
             # rowIndex += headerRowLength
@@ -550,23 +1114,33 @@ class Table:
             # Loop through elements and insert them in table list representation
             for cell in rowChildren:
                 # Get rowspans (if any the convert to int or return None)
-                rowspan, colspan = Table.getSpans(cell)
+                rowspan, colspan = Table.getSpans(cell, self.maxRowspan, self.maxColspan)
                 # If this is the first row
                 if rowIndex == 0:
                     tableBodyRepr = Table.insertRows(
-                        cell, rowspan, colspan, rowIndex, tableBodyRepr, "firstBodyRow"
+                        cell,
+                        rowspan,
+                        colspan,
+                        rowIndex,
+                        tableBodyRepr,
+                        "firstBodyRow",
+                        newColumn,
                     )
                     logger.info(f"Cell entered in the first row of table body !")
-                    logger.info(f"{tableBodyRepr}")
+                    logger.info("%s", tableBodyRepr)
                 else:
                     tableBodyRepr = Table.insertRows(
                         cell, rowspan, colspan, rowIndex, tableBodyRepr, "bodyRow"
                     )
                     logger.info(f"Cell entered in row of table body !")
-                    logger.info(f"{tableBodyRepr}")
+                    logger.info("%s", tableBodyRepr)
+        if sparse:
+            return SparseGrid(tableBodyRepr)
+        self.cache["body"] = tuple(tuple(column) for column in tableBodyRepr)
         return tableBodyRepr
 
-    def getTableList(self):
+    @watched
+    def getTableList(self, sparse=False):
         """
          This method returns a table (header and body) in a list reprentation.
 
@@ -586,25 +1160,31 @@ class Table:
          To have a more accurate representation of table header and body, it's better to use either `getTableDict()` or to combine manually `getTableHeader()`
          with `getTableBody()`.
 
+         Parameters
+         ----------
+         `sparse` : `bool`
+             If True, returns a `SparseGrid` where spans are stored once instead of a nested list.
+
          Returns
          -------
-         `list`
+         `list` or `SparseGrid`
              Nested list representing table columns.
         """
         # Get table header list
-        tableHeader = self.getTableHeader()
+        tableHeader = self.getTableHeader(sparse)
         # Get table body list
-        tableBody = self.getTableBody()
+        tableBody = self.getTableBody(sparse)
         # Check that tables are same length (right number of columns)
         logger.debug(
             f"Header total columns : {len(tableHeader)}, Body total columns : {len(tableBody)}"
         )
         if len(tableHeader) == len(tableBody):
-            # Join all column lists to create full table reprentation
+            if sparse:
+                return tableHeader.concat(tableBody)
+            # Join all column lists to create full table reprentation (new lists, header & body are left untouched)
             tableRepr = []
             for colHeaderLst, colBodyLst in zip(tableHeader, tableBody):
-                colHeaderLst.extend(colBodyLst)
-                tableRepr.append(colHeaderLst)
+                tableRepr.append(colHeaderLst + colBodyLst)
             return tableRepr
         else:
             logger.error("Table header & body don't have the same number of columns !")
@@ -612,7 +1192,8 @@ class Table:
                 "Table header & body don't have the same number of columns !"
             )
 
-    def getTableDict(self, dictType="normal"):
+    @watched
+    def getTableDict(self, dictType="normal", where=None):
         """
         Method to convert a html table to a 1D or 2D dictionnary. For instance, a 1D table like this :
 
@@ -633,143 +1214,22 @@ class Table:
         `dictType` : `<class 'str'>`
             Type of dictionnary that will be returned, can be either "normal" or "ordered"
 
+        `where` : `callable`
+            Optional row filter, called with each body row as a mapping key -> cell text and returning True to keep row. It's
+            evaluated while rows are resolved : text of rejected rows is never extracted (except cells read by filter).
+
         Returns
         -------
         `dict` or `OrderedDict`
             Dictionnary representation of table
         """
-        # =========================== #
-        # ====== UTILITY FUNCS ====== #
-        # =========================== #
-        def createDictKeys(headerList, headerRows):
-            """
-            Creates ordered dictionnary and add keys according to table header list. It can handle spans (rowspan & colspan) present in header list.
-
-            > Note : For rowspans, it's simply remove any duplicated info in column lists (created by other method in this class) and for colspans, nothing special
-            (see content of header lists returned by `getTableHeader()` method to better understand).
-
-            Parameters
-            ----------
-            `headerList` : `list`
-                Nested list of column in table header (returned by `getTableHeader()` method)
-            `headerRows` : `int`
-                Number of header rows
-
-            Returns
-            -------
-            `OrderedDict`
-                An ordered dict that preserves order of insertion (essential to later link columns to right data in columns)
-
-            """
-            # IMPORTANT : Ordered dict will preserve insertion order to later easily identify & populate proper columns with according data.
-            resDict = OrderedDict()
-            # a. It's a simple table header with one header row
-            if headerRows == 1:
-                logger.debug("Table header has only one row.")
-                for colList in headerList:
-                    # Prepare dict (insert keys)
-                    resDict[colList[0]] = ""
-                    logger.debug(f"Created key : {colList[0]}")
-                return resDict
-            # b. It's a more complex table header with one multiple header rows
-            elif headerRows > 1:
-                logger.debug(f"Table header has {headerRows} rows.")
-                for colList in headerList:
-                    # Remove duplicates from column list (rowspans)
-                    col = []
-                    [col.append(i) for i in colList if i not in col]
-                    # If there's only one element (column title) then create key
-                    if len(col) == 1:
-                        logger.debug(
-                            f"[*] Header column list has only one element : {col}"
-                        )
-                        # Prepare dict (insert keys)
-                        resDict[colList[0]] = ""
-                        logger.debug(f"[*] Dictionnary key '{colList[0]}' created !")
-                    elif len(col) == 2:
-                        logger.debug(f"[*] Header column list has two elements : {col}")
-                        # Concatenate two elements to create dict key like label (Company) : ""
-                        resDict[f"{colList[0]} ({colList[1]})"] = ""
-                        logger.debug(
-                            f"[*] Dictionnary key '{colList[0]} ({colList[1]})' created !"
-                        )
-                    elif len(col) > 2:
-                        logger.debug(
-                            f"[*] Header column list has {len(col)} elements : {col}"
-                        )
-                        # Place elements in parenthesis (except for the first one)
-                        otherElements = [i for i in colList[1:]]
-                        formattedStr = ", ".join(otherElements)
-                        # Concatenate two elements to create dict key like Album (Release, Record, ...) : ""
-                        resDict[f"{colList[0]} ({formattedStr})"] = ""
-                        logger.debug(
-                            f"[*] Dictionnary key '{colList[0]} ({formattedStr})' created !"
-                        )
-                logger.info(f"Created keys in dictionnary : {dict(resDict)}")
-                return resDict
-
-        def insertColData(orderedResDict, bodyList, rowIndex=None):
-            """
-            Inserts list of data in corresponding key in ordred dictionnary (arg) and return a normal dictionnary with full
-            table (header, body) converted.
-
-            Parameters
-            ----------
-            `orderedResDict` : `OrderedDict`
-                Ordered dictionnary with table header turned into keys (returned by `createDictKeys()` function)
-            `bodyList` : `list`
-                Nested list of all table body data (returned by getTableBody() method)
-            `rowIndex` : `int`
-                Optional argument to indicate whether it's a 1D or 2D table. For 2D tables, we only need one element from column where
-                with 1D table we need all the elements in column. Set to None if it's a 1D table or give row index if it's a 2D table.
-
-            Returns
-            -------
-            `Dict`
-                Full table (header + body) converted to a normal dictionnary
-            """
-            # Since insertion order in ordred dict was preserved we can easily fill according column
-            for key, colList in zip(orderedResDict, bodyList):
-                colElementList = [el for el in colList]
-                if rowIndex != None:
-                    # Get only one element from column at specific row index (2D Tables)
-                    orderedResDict[key] = colElementList[rowIndex]
-                    logger.debug(f"[*] {key} : {colElementList[rowIndex]}")
-                else:
-                    # Get all row data
-                    orderedResDict[key] = colElementList
-                    logger.debug(f"[*] {key} : {colElementList}")
-                logger.debug(f"[*] Inserted column list : {orderedResDict[key]}")
-            logger.debug(f"Dictionnary returned : {dict(orderedResDict)}")
-            return orderedResDict
-
-        def finalCondition(_finalDict, dimensions):
-            # Final condition to determine type of dict to be returned
-            if dictType == "normal":
-                # Convert ordered dictionnary to normal dict & return it
-                logger.info(
-                    f"Created {dimensions} dictionnary (normal) : {dict(_finalDict)}"
-                )
-                return dict(_finalDict)
-            elif dictType == "ordered":
-                logger.info(
-                    f"Created {dimensions} dictionnary (ordered) : {_finalDict}"
-                )
-                return _finalDict
-            else:
-                logger.error(f"Dictionnary type '{dictType}' is not valid !")
-                raise TypeError(
-                    "Dictionnary type is not valid ! It can be either 'normal' or 'ordered' !"
-                )
-
-        # =========================== #
-        # ======= METHOD CODE ======= #
-        # =========================== #
-        # Get table header & body in list format
-        tableHeaderList = self.getTableHeader()
-        tableBodyList = self.getTableBody()
-        logger.debug(f"Table header : {tableHeaderList}")
-        logger.debug(f"Table body : {tableBodyList}")
+        # A table without header can't be converted, filtered or not (same error)
+        if where != None and self.getKeysTuple() != None:
+            return self.getFilteredTableDict(dictType, where)
+        # Get table header & body (immutable, dictionnary is built with new lists)
+        tableHeaderList, tableBodyList = self.getTableResult()[1:]
+        logger.debug("Table header : %s", tableHeaderList)
+        logger.debug("Table body : %s", tableBodyList)
         # Check that tables are same length (right number of columns)
         assert len(tableHeaderList) == len(
             tableBodyList
@@ -777,50 +1237,41 @@ class Table:
         # Get table general infos
         tableType = self.getTableType()
         logger.info(f"Table type : {tableType}")
-        # It's a one dimensional table
-        if tableType["dimensions"] == "1D":
-            logger.debug("This a 1D table")
-            # === 1. Create ordered dictionnary & its keys from table header === #
-            orderedKeyDict = createDictKeys(
-                tableHeaderList, tableType["total_header_rows"]
-            )
-            # === 2. Insert data from table body in dict & return === #
-            finalDict = insertColData(orderedKeyDict, tableBodyList)
-            # Final condition to determine type of dict to be returned
-            return finalCondition(finalDict, tableType["dimensions"])
-        # It's a two dimensional table
-        elif tableType["dimensions"] == "2D":
-            finalKeyDict = OrderedDict()
-            logger.debug("This a 2D table")
-            # === 1. Create an ordered dict keys with left column <th> cells in table body === #
-            firstCol = tableBodyList[0]
-            logger.debug(f"First column data : {firstCol}")
-            for element in firstCol:
-                finalKeyDict[element] = ""
-                logger.debug(f"Inserted following key in dict : {element}")
-            logger.debug(f"Keys Inserted ! Dictionnary : {finalKeyDict}")
-            # === 2. Prepare sub keys with table header & pop its first column === #
-            headerOrdKeyDict = createDictKeys(
-                tableHeaderList, tableType["total_header_rows"]
-            )
-            logger.debug(f"Created ordered dict with sub keys : {headerOrdKeyDict}")
-            # Pop first column from key ordred dict (it's the first column, we don't want it in final dict since it's already a key)
-            poppedHeader = headerOrdKeyDict.popitem(last=False)
-            logger.debug(
-                f"Popped first header from dict (column data are keys in main dict) : {poppedHeader}"
-            )
-            # === 3. Go through keys and pass row index to get a single element (keys are equal to table body rows here) === #
-            for rowIndex, key in enumerate(finalKeyDict.keys()):
-                # Create row with header and row data (except for first column)
-                rowDict = insertColData(headerOrdKeyDict, tableBodyList[1:], rowIndex)
-                # Insert row at corresponding key
-                finalKeyDict[key] = dict(rowDict)
-                logger.debug(f'[*] At key "{key}" inserted {dict(rowDict)}')
-            logger.debug(f"WTF : {finalKeyDict}")
-            # Final condition to determine type of dict to be returned
-            return finalCondition(finalKeyDict, tableType["dimensions"])
+        return Table.fillTableDict(
+            self.getDictKeys(), tableBodyList, tableType["dimensions"], dictType
+        )
+
+    def getFilteredTableDict(self, dictType, where):
+        """
+        Builds table dictionnary from body rows accepted by `where`, rows are streamed (see `records` module) so rejected rows
+        are never stored.
+        """
+        tableHeaderList = self.getTableHeader()
+        keys = tableKeys(self)
+        tableBodyList = [[] for _ in tableHeaderList]
+        bodyRows = 0
+
+        def accept(row):
+            nonlocal bodyRows
+            bodyRows += 1
+            return where(row)
+
+        for row in iterRows(self, tableHeaderList, keys, accept):
+            for column, text in zip(tableBodyList, row):
+                column.append(text)
+        # Same check as `getTableDict()` (widths of rows are checked by `iterRows()`), an empty body has no columns
+        assert bodyRows > 0 or len(tableHeaderList) == 0, (
+            "Table header & body don't have the same number of columns !"
+        )
+        return Table.fillTableDict(
+            OrderedDict.fromkeys(keys, ""),
+            tableBodyList,
+            self.getTableType()["dimensions"],
+            dictType,
+        )
 
-    def getTableJson(self, indent=4):
+    @watched
+    def getTableJson(self, indent=4, where=None):
         """
         Returns table converted to JSON.
 
@@ -829,10 +1280,221 @@ class Table:
         **kwargs : `int`
             JSON object indentation (default = 4)
 
+        `where` : `callable`
+            Optional row filter (see `getTableDict()`)
+
         Returns
         -------
         `JSON`
             Full table (header + body) converted to a JSON object
         """
-        tableDict = self.getTableDict()
-        return json.dumps(tableDict, indent=indent)
+        import json
+
+        tableDict = self.getTableDict(where=where)
+        # Spilled columns are serialized one at a time
+        return json.dumps(tableDict, indent=indent, default=list)
+
+    def getTableResult(self):
+        """
+        Returns resolved table as an immutable `TableResult` (table type, header & body columns as tuples). Table is resolved only
+        once, so this is the cheapest way to get both header & body and result can be shared between threads or cached.
+
+        Returns
+        -------
+        `TableResult`
+            Named tuple with `tableType`, `header` & `body`.
+        """
+        if "header" not in self.cache:
+            self.getTableHeader()
+        if "body" not in self.cache:
+            self.getTableBody()
+        return TableResult(
+            self.cache["tableType"], self.cache["header"], self.cache["body"]
+        )
+
+    def getMemoryStats(self):
+        """
+        Returns memory infos of table conversion (see `spill` module).
+
+        Returns
+        -------
+        `dict`
+            - `memoryBudget` : Budget of table body in bytes (None if no budget)
+            - `spilled` : True if table body was spilled to disk
+            - `estimatedBytes` / `chunks` / `spillBytes` / `runs` : Estimated body size & spill file infos (spilled bodies only)
+            - `rss` / `peakRss` : Current & peak resident memory of process in bytes
+        """
+        from .spill import currentRss, peakRss
+
+        stats = {"memoryBudget": self.memoryBudget, "spilled": "spill" in self.cache}
+        stats.update(self.cache.get("spill", {}))
+        stats["rss"] = currentRss()
+        stats["peakRss"] = peakRss()
+        return stats
+
+    def validate(self):
+        """
+        Checks table structure before converting it, in one sweep over cells without any text extraction : row width consistency
+        once spans are taken into account, overlapping spans and agreement of header & body column counts. It's much cheaper than
+        a conversion, so malformed tables can be rejected early (see `validation` module for all diagnostic codes).
+
+        Returns
+        -------
+        `ValidationReport`
+            Report with `diagnostics` (named tuples with severity, code, rowIndex, colIndex & message), `errors`, `warnings`.
+            Report is truthy if table can be converted (it has no error).
+        """
+        return validateTable(self)
+
+    @watched
+    def getTableRecords(self, where=None):
+        """
+        Returns table body as a list of records, one per row. Records are named tuples of a type generated from table keys (see
+        `records` module), they can be accessed by position, key (`record["Year"]`) or attribute (`record.Year`). It's much
+        lighter than a list of dictionnaries since keys are stored once in record type.
+
+        Params
+        ------
+        `where` : `callable`
+            Optional row filter (see `getTableDict()`), rows are then streamed and only accepted ones are extracted.
+
+        Returns
+        -------
+        `list`
+            List of records (for 2D tables, first field holds row titles).
+        """
+        if where != None:
+            return list(iterRecords(self, where))
+        tableType, header, body = self.getTableResult()
+        if len(header) != len(body):
+            raise AssertionError(
+                "Table header & body don't have the same number of columns !"
+            )
+        keys = tableKeys(self)
+        Record = recordType(keys)
+        return [Record._make(row) for row in zip(*body[: len(keys)])]
+
+    def iterTableRecords(self, where=None):
+        """
+        Streaming variant of `getTableRecords()`, body rows are resolved one by one from html rows and never stored (memory use
+        doesn't grow with number of rows).
+
+        Params
+        ------
+        `where` : `callable`
+            Optional row filter (see `getTableDict()`).
+
+        Returns
+        -------
+        `generator`
+            Records of table, same as `getTableRecords()`.
+        """
+        return iterRecords(self, where)
+
+    def getTableIndex(self):
+        """
+        Returns index of table (built once) : header key -> column index & row title -> row index maps over resolved body columns.
+        See `tableIndex` module.
+
+        Returns
+        -------
+        `TableIndex`
+            Index used by `column()`, `row()` & `cell()`.
+        """
+        if "index" not in self.cache:
+            tableType, header, body = self.getTableResult()
+            if len(header) != len(body):
+                raise AssertionError(
+                    "Table header & body don't have the same number of columns !"
+                )
+            keys = self.getKeysTuple()
+            self.cache["index"] = TableIndex(
+                keys if keys != None else [], body, tableType["dimensions"]
+            )
+        return self.cache["index"]
+
+    def column(self, colKey):
+        """
+        Returns a body column (for 1D tables, same as `getTableDict()[colKey]` but without converting the whole table).
+
+        Params
+        ------
+        `colKey` : `str` or `int`
+            Dictionnary key (see `createDictKeys()`) or column index.
+
+        Returns
+        -------
+        `tuple`
+            Column cells (shared with other lookups, it's never copied).
+        """
+        return self.getTableIndex().column(colKey)
+
+    def row(self, rowKey):
+        """
+        Returns a view of a body row (for 2D tables, same as `getTableDict()[rowKey]`).
+
+        Params
+        ------
+        `rowKey` : `int` or `str`
+            Row index or row title (2D tables only).
+
+        Returns
+        -------
+        `RowView`
+            Read-only mapping column key -> cell, backed by table columns.
+        """
+        return self.getTableIndex().row(rowKey)
+
+    def cell(self, rowKey, colKey):
+        """
+        Returns a cell of table body given its row (index or title of 2D tables) and its column (key or index).
+        """
+        return self.getTableIndex().cell(rowKey, colKey)
+
+    def getTableSnapshot(self, dictType="normal"):
+        """
+        Converts table to a dictionnary (like `getTableDict()`) and returns it in a "snapshot" along with what's needed to
+        later re-convert a new revision of this table incrementally with `getTableUpdate()` : per-row content hashes,
+        cell texts and layout of body rows.
+
+        Snapshot is a JSON serializable dictionnary, so it can be stored next to converted table.
+
+        Parameters
+        ----------
+        `dictType` : `<class 'str'>`
+            Type of dictionnary that will be returned, can be either "normal" or "ordered"
+
+        Returns
+        -------
+        `dict`
+            Snapshot, converted table is at key `table`.
+        """
+        return createSnapshot(self, dictType)
+
+    def getTableUpdate(self, previousSnapshot, dictType="normal"):
+        """
+        Converts table re-using a snapshot of a previous revision of the same table (returned by `getTableSnapshot()` or by
+        a previous call of this method). Text is extracted only for rows that were added or modified and layout is computed
+        again only for these rows and the rows their spans touch. Result is the same as a full conversion.
+
+        If previous snapshot is `None` or was created by an incompatible version, table is fully converted.
+
+        Parameters
+        ----------
+        `previousSnapshot` : `dict`
+            Snapshot of previous revision of table.
+
+        `dictType` : `<class 'str'>`
+            Type of dictionnary that will be returned, can be either "normal" or "ordered"
+
+        Returns
+        -------
+        `tuple[dict, dict]`
+            New snapshot (converted table is at key `table`) and row-level diff of table body :
+            - `added` : Indexes of added rows (in new table body)
+            - `removed` : Indexes of removed rows (in previous table body)
+            - `changed` : `[previousIndex, newIndex]` pairs of modified rows
+            - `headerChanged` : Whether table header changed
+            - `relaidOut` : Indexes of rows whose layout was computed again
+        """
+        return updateSnapshot(self, previousSnapshot, dictType)
@@ -0,0 +1,92 @@
+"""
+Table2Dict converts an html table (1D or 2D) in a list, a dictionnary or get useful informations about table.
+
+Importing the package is cheap and has no side effect : classes & functions below are only imported when first accessed
+(bs4 itself is only imported when a `Table` is created).
+"""
+
+import importlib
+
+# Public name -> module where it's defined
+_lazyAttributes = {
+    "Table": ".Table2Dict",
+    "TableResult": ".Table2Dict",
+    "convertTable": ".batch",
+    "convertTables": ".batch",
+    "ValidationReport": ".validation",
+    "TableValidationError": ".validation",
+    "ConversionJob": ".jobs",
+    "CsvWriter": ".writers",
+    "JsonLinesWriter": ".writers",
+    "ParquetWriter": ".writers",
+    "writeTables": ".writers",
+    "TableIndex": ".tableIndex",
+    "RowView": ".tableIndex",
+    "configureHeaderMemo": ".headerMemo",
+    "headerMemoStats": ".headerMemo",
+    "clearHeaderMemo": ".headerMemo",
+    "ConversionService": ".service",
+    "ServiceClient": ".service",
+    "configureWatchdog": ".watchdog",
+    "captureReport": ".watchdog",
+    "WikiTable": ".wikitext",
+    "parseWikitext": ".wikitext",
+    "ArchiveSource": ".sources",
+    "archiveTables": ".sources",
+    "SpilledColumn": ".spill",
+    "Pipeline": ".pipeline",
+    "Stage": ".pipeline",
+    "tablePipeline": ".pipeline",
+    "TableTypes": ".typeScan",
+    "classifyTables": ".typeScan",
+    "SparseGrid": ".sparseGrid",
+    "SpanColumn": ".sparseGrid",
+    "BinaryTable": ".binaryFormat",
+    "dump": ".binaryFormat",
+    "dumps": ".binaryFormat",
+    "load": ".binaryFormat",
+    "loads": ".binaryFormat",
+    "enableFileLogging": ".utils.customLogging",
+}
+
+# Submodules that can be accessed as attributes without importing them first
+_lazySubmodules = (
+    "Table2Dict",
+    "incremental",
+    "sparseGrid",
+    "binaryFormat",
+    "batch",
+    "validation",
+    "jobs",
+    "writers",
+    "tableIndex",
+    "records",
+    "headerMemo",
+    "parallel",
+    "service",
+    "watchdog",
+    "wikitext",
+    "sources",
+    "spill",
+    "pipeline",
+    "typeScan",
+    "utils",
+)
+
+__all__ = list(_lazyAttributes)
+
+
+def __getattr__(name):
+    if name in _lazyAttributes:
+        module = importlib.import_module(_lazyAttributes[name], __name__)
+        value = getattr(module, name)
+        # Cache it, next access won't go through this function
+        globals()[name] = value
+        return value
+    if name in _lazySubmodules:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_lazySubmodules))
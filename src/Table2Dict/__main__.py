@@ -0,0 +1,48 @@
+"""
+Command line of Table2Dict :
+
+    python -m Table2Dict serve [--host HOST] [--port PORT] [--socket PATH] [--workers N] [--parser PARSER]
+    python -m Table2Dict report CAPTURE_DIR [--top N]
+"""
+
+import argparse
+
+
+def serve(args):
+    from .service import ConversionService
+
+    service = ConversionService(
+        args.host, args.port, args.socket, args.workers, args.parser
+    )
+    print(f"Table2Dict service listening on {service.address} ({service.workers} workers)")
+    service.serveForever()
+
+
+def report(args):
+    from .watchdog import captureReport, formatReport
+
+    print(formatReport(captureReport(args.captureDir, args.top)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m Table2Dict")
+    commands = parser.add_subparsers(dest="command", required=True)
+    # === serve === #
+    serveParser = commands.add_parser("serve", help="Run a local conversion service")
+    serveParser.add_argument("--host", default="127.0.0.1")
+    serveParser.add_argument("--port", type=int, default=8765)
+    serveParser.add_argument("--socket", help="Listen on this Unix socket instead of HTTP port")
+    serveParser.add_argument("--workers", type=int, help="Number of worker processes")
+    serveParser.add_argument("--parser", default="html.parser", help="BS4 parser")
+    serveParser.set_defaults(function=serve)
+    # === report === #
+    reportParser = commands.add_parser("report", help="Rank tables captured by watchdog")
+    reportParser.add_argument("captureDir", help="Capture directory of watchdog")
+    reportParser.add_argument("--top", type=int, help="Only show this many tables")
+    reportParser.set_defaults(function=report)
+    args = parser.parse_args(argv)
+    args.function(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Module to convert many tables at once with a pool of threads. Reading & parsing html files and resolving tables all happen in
+worker threads, so batches scale with cores on free-threaded CPython builds (3.13+). On standard builds, bs4 tree building
+holds the GIL whatever the parser (lxml calls back into Python for every tag), only file reads overlap.
+
+Tables are scheduled by estimated cost (see `estimateCost()`) : sources are spread over per-worker queues, largest first, so that
+every worker gets the same amount of work, and a worker whose queue is empty steals remaining work from the most loaded queue.
+A few giant tables then start right away instead of keeping one worker busy long after the others finished.
+"""
+
+from .utils.customLogging import moduleLogging
+from .Table2Dict import Table
+from .validation import TableValidationError
+from .parallel import isFreeThreaded
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+import threading
+import heapq
+import os
+
+# Set up logging for module
+logger = moduleLogging()
+
+# Average size of a table cell in html files (markup included), used to turn file sizes into cell counts
+BYTES_PER_CELL = 80
+
+
+def estimateCost(source):
+    """
+    Returns a cheap estimate of the cost of converting a table, as a number of cells. Already parsed tables are estimated as
+    rows × columns of their first row (no `Table` is created for soup tags), html files are estimated from their size.
+
+    Params
+    ------
+    source : `str`, `<class 'bs4.element.Tag'>` or `Table`
+        Source of table (see `convertTable()`).
+
+    Returns
+    -------
+    `int`
+        Estimated number of cells (0 if unknown).
+    """
+    if isinstance(source, (str, os.PathLike)):
+        try:
+            return os.path.getsize(source) // BYTES_PER_CELL
+        except OSError:
+            # Error is raised (or returned) by conversion itself
+            return 0
+    rows = source.allRows if isinstance(source, Table) else source.find_all("tr")
+    if not rows:
+        return 0
+    # Same column count as `getTableType()` (contents of first row, new lines excluded)
+    columns = sum(1 for content in rows[0].contents if content != "\n")
+    return len(rows) * max(columns, 1)
+
+
+def scheduleLargestFirst(costs, workers):
+    """
+    Spreads work over per-worker queues (largest first, each item goes to the least loaded queue).
+
+    Returns
+    -------
+    `tuple`
+        List of queues (deques of item indexes, largest first) and list of queue loads (total cost of each queue).
+    """
+    queues = [deque() for _ in range(workers)]
+    loads = [0] * workers
+    heap = [(0, worker) for worker in range(workers)]
+    for index in sorted(range(len(costs)), key=lambda i: -costs[i]):
+        load, worker = heapq.heappop(heap)
+        queues[worker].append(index)
+        loads[worker] += costs[index]
+        heapq.heappush(heap, (load + costs[index], worker))
+    return queues, loads
+
+
+def runScheduled(function, items, costs, workers):
+    """
+    Runs `function` on every item with a pool of threads, scheduled by cost : each worker takes the largest item of its own
+    queue, a worker with an empty queue steals the smallest item of the most loaded queue. First error stops scheduling and
+    is raised.
+
+    Params
+    ------
+    function : `callable`
+        Function called with each item.
+
+    items : `list`
+        Items to process.
+
+    costs : `list`
+        Estimated cost of each item.
+
+    workers : `int`
+        Number of threads.
+
+    Returns
+    -------
+    `list`
+        Results in the same order as `items`.
+    """
+    queues, loads = scheduleLargestFirst(costs, workers)
+    lock = threading.Lock()
+    results = [None] * len(items)
+    errors = []
+    stolen = [0]
+
+    def nextIndex(worker):
+        with lock:
+            if errors:
+                return None
+            queue = worker
+            if not queues[queue]:
+                # Steal from queue with most remaining work
+                queue = max(range(workers), key=lambda w: (loads[w], len(queues[w])))
+                if not queues[queue]:
+                    return None
+                index = queues[queue].pop()
+                stolen[0] += 1
+            else:
+                index = queues[queue].popleft()
+            loads[queue] -= costs[index]
+            return index
+
+    def work(worker):
+        index = nextIndex(worker)
+        while index != None:
+            try:
+                results[index] = function(items[index])
+            except BaseException as error:
+                with lock:
+                    errors.append(error)
+                return
+            index = nextIndex(worker)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(work, range(workers)))
+    logger.debug("Scheduled %d item(s) on %d worker(s), %d stolen", len(items), workers, stolen[0])
+    if errors:
+        raise errors[0]
+    return results
+
+
+def convertTable(
+    source, method="getTableDict", parser="html.parser", validate=False, **methodKwargs
+):
+    """
+    Converts a single table with given `Table` method.
+
+    Params
+    ------
+    source : `str`, `<class 'bs4.element.Tag'>` or `Table`
+        Absolute path to html file, table soup tag or already created `Table` object.
+
+    method : `str`
+        Name of `Table` method used to convert table (default is "getTableDict").
+
+    parser : `str`
+        BS4 parser used to parse html files.
+
+    validate : `bool`
+        If True, table is validated first (see `Table.validate()`) and `TableValidationError` is raised if it's malformed.
+
+    **methodKwargs
+        Keyword arguments passed to `Table` method (`dictType="ordered"` for instance).
+
+    Returns
+    -------
+    Result of `Table` method.
+    """
+    tableObj = source if isinstance(source, Table) else Table(source, parser=parser)
+    if validate:
+        report = tableObj.validate()
+        if not report:
+            raise TableValidationError(report)
+    return getattr(tableObj, method)(**methodKwargs)
+
+
+def convertTables(
+    sources,
+    method="getTableDict",
+    workers=None,
+    parser="html.parser",
+    errors="raise",
+    validate=False,
+    schedule="cost",
+    **methodKwargs,
+):
+    """
+    Converts many tables with a pool of threads and returns results in the same order as `sources`.
+
+    Params
+    ------
+    sources : `iterable`
+        Absolute paths to html files, table soup tags or `Table` objects (see `convertTable()`).
+
+    method : `str`
+        Name of `Table` method used to convert tables (default is "getTableDict").
+
+    workers : `int`
+        Number of threads (defaults to number of CPUs), 1 converts tables in calling thread.
+
+    parser : `str`
+        BS4 parser used to parse html files ("lxml" parses faster than "html.parser").
+
+    errors : `str`
+        - "raise" (default) : first error is raised.
+        - "return" : error is returned in place of result of failed table.
+
+    validate : `bool`
+        If True, tables are validated before conversion and malformed ones are skipped early with a `TableValidationError`
+        (raised or returned depending on `errors`).
+
+    schedule : `str`
+        - "cost" (default) : largest tables first with work stealing (see module documentation).
+        - "input" : tables are dispatched in input order.
+
+    **methodKwargs
+        Keyword arguments passed to `Table` method.
+
+    Returns
+    -------
+    `list`
+        Results of conversions.
+    """
+    if errors not in ("raise", "return"):
+        raise ValueError(
+            f"'{errors}' is not a valid argument for 'errors' ! It should be either 'raise' or 'return'."
+        )
+    if schedule not in ("cost", "input"):
+        raise ValueError(
+            f"'{schedule}' is not a valid argument for 'schedule' ! It should be either 'cost' or 'input'."
+        )
+
+    def convert(source):
+        try:
+            return convertTable(source, method, parser, validate, **methodKwargs)
+        except Exception as error:
+            if errors == "raise":
+                raise
+            logger.warning(f"Conversion of '{source}' failed : {error!r}")
+            return error
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [convert(source) for source in sources]
+    logger.info(
+        f"Converting tables with {workers} threads (free-threaded : {isFreeThreaded()})"
+    )
+    if schedule == "cost":
+        sources = list(sources)
+        return runScheduled(
+            convert, sources, [estimateCost(source) for source in sources], workers
+        )
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(convert, sources))
@@ -0,0 +1,374 @@
+"""
+Module to store resolved tables in a compact binary format and to load them back without reparsing any html. A loaded file is
+memory-mapped, columns are exposed as views on the mapped file (nothing is copied until a cell is accessed).
+
+File format (all integers are unsigned 32 bits little-endian, every section starts on a 4 bytes boundary) :
+
+| Section          | Size                     | Content                                                                      |
+|------------------|--------------------------|------------------------------------------------------------------------------|
+| Header           | 32 bytes                 | Magic `T2DB`, version (u16), flags (u16) and 6 counts (see below)            |
+| String offsets   | (nStrings + 1) × u32     | Offset of each string in string blob (string `i` is `blob[off[i]:off[i+1]]`) |
+| Key ids          | nKeys × u32              | String id of each dictionnary key (see `Table.createDictKeys()`)             |
+| Column offsets   | (2 × nColumns + 1) × u32 | First run of each column : header columns first, then body columns          |
+| Run values       | nRuns × u32              | String id of each run                                                        |
+| Run ends         | nRuns × u32              | Cumulative end of each run in its column (span map, exclusive)               |
+| String blob      | blobSize bytes           | All distinct strings, utf-8 encoded                                          |
+
+Header counts are, in this order : nStrings, nKeys, nColumns, nRuns, total header rows, blobSize. Flags bit 0 is set for 2D tables.
+
+Strings are deduplicated (string table) and a span is stored once as a run (span map), so a table with many repeated cells stays small.
+"""
+
+from .sparseGrid import SpanColumn
+from collections import OrderedDict
+from bisect import bisect_right
+from array import array
+import struct
+import mmap
+import sys
+
+MAGIC = b"T2DB"
+VERSION = 1
+FLAG_2D = 1
+HEADER = struct.Struct("<4sHH6I")
+
+
+# ===================================== #
+# ============== WRITING ============== #
+# ===================================== #
+def dumps(table):
+    """
+    Converts a table to bytes in binary format (see module documentation).
+
+    Params
+    ------
+    table : `Table`
+        Table object to convert.
+
+    Returns
+    -------
+    bytes
+        Table in binary format.
+    """
+    tableType = table.getTableType()
+    header = table.getTableHeader(sparse=True)
+    body = table.getTableBody(sparse=True)
+    if len(header) != len(body):
+        raise AssertionError(
+            "Table header & body don't have the same number of columns !"
+        )
+    keys = table.getKeysTuple() or ()
+    # === 1. String table === #
+    stringIds = {}
+    blob = bytearray()
+    stringOffsets = array("I", [0])
+
+    def stringId(value):
+        if value not in stringIds:
+            stringIds[value] = len(stringIds)
+            blob.extend(value.encode("utf-8"))
+            stringOffsets.append(len(blob))
+        return stringIds[value]
+
+    keyIds = array("I", [stringId(key) for key in keys])
+    # === 2. Columns & span map === #
+    columnOffsets = array("I", [0])
+    runValues = array("I")
+    runEnds = array("I")
+    for column in list(header) + list(body):
+        for value, end in zip(column.values, column.ends):
+            runValues.append(stringId(value))
+            runEnds.append(end)
+        columnOffsets.append(len(runValues))
+    flags = FLAG_2D if tableType["dimensions"] == "2D" else 0
+    parts = [
+        HEADER.pack(
+            MAGIC,
+            VERSION,
+            flags,
+            len(stringIds),
+            len(keyIds),
+            len(header),
+            len(runValues),
+            tableType["total_header_rows"],
+            len(blob),
+        )
+    ]
+    for section in (stringOffsets, keyIds, columnOffsets, runValues, runEnds):
+        if sys.byteorder != "little":
+            section.byteswap()
+        parts.append(section.tobytes())
+    parts.append(bytes(blob))
+    return b"".join(parts)
+
+
+def dump(table, path):
+    """
+    Writes a table to a file in binary format (see module documentation).
+
+    Params
+    ------
+    table : `Table`
+        Table object to write.
+
+    path : `str`
+        Path of file to write.
+    """
+    with open(path, "wb") as binaryFile:
+        binaryFile.write(dumps(table))
+
+
+# ===================================== #
+# ============== READING ============== #
+# ===================================== #
+class BinaryColumn:
+    """
+    Read-only view of a column of a binary table. Cells are decoded only when accessed.
+
+    Column only keeps its runs range, views on runs are taken from table when needed : a column never holds a view on
+    memory-mapped file, so table can be closed while columns are still referenced (they can't be read anymore).
+    """
+
+    __slots__ = ("binaryTable", "start", "end")
+
+    def __init__(self, binaryTable, start, end):
+        self.binaryTable = binaryTable
+        self.start = start
+        self.end = end
+
+    @property
+    def values(self):
+        return self.binaryTable.runValues[self.start : self.end]
+
+    @property
+    def ends(self):
+        return self.binaryTable.runEnds[self.start : self.end]
+
+    def __len__(self):
+        if self.end == self.start:
+            return 0
+        return self.binaryTable.runEnds[self.end - 1]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("BinaryColumn index out of range")
+        runIndex = bisect_right(self.ends, index)
+        return self.binaryTable.string(self.binaryTable.runValues[self.start + runIndex])
+
+    def runs(self):
+        """
+        Iterates over runs of column as `(value, count)` tuples.
+        """
+        start = 0
+        for valueId, end in zip(self.values, self.ends):
+            yield self.binaryTable.string(valueId), end - start
+            start = end
+
+    def __iter__(self):
+        for value, count in self.runs():
+            for _ in range(count):
+                yield value
+
+    def toList(self):
+        """
+        Expands column to a list (spans are repeated).
+        """
+        expanded = []
+        for value, count in self.runs():
+            expanded.extend([value] * count)
+        return expanded
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, SpanColumn, BinaryColumn)):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self, other)
+            )
+        return NotImplemented
+
+
+class BinaryTable:
+    """
+    Table loaded from binary format (returned by `load()` and `loads()`).
+
+    Attributes
+    ----------
+        `keys` : `list`
+            Dictionnary keys created from table header.
+
+        `dimensions` : `str`
+            Either "1D" or "2D".
+
+        `totalHeaderRows` : `int`
+            Number of header rows.
+
+    Methods
+    -------
+        `column` : index or key
+            Returns a `BinaryColumn` view of a body column.
+
+        `headerColumn` : index
+            Returns a `BinaryColumn` view of a header column.
+
+        `getTableHeader`, `getTableBody`, `getTableList`, `getTableDict`
+            Same results as `Table` methods with the same name.
+    """
+
+    def __init__(self, buffer, mappedFile=None):
+        self.mappedFile = mappedFile
+        self.buffer = memoryview(buffer)
+        self.closed = False
+        (
+            magic,
+            version,
+            flags,
+            nStrings,
+            nKeys,
+            nColumns,
+            nRuns,
+            headerRows,
+            blobSize,
+        ) = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError("Not a Table2Dict binary table !")
+        if version != VERSION:
+            raise ValueError(f"Unsupported binary table version {version} !")
+        self.dimensions = "2D" if flags & FLAG_2D else "1D"
+        self.totalHeaderRows = headerRows
+        self.totalColumns = nColumns
+        offset = HEADER.size
+        sections = []
+        for length in (nStrings + 1, nKeys, 2 * nColumns + 1, nRuns, nRuns):
+            sections.append(self.uintView(offset, length))
+            offset += 4 * length
+        (
+            self.stringOffsets,
+            keyIds,
+            self.columnOffsets,
+            self.runValues,
+            self.runEnds,
+        ) = sections
+        self.blob = self.buffer[offset : offset + blobSize]
+        self.keys = [self.string(keyId) for keyId in keyIds]
+
+    def uintView(self, offset, length):
+        """
+        Returns a view of `length` unsigned ints starting at `offset` (copied only on big-endian machines).
+        """
+        view = self.buffer[offset : offset + 4 * length]
+        if sys.byteorder == "little":
+            return view.cast("I")
+        swapped = array("I", view.tobytes())
+        swapped.byteswap()
+        return swapped
+
+    def string(self, stringId):
+        """
+        Returns string at given id of string table.
+        """
+        return str(
+            self.blob[self.stringOffsets[stringId] : self.stringOffsets[stringId + 1]],
+            "utf-8",
+        )
+
+    def getColumn(self, index):
+        """
+        Returns a `BinaryColumn` view of column at given index (header columns first, then body columns).
+        """
+        start, end = self.columnOffsets[index], self.columnOffsets[index + 1]
+        return BinaryColumn(self, start, end)
+
+    def headerColumn(self, index):
+        return self.getColumn(index)
+
+    def column(self, indexOrKey):
+        """
+        Returns a `BinaryColumn` view of a body column, given its index or its dictionnary key.
+        """
+        if isinstance(indexOrKey, str):
+            indexOrKey = self.keys.index(indexOrKey)
+        return self.getColumn(self.totalColumns + indexOrKey)
+
+    def __len__(self):
+        return self.totalColumns
+
+    def getTableHeader(self):
+        return [self.headerColumn(i).toList() for i in range(self.totalColumns)]
+
+    def getTableBody(self):
+        return [self.column(i).toList() for i in range(self.totalColumns)]
+
+    def getTableList(self):
+        return [
+            header + body
+            for header, body in zip(self.getTableHeader(), self.getTableBody())
+        ]
+
+    def getTableDict(self, dictType="normal"):
+        # Imported here so that loading a binary table doesn't need html parsing modules
+        from .Table2Dict import Table
+
+        return Table.fillTableDict(
+            OrderedDict.fromkeys(self.keys, ""),
+            self.getTableBody(),
+            self.dimensions,
+            dictType,
+        )
+
+    def close(self):
+        """
+        Releases views and closes memory-mapped file (columns can still be referenced, reading them raises a `ValueError`).
+        """
+        if self.closed:
+            return
+        self.closed = True
+        views = (
+            self.stringOffsets,
+            self.columnOffsets,
+            self.runValues,
+            self.runEnds,
+            self.blob,
+        )
+        for view in views:
+            if isinstance(view, memoryview):
+                view.release()
+        self.buffer.release()
+        if self.mappedFile != None:
+            self.mappedFile.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def loads(data):
+    """
+    Loads a table from bytes in binary format (returned by `dumps()`), without copying them.
+    """
+    return BinaryTable(data)
+
+
+def load(path):
+    """
+    Loads a table from a file in binary format (written by `dump()`). File is memory-mapped, so columns are read from
+    page cache only when accessed.
+
+    Params
+    ------
+    path : `str`
+        Path of binary file.
+
+    Returns
+    -------
+    `BinaryTable`
+        Loaded table (use it as a context manager or call `close()` to release file).
+    """
+    with open(path, "rb") as binaryFile:
+        mappedFile = mmap.mmap(binaryFile.fileno(), 0, access=mmap.ACCESS_READ)
+    return BinaryTable(mappedFile, mappedFile)
@@ -0,0 +1,168 @@
+"""
+Module to share resolved table headers between tables with identical header markup (like many pages generated from the same
+template). A process-wide LRU memo maps a hash of header rows html to the resolved header (see `Table.getTableHeader()`) and its
+dictionnary keys (see `Table.createDictKeys()`), so a table whose header was already seen skips header resolution & keys creation.
+
+Memo is bounded (least recently used headers are dropped first), it can be resized or turned off with `configureHeaderMemo()`
+or by setting the `TABLE2DICT_HEADER_MEMO` environment variable to "0" (hit-rate statistics are given by `headerMemoStats()`).
+"""
+
+from collections import OrderedDict, namedtuple
+import threading
+import hashlib
+import os
+
+# Set this environment variable to "0" to turn memo off
+HEADER_MEMO_ENV = "TABLE2DICT_HEADER_MEMO"
+DEFAULT_MAX_SIZE = 1024
+
+HeaderEntry = namedtuple("HeaderEntry", ["header", "keys"])
+
+
+def headerKey(headerRows, headerRowLength, maxRowspan, maxColspan):
+    """
+    Returns hash of header rows html (header length & span caps are part of it since they change resolved header).
+
+    Params
+    ------
+    headerRows : `list`
+        BS4 rows of table header (first row for tables without header).
+
+    headerRowLength : `int`
+        Number of header rows of table (a table without header and a table with a one row header hash the same rows).
+
+    maxRowspan / maxColspan : `int`
+        Span caps of table.
+
+    Returns
+    -------
+    `bytes`
+        Digest of header.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(
+        f"{len(headerRows)}:{headerRowLength}:{maxRowspan}:{maxColspan}".encode("utf-8")
+    )
+    for row in headerRows:
+        digest.update(b"\0")
+        digest.update(str(row).encode("utf-8"))
+    return digest.digest()
+
+
+class HeaderMemo:
+    """
+    Thread-safe bounded LRU memo of resolved headers.
+
+    Attributes
+    ----------
+        `maxSize` : `int`
+            Maximum number of headers kept.
+
+        `enabled` : `bool`
+            If False, memo is bypassed (nothing is looked up or stored).
+
+        `hits` / `misses` : `int`
+            Number of lookups that found (or not) a header.
+    """
+
+    def __init__(self, maxSize=DEFAULT_MAX_SIZE, enabled=True):
+        self.maxSize = maxSize
+        self.enabled = enabled
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Returns `HeaderEntry` of given key or None (entry becomes most recently used).
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry == None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, header, keys):
+        """
+        Stores resolved header (tuple of tuples) and its dictionnary keys (tuple or None), drops least recently used header
+        if memo is full.
+        """
+        with self.lock:
+            self.entries[key] = HeaderEntry(header, keys)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxSize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Drops every header and resets statistics.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self.entries),
+            "maxSize": self.maxSize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Process-wide memo shared by all tables
+headerMemo = HeaderMemo(enabled=os.environ.get(HEADER_MEMO_ENV, "1") != "0")
+
+
+def configureHeaderMemo(enabled=None, maxSize=None):
+    """
+    Turns process-wide header memo on or off and/or changes its size (memo is cleared when turned off, least recently used
+    headers are dropped when it's shrunk).
+
+    Params
+    ------
+    enabled : `bool`
+        True to use memo, False to turn it off (None keeps current state).
+
+    maxSize : `int`
+        Maximum number of headers kept (None keeps current size).
+    """
+    if enabled != None:
+        headerMemo.enabled = enabled
+        if not enabled:
+            headerMemo.clear()
+    if maxSize != None:
+        headerMemo.maxSize = maxSize
+        with headerMemo.lock:
+            while len(headerMemo.entries) > maxSize:
+                headerMemo.entries.popitem(last=False)
+
+
+def headerMemoStats():
+    """
+    Returns statistics of process-wide header memo.
+
+    Returns
+    -------
+    `dict`
+        - `enabled` : Whether memo is used
+        - `size` / `maxSize` : Number of headers kept / maximum number of headers
+        - `hits` / `misses` : Number of lookups that found (or not) a header
+        - `hitRate` : Hits / lookups
+    """
+    return headerMemo.stats()
+
+
+def clearHeaderMemo():
+    """
+    Drops every header of process-wide memo and resets its statistics.
+    """
+    headerMemo.clear()
@@ -0,0 +1,282 @@
+"""
+Module to re-convert a table that was already converted once (typically the same Wikipedia table scraped again the next day) without
+starting from scratch. A conversion "snapshot" stores the converted dictionnary alongside per-row content hashes, cell texts and the
+column each cell was placed in. When a new revision of the table comes in, only rows whose hash changed get their text extracted again,
+and only rows whose span region was touched by a change get their layout computed again. Every other row is re-used as is.
+
+Snapshots are plain JSON serializable dictionnaries, so they can be stored next to the converted table (see `Table.getTableSnapshot()`
+and `Table.getTableUpdate()`).
+"""
+
+from .utils.customLogging import moduleLogging
+from difflib import SequenceMatcher
+import hashlib
+
+# Set up logging for module
+logger = moduleLogging()
+
+# Bump this when the snapshot layout changes, older snapshots will then be ignored (full conversion)
+SNAPSHOT_VERSION = 1
+
+
+def rowHash(row):
+    """
+    Returns a short content hash of a table row (`<tr>` tag), based on its html markup.
+
+    Params
+    ------
+    row : `<class 'bs4.element.Tag'>`
+        BS4 row of table (like `<tr><td>1991</td><td>Bullhead</td></tr>`).
+
+    Returns
+    -------
+    str
+        Hexadecimal hash of row.
+    """
+    return hashlib.blake2b(str(row).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def scanBodyRow(table, row):
+    """
+    Extracts cleaned text and rowspan of every cell in a body row. Colspans are ignored since they are not handled
+    in table body (see `Table.getTableBody()`).
+
+    Returns
+    -------
+    list
+        List of `[text, rowspan]` pairs (rowspan is None if cell has no rowspan).
+    """
+    rowCells = []
+    for cell in table.removeNewLines(row.contents):
+        rowspan, colspan = table.getSpans(cell, table.maxRowspan, table.maxColspan)
+        rowCells.append([table.cellText(cell), rowspan])
+    return rowCells
+
+
+def layoutBodyRow(rowCells, rowIndex, state):
+    """
+    Places cells of a body row in table columns, following exactly the same rules as `Table.insertRows()` for body rows :
+    the first body row creates one column per cell, following rows put each cell in the first column that has no data yet
+    at this row index. Cells that can't find a spot are dropped.
+
+    Layout of a row only depends on its cells and on how "far" each column already goes compared to current row,
+    this is what `state` holds : for each column, `len(column) - rowIndex` when entering the row.
+
+    Params
+    ------
+    rowCells : `list`
+        List of `[text, rowspan]` pairs (returned by `scanBodyRow()`).
+
+    rowIndex : `int`
+        Index of row in table body.
+
+    state : `list`
+        Column state when entering the row (empty list for first body row).
+
+    Returns
+    -------
+    tuple
+        List of column indexes (one per cell, -1 if cell was dropped) and column state when entering next row.
+    """
+    columns = []
+    state = list(state)
+    for text, rowspan in rowCells:
+        count = rowspan if rowspan != None else 1
+        if rowIndex == 0:
+            # First body row creates columns
+            columns.append(len(state))
+            state.append(count)
+            continue
+        for colIndex, remaining in enumerate(state):
+            if remaining <= 0:
+                columns.append(colIndex)
+                state[colIndex] += count
+                break
+        else:
+            logger.debug(f"[*] No spot found for cell '{text}' at row {rowIndex}")
+            columns.append(-1)
+    return columns, [remaining - 1 for remaining in state]
+
+
+def buildBodyList(rowCells, rowColumns):
+    """
+    Rebuilds table body list representation (see `Table.getTableBody()`) from cells and their column indexes.
+    """
+    tableBodyRepr = [[] for _ in rowColumns[0]] if rowColumns else []
+    for cells, columns in zip(rowCells, rowColumns):
+        for (text, rowspan), colIndex in zip(cells, columns):
+            if colIndex == -1:
+                continue
+            count = rowspan if rowspan != None else 1
+            tableBodyRepr[colIndex].extend([text] * count)
+    return tableBodyRepr
+
+
+def splitRows(table):
+    """
+    Returns table type, header rows and body rows of a table.
+    """
+    tableType = table.getTableType()
+    headerRowLength = tableType["total_header_rows"]
+    return tableType, table.allRows[:headerRowLength], table.allRows[headerRowLength:]
+
+
+def createSnapshot(table, dictType="normal"):
+    """
+    Fully converts a table and returns a snapshot of the conversion (see `Table.getTableSnapshot()`).
+    """
+    tableType, headerRows, bodyRows = splitRows(table)
+    tableHeaderList = table.getTableHeader()
+    rowCells = []
+    rowColumns = []
+    rowStates = [[]]
+    for rowIndex, row in enumerate(bodyRows):
+        cells = scanBodyRow(table, row)
+        columns, nextState = layoutBodyRow(cells, rowIndex, rowStates[-1])
+        rowCells.append(cells)
+        rowColumns.append(columns)
+        rowStates.append(nextState)
+    return assembleSnapshot(
+        table,
+        tableType,
+        [rowHash(row) for row in headerRows],
+        tableHeaderList,
+        [rowHash(row) for row in bodyRows],
+        rowCells,
+        rowColumns,
+        rowStates,
+        dictType,
+    )
+
+
+def assembleSnapshot(
+    table,
+    tableType,
+    headerHashes,
+    tableHeaderList,
+    bodyHashes,
+    rowCells,
+    rowColumns,
+    rowStates,
+    dictType,
+):
+    """
+    Builds converted dictionnary and puts everything together in a snapshot dictionnary.
+    """
+    tableBodyList = buildBodyList(rowCells, rowColumns)
+    assert len(tableHeaderList) == len(
+        tableBodyList
+    ), "Table header & body don't have the same number of columns !"
+    return {
+        "version": SNAPSHOT_VERSION,
+        "dictType": dictType,
+        "tableType": tableType,
+        "headerHashes": headerHashes,
+        "header": tableHeaderList,
+        "rowHashes": bodyHashes,
+        "rowCells": rowCells,
+        "rowColumns": rowColumns,
+        "rowStates": rowStates,
+        "table": table.buildTableDict(
+            tableHeaderList, tableBodyList, tableType, dictType
+        ),
+    }
+
+
+def rowDiff(opcodes):
+    """
+    Turns `difflib` opcodes computed on row hashes into a row level diff. Replaced blocks are paired row by row
+    (changed rows), any extra row in a replaced block is either added or removed.
+
+    Returns
+    -------
+    dict
+        - `added` : Indexes of added rows (in new table body)
+        - `removed` : Indexes of removed rows (in previous table body)
+        - `changed` : `[previousIndex, newIndex]` pairs of modified rows
+    """
+    diff = {"added": [], "removed": [], "changed": []}
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            continue
+        paired = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+        diff["changed"].extend([i1 + k, j1 + k] for k in range(paired))
+        diff["removed"].extend(range(i1 + paired, i2))
+        diff["added"].extend(range(j1 + paired, j2))
+    return diff
+
+
+def updateSnapshot(table, previous, dictType="normal"):
+    """
+    Converts a new revision of a table re-using everything that didn't change since previous snapshot
+    (see `Table.getTableUpdate()`).
+    """
+    if previous is None or previous.get("version") != SNAPSHOT_VERSION:
+        logger.info("No usable previous snapshot, doing a full conversion.")
+        snapshot = createSnapshot(table, dictType)
+        diff = rowDiff([("insert", 0, 0, 0, len(snapshot["rowHashes"]))])
+        diff["headerChanged"] = True
+        diff["relaidOut"] = diff["added"][:]
+        return snapshot, diff
+    tableType, headerRows, bodyRows = splitRows(table)
+    # === 1. Table header (only a few rows, so it's either re-used or fully resolved again) === #
+    headerHashes = [rowHash(row) for row in headerRows]
+    headerChanged = (
+        headerHashes != previous["headerHashes"]
+        or tableType != previous["tableType"]
+    )
+    if headerChanged:
+        tableHeaderList = table.getTableHeader()
+    else:
+        tableHeaderList = previous["header"]
+    # === 2. Match body rows with previous ones thanks to their hash === #
+    bodyHashes = [rowHash(row) for row in bodyRows]
+    opcodes = SequenceMatcher(
+        None, previous["rowHashes"], bodyHashes, autojunk=False
+    ).get_opcodes()
+    previousIndexes = {}
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag == "equal":
+            previousIndexes.update(zip(range(j1, j2), range(i1, i2)))
+    # === 3. Re-use unchanged rows, extract text & layout only where needed === #
+    rowCells = []
+    rowColumns = []
+    rowStates = [[]]
+    relaidOut = []
+    for rowIndex, row in enumerate(bodyRows):
+        state = rowStates[-1]
+        previousIndex = previousIndexes.get(rowIndex)
+        if previousIndex is None:
+            # Row is new or modified
+            cells = scanBodyRow(table, row)
+        else:
+            cells = previous["rowCells"][previousIndex]
+            if list(previous["rowStates"][previousIndex]) == state:
+                # Same content & same span region, layout is the same as before
+                rowCells.append(cells)
+                rowColumns.append(previous["rowColumns"][previousIndex])
+                rowStates.append(list(previous["rowStates"][previousIndex + 1]))
+                continue
+        columns, nextState = layoutBodyRow(cells, rowIndex, state)
+        rowCells.append(cells)
+        rowColumns.append(columns)
+        rowStates.append(nextState)
+        relaidOut.append(rowIndex)
+    logger.info(
+        f"Incremental conversion : {len(bodyRows) - len(relaidOut)}/{len(bodyRows)} body rows re-used"
+    )
+    snapshot = assembleSnapshot(
+        table,
+        tableType,
+        headerHashes,
+        tableHeaderList,
+        bodyHashes,
+        rowCells,
+        rowColumns,
+        rowStates,
+        dictType,
+    )
+    diff = rowDiff(opcodes)
+    diff["headerChanged"] = headerChanged
+    diff["relaidOut"] = relaidOut
+    return snapshot, diff
@@ -0,0 +1,328 @@
+"""
+Module to run resumable bulk conversions over big corpora of html files. A job is a sqlite database used as a work queue : files
+are added once, then any number of workers (threads of a process, processes or machines sharing a filesystem) drain the queue by
+leasing batches of files, converting them (see `batch.convertTables()`) and checkpointing each file as done or failed. When a run
+crashes, the next one resumes where it stopped : done files are never converted again and files leased by a dead worker are
+leased again once their lease expired.
+
+Queue table (`files`) :
+
+| Column      | Content                                                                             |
+|-------------|-------------------------------------------------------------------------------------|
+| `path`      | Path of html file (primary key)                                                     |
+| `status`    | "pending", "running", "done" or "failed"                                            |
+| `worker`    | Id of worker that leased file (`host:pid:random`)                                   |
+| `leasedAt`  | Time of lease (seconds since epoch)                                                 |
+| `attempts`  | Number of times file was leased                                                     |
+| `result`    | Conversion result (JSON) once done                                                  |
+| `error`     | Error message if failed                                                             |
+
+Note : sqlite locking over network filesystems (NFS, SMB) is only as reliable as the filesystem's own locks, database uses
+rollback journal (not WAL) so that it works on shared filesystems.
+"""
+
+from .utils.customLogging import moduleLogging
+from .batch import convertTables
+from contextlib import contextmanager
+import sqlite3
+import socket
+import json
+import time
+import uuid
+import os
+
+# Set up logging for module
+logger = moduleLogging()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    leasedAt REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS filesStatus ON files (status);
+"""
+
+STATUSES = ("pending", "running", "done", "failed")
+
+
+class ConversionJob:
+    """
+    Resumable conversion job backed by a sqlite work queue (see module documentation).
+
+    Attributes
+    ----------
+        `path` : `str`
+            Path of sqlite database (created if it doesn't exist).
+
+        `workerId` : `str`
+            Unique id of this worker, recorded on every leased file.
+
+        `leaseTimeout` : `int`
+            Seconds after which a file leased by another worker that didn't checkpoint it is considered lost and leased again.
+
+        `maxAttempts` : `int`
+            Maximum number of leases of a file, a file still not converted after that is marked as failed (a file crashing its
+            worker every time won't block the queue forever).
+
+    Methods
+    -------
+        `addFiles` : paths
+            Adds files to queue (files already in queue are ignored).
+
+        `run` : workers, batchSize, limit
+            Drains queue until it's empty and returns counts of files converted by this worker.
+
+        `progress`
+            Returns number of files per status.
+
+        `results` / `failures`
+            Iterates over converted files & results / failed files & errors.
+
+        `requeue` : status
+            Puts files with given status back in queue.
+    """
+
+    def __init__(
+        self,
+        path,
+        method="getTableDict",
+        parser="html.parser",
+        validate=False,
+        leaseTimeout=600,
+        maxAttempts=3,
+        **methodKwargs,
+    ):
+        self.path = path
+        self.method = method
+        self.parser = parser
+        self.validate = validate
+        self.leaseTimeout = leaseTimeout
+        self.maxAttempts = maxAttempts
+        self.methodKwargs = methodKwargs
+        self.workerId = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        # Transactions are handled explicitly (autocommit mode), waits for other workers' locks instead of failing
+        self.connection = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.connection.executescript(SCHEMA)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Write transaction, database is locked right away (so two workers can't read the same pending files before leasing them).
+        """
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.connection
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+
+    def addFiles(self, paths, batchSize=10000):
+        """
+        Adds files to queue, files already in queue (whatever their status) are ignored so adding a corpus twice is harmless.
+
+        Params
+        ------
+        paths : `iterable`
+            Paths of html files.
+
+        batchSize : `int`
+            Number of files inserted per transaction.
+
+        Returns
+        -------
+        `int`
+            Number of files added.
+        """
+        added = 0
+        paths = iter(paths)
+        while True:
+            chunk = [(path,) for _, path in zip(range(batchSize), paths)]
+            if not chunk:
+                return added
+            with self.transaction() as connection:
+                before = connection.total_changes
+                connection.executemany(
+                    "INSERT OR IGNORE INTO files (path) VALUES (?)", chunk
+                )
+                added += connection.total_changes - before
+
+    def lease(self, batchSize):
+        """
+        Leases up to `batchSize` files : pending ones and running ones whose lease expired.
+
+        Returns
+        -------
+        `list`
+            Paths of leased files (empty if queue is drained).
+        """
+        now = time.time()
+        with self.transaction() as connection:
+            # Files lost too many times are given up
+            connection.execute(
+                "UPDATE files SET status = 'failed', error = 'Too many attempts' "
+                "WHERE status = 'running' AND leasedAt < ? AND attempts >= ?",
+                (now - self.leaseTimeout, self.maxAttempts),
+            )
+            paths = [
+                row[0]
+                for row in connection.execute(
+                    "SELECT path FROM files WHERE status = 'pending' "
+                    "OR (status = 'running' AND leasedAt < ?) LIMIT ?",
+                    (now - self.leaseTimeout, batchSize),
+                )
+            ]
+            connection.executemany(
+                "UPDATE files SET status = 'running', worker = ?, leasedAt = ?, attempts = attempts + 1 WHERE path = ?",
+                [(self.workerId, now, path) for path in paths],
+            )
+        return paths
+
+    def checkpoint(self, paths, results):
+        """
+        Records results of leased files in one transaction. A file whose lease was taken over by another worker meanwhile is
+        left to that worker, a result that can't be serialized to JSON is recorded as a failure of its file.
+
+        Returns
+        -------
+        `tuple`
+            Number of files recorded as done & as failed.
+        """
+        done = []
+        failed = []
+        for path, result in zip(paths, results):
+            if isinstance(result, Exception):
+                failed.append((f"{type(result).__name__}: {result}", path, self.workerId))
+                continue
+            try:
+                done.append((json.dumps(result), path, self.workerId))
+            except (TypeError, ValueError) as error:
+                failed.append((f"{type(error).__name__}: {error}", path, self.workerId))
+        with self.transaction() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                "UPDATE files SET status = 'done', result = ?, error = NULL "
+                "WHERE path = ? AND worker = ? AND status = 'running'",
+                done,
+            )
+            doneCount = connection.total_changes - before
+            connection.executemany(
+                "UPDATE files SET status = 'failed', error = ? "
+                "WHERE path = ? AND worker = ? AND status = 'running'",
+                failed,
+            )
+            failedCount = connection.total_changes - before - doneCount
+        return doneCount, failedCount
+
+    def run(self, workers=None, batchSize=100, limit=None):
+        """
+        Drains queue : leases a batch of files, converts it with a pool of threads and checkpoints it, until queue is empty.
+        Several processes (or machines sharing database file) can call it at the same time on the same job.
+
+        Params
+        ------
+        workers : `int`
+            Number of conversion threads (see `batch.convertTables()`).
+
+        batchSize : `int`
+            Number of files leased & checkpointed at once (a crash loses at most one batch of work).
+
+        limit : `int`
+            Stops after this number of files (None drains whole queue).
+
+        Returns
+        -------
+        `dict`
+            Number of files converted ("done") and failed ("failed") by this worker.
+        """
+        counts = {"done": 0, "failed": 0}
+        while limit == None or counts["done"] + counts["failed"] < limit:
+            size = batchSize
+            if limit != None:
+                size = min(size, limit - counts["done"] - counts["failed"])
+            paths = self.lease(size)
+            if not paths:
+                break
+            results = convertTables(
+                paths,
+                self.method,
+                workers,
+                self.parser,
+                errors="return",
+                validate=self.validate,
+                **self.methodKwargs,
+            )
+            done, failed = self.checkpoint(paths, results)
+            counts["done"] += done
+            counts["failed"] += failed
+            logger.info(
+                "Worker %s checkpointed %d done, %d failed file(s)",
+                self.workerId,
+                done,
+                failed,
+            )
+        return counts
+
+    def progress(self):
+        """
+        Returns number of files per status (see `STATUSES`).
+        """
+        counts = dict.fromkeys(STATUSES, 0)
+        for status, count in self.connection.execute(
+            "SELECT status, COUNT(*) FROM files GROUP BY status"
+        ):
+            counts[status] = count
+        return counts
+
+    def results(self):
+        """
+        Iterates over converted files as `(path, result)` tuples.
+        """
+        for path, result in self.connection.execute(
+            "SELECT path, result FROM files WHERE status = 'done' ORDER BY path"
+        ):
+            yield path, json.loads(result)
+
+    def failures(self):
+        """
+        Iterates over failed files as `(path, error)` tuples.
+        """
+        yield from self.connection.execute(
+            "SELECT path, error FROM files WHERE status = 'failed' ORDER BY path"
+        )
+
+    def requeue(self, status="failed"):
+        """
+        Puts files with given status back in queue (to retry failed files, or to take over files of a worker known to be dead
+        without waiting for their lease to expire).
+
+        Returns
+        -------
+        `int`
+            Number of requeued files.
+        """
+        if status not in ("running", "failed"):
+            raise ValueError(
+                f"'{status}' is not a valid argument for 'status' ! It should be either 'running' or 'failed'."
+            )
+        with self.transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE files SET status = 'pending', worker = NULL, leasedAt = NULL, attempts = 0, error = NULL "
+                "WHERE status = ?",
+                (status,),
+            )
+        return cursor.rowcount
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,150 @@
+"""
+Module to resolve the body of one very large table with a pool of threads (see `workers` argument of `Table`). Body rows are split
+in chunks and every chunk is processed by a worker : text extraction of its cells and layout of its rows (see
+`incremental.layoutBodyRow()`). A chunk doesn't know which rowspans of previous chunks reach it, so its layout is computed
+speculatively as if no rowspan crossed its first row.
+
+A stitching pass then goes through chunks in order : when rowspans of previous chunk do reach a chunk (column state at its first row
+isn't the speculative one), its rows are laid out again with the real state, only until state matches speculative state again
+(a rowspan only covers a few rows, so it's usually a handful of rows). Cell texts are never extracted twice, and result is the
+same as sequential `Table.getTableBody()`.
+
+Workers are threads, so text extraction & layout only run in parallel on free-threaded CPython builds (3.13+). With the GIL
+they're pure Python code that can't go faster than sequential resolution (chunking & stitching would only add their own
+cost), so `Table` only uses this module on free-threaded builds and resolves body sequentially otherwise.
+"""
+
+from .utils.customLogging import moduleLogging
+from .incremental import scanBodyRow, layoutBodyRow, buildBodyList
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+import sys
+
+# Set up logging for module
+logger = moduleLogging()
+
+# Tables with fewer body rows are resolved sequentially (threads wouldn't pay off)
+PARALLEL_MIN_ROWS = 2000
+
+
+def isFreeThreaded():
+    """
+    Returns True if running on a free-threaded CPython build with the GIL disabled.
+    """
+    isGilEnabled = getattr(sys, "_is_gil_enabled", None)
+    return isGilEnabled is not None and not isGilEnabled()
+
+
+def scanChunk(table, rows, start, columnCount):
+    """
+    Extracts cells of a chunk of body rows and lays them out speculatively.
+
+    Params
+    ------
+    table : `Table`
+        Table object.
+
+    rows : `list`
+        BS4 rows of chunk.
+
+    start : `int`
+        Body index of first row of chunk.
+
+    columnCount : `int`
+        Number of columns of table body (cells of first body row).
+
+    Returns
+    -------
+    `tuple`
+        Cells of rows (see `incremental.scanBodyRow()`), column of each cell (see `incremental.layoutBodyRow()`) and column
+        states (one more than rows, first one is speculative state of chunk).
+    """
+    rowCells = []
+    rowColumns = []
+    # First chunk starts table body, any other chunk assumes every column is free at its first row
+    state = [] if start == 0 else [0] * columnCount
+    rowStates = [state]
+    for rowIndex, row in enumerate(rows, start):
+        cells = scanBodyRow(table, row)
+        columns, state = layoutBodyRow(cells, rowIndex, state)
+        rowCells.append(cells)
+        rowColumns.append(columns)
+        rowStates.append(state)
+    return rowCells, rowColumns, rowStates
+
+
+def stitchChunk(start, rowCells, rowColumns, rowStates, state):
+    """
+    Lays out rows of a chunk again with real column state at its first row, until state matches speculative state.
+
+    Returns
+    -------
+    `int`
+        Number of rows laid out again.
+    """
+    if state == rowStates[0]:
+        return 0
+    for offset, cells in enumerate(rowCells):
+        columns, state = layoutBodyRow(cells, start + offset, state)
+        rowColumns[offset] = columns
+        if state == rowStates[offset + 1]:
+            # Following rows have the same layout as speculated
+            return offset + 1
+        rowStates[offset + 1] = state
+    return len(rowCells)
+
+
+def parallelTableBody(table, workers, chunkSize=None):
+    """
+    Resolves table body with a pool of threads (see module documentation).
+
+    Params
+    ------
+    table : `Table`
+        Table object.
+
+    workers : `int`
+        Number of threads.
+
+    chunkSize : `int`
+        Number of rows per chunk (defaults to 4 chunks per worker).
+
+    Returns
+    -------
+    `list`
+        Nested list representing table body, same as `Table.getTableBody()`.
+    """
+    headerRowLength = table.getTableType()["total_header_rows"]
+    bodyRows = table.allRows[headerRowLength:]
+    if not bodyRows:
+        return []
+    columnCount = len(table.removeNewLines(bodyRows[0].contents))
+    if chunkSize == None:
+        chunkSize = max(-(-len(bodyRows) // (workers * 4)), 1)
+    starts = range(0, len(bodyRows), chunkSize)
+
+    def scan(start):
+        return scanChunk(
+            table, islice(bodyRows, start, start + chunkSize), start, columnCount
+        )
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        chunks = list(pool.map(scan, starts))
+    # === Stitching pass === #
+    allCells = []
+    allColumns = []
+    state = []
+    relaidRows = 0
+    for start, (rowCells, rowColumns, rowStates) in zip(starts, chunks):
+        if start != 0:
+            relaidRows += stitchChunk(start, rowCells, rowColumns, rowStates, state)
+        state = rowStates[-1]
+        allCells.extend(rowCells)
+        allColumns.extend(rowColumns)
+    logger.debug(
+        "Resolved %d body rows in %d chunks, %d rows laid out again",
+        len(bodyRows),
+        len(chunks),
+        relaidRows,
+    )
+    return buildBodyList(allCells, allColumns)
@@ -0,0 +1,501 @@
+"""
+Module to run conversions as a pipeline of stages connected by bounded queues, so that I/O of some tables overlaps with CPU work on
+others and every stage can be given its own parallelism. A stage is a function applied to each item by a pool of worker threads
+(or processes), a full queue blocks the stage feeding it (backpressure) and every stage measures its own throughput
+(see `sources.StageStats`).
+
+`tablePipeline()` splits a conversion in the steps of `Table` :
+
+| Stage       | Work                                                                                                 |
+|-------------|------------------------------------------------------------------------------------------------------|
+| `read`      | Reads html file (bytes)                                                                              |
+| `parse`     | Parses html with BeautifulSoup                                                                       |
+| `locate`    | Finds table tag & creates `Table` (pages without table are dropped)                                 |
+| `resolve`   | Table type, header & layout of body spans (`incremental.layoutBodyRow()`, no text extraction)        |
+| `extract`   | Extracts text of body cells and stores resolved body in table cache                                  |
+| `serialise` | Calls conversion method (`getTableDict` by default), optionally encodes result to JSON                |
+| `write`     | Appends `{"source": ..., "result": ...}` lines to a JSON Lines file (only if an output is given)      |
+
+Stages only fill the cache of `Table` with what its own getters would compute, so results are the same as `Table` methods.
+Table stages hand bs4 objects to each other, they run in threads (`processes=True` is for stages whose items can be pickled).
+"""
+
+from .utils.customLogging import moduleLogging
+from .Table2Dict import Table
+from .incremental import layoutBodyRow, buildBodyList
+from .sources import StageStats
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+import threading
+import queue
+import time
+import json
+import os
+
+# Set up logging for module
+logger = moduleLogging()
+
+# Queue items marking end of items & items dropped by a stage (kept in flow so that output order can be restored)
+END = object()
+DROPPED = object()
+TABLE_STAGES = ("read", "parse", "locate", "resolve", "extract", "serialise", "write")
+
+
+class Stage:
+    """
+    Step of a pipeline.
+
+    Attributes
+    ----------
+        `name` : `str`
+            Name of stage (key of its statistics).
+
+        `function` : `callable`
+            Called with each item, returns item for next stage (None drops item).
+
+        `workers` : `int`
+            Number of items handled at the same time.
+
+        `processes` : `bool`
+            If True, `function` runs in a pool of `workers` processes (function & items must be picklable).
+
+        `queueSize` : `int`
+            Number of items waiting for this stage at most.
+    """
+
+    def __init__(self, name, function, workers=1, processes=False, queueSize=8):
+        self.name = name
+        self.function = function
+        self.workers = workers
+        self.processes = processes
+        self.queueSize = queueSize
+
+
+class Pipeline:
+    """
+    Stages connected by bounded queues (see module documentation).
+
+    Attributes
+    ----------
+        `stages` : `list`
+            `Stage` of pipeline, in order.
+
+        `ordered` : `bool`
+            If True (default), results are yielded in input order, else as soon as they're done.
+
+        `reorderSize` : `int`
+            Results held back while an earlier item is still in a stage, at most (ordered pipelines only, defaults to queue
+            size of last stage). Feeding of items blocks once it's reached.
+
+        `stats` : `dict`
+            `StageStats` of each stage (from last run).
+
+    Methods
+    -------
+        `run` : items
+            Iterates over results of items (first error of any stage stops pipeline and is raised).
+
+        `getStats`
+            Returns counters & throughput of each stage.
+    """
+
+    def __init__(self, stages, ordered=True, reorderSize=None):
+        self.stages = list(stages)
+        self.ordered = ordered
+        self.reorderSize = reorderSize or self.stages[-1].queueSize
+        # Index of next result to yield (ordered pipelines), fed items stay within `reorderSize` of it
+        self.nextIndex = 0
+        self.window = threading.Condition()
+        self.stats = {stage.name: StageStats(stage.name) for stage in self.stages}
+        self.queues = []
+        self.stopped = threading.Event()
+        self.error = None
+
+    # === Queues (every wait gives up when pipeline is stopped) === #
+    def put(self, channel, item, stats=None):
+        started = time.perf_counter()
+        while not self.stopped.is_set():
+            try:
+                channel.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        if stats != None:
+            stats.recordWait(time.perf_counter() - started)
+
+    def get(self, channel, stats=None):
+        started = time.perf_counter()
+        while not self.stopped.is_set():
+            try:
+                item = channel.get(timeout=0.1)
+                break
+            except queue.Empty:
+                continue
+        else:
+            item = END
+        if stats != None:
+            stats.recordWait(time.perf_counter() - started)
+        return item
+
+    def waitWindow(self, index):
+        # Returns False if pipeline is stopped while waiting
+        with self.window:
+            while index - self.nextIndex >= self.reorderSize:
+                if self.stopped.is_set():
+                    return False
+                self.window.wait(0.1)
+        return True
+
+    def fail(self, error):
+        if self.error == None:
+            self.error = error
+        self.stopped.set()
+
+    # === Workers === #
+    def feed(self, items):
+        try:
+            for index, item in enumerate(items):
+                if self.stopped.is_set():
+                    return
+                if self.ordered and not self.waitWindow(index):
+                    return
+                self.put(self.queues[0], (index, item))
+        except Exception as error:
+            self.fail(error)
+        self.put(self.queues[0], END)
+
+    def work(self, stageIndex, pool, remaining):
+        stage = self.stages[stageIndex]
+        stats = self.stats[stage.name]
+        inbox = self.queues[stageIndex]
+        outbox = self.queues[stageIndex + 1]
+        while True:
+            item = self.get(inbox, stats)
+            if item is END:
+                # Let sibling workers see end too, last one forwards it
+                self.put(inbox, END)
+                with remaining[1]:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    self.put(outbox, END)
+                return
+            index, value = item
+            if value is not DROPPED:
+                started = time.perf_counter()
+                try:
+                    if pool != None:
+                        value = pool.submit(stage.function, value).result()
+                    else:
+                        value = stage.function(value)
+                except Exception as error:
+                    self.fail(error)
+                    return
+                stats.record(time.perf_counter() - started)
+                if value == None:
+                    value = DROPPED
+            self.put(outbox, (index, value), stats)
+
+    def run(self, items):
+        """
+        Runs items through every stage, yields results of last stage.
+        """
+        self.stats = {stage.name: StageStats(stage.name) for stage in self.stages}
+        self.stopped.clear()
+        self.error = None
+        self.nextIndex = 0
+        self.queues = [queue.Queue(maxsize=stage.queueSize) for stage in self.stages]
+        self.queues.append(queue.Queue(maxsize=self.stages[-1].queueSize))
+        pools = []
+        threads = [threading.Thread(target=self.feed, args=(items,), daemon=True)]
+        for stageIndex, stage in enumerate(self.stages):
+            pool = ProcessPoolExecutor(stage.workers) if stage.processes else None
+            if pool != None:
+                pools.append(pool)
+            remaining = [stage.workers, threading.Lock()]
+            for _ in range(stage.workers):
+                threads.append(
+                    threading.Thread(
+                        target=self.work,
+                        args=(stageIndex, pool, remaining),
+                        daemon=True,
+                    )
+                )
+        for thread in threads:
+            thread.start()
+        try:
+            pending = {}
+            while True:
+                item = self.get(self.queues[-1])
+                if item is END:
+                    break
+                index, value = item
+                if not self.ordered:
+                    if value is not DROPPED:
+                        yield value
+                    continue
+                # Restore input order
+                pending[index] = value
+                while self.nextIndex in pending:
+                    value = pending.pop(self.nextIndex)
+                    with self.window:
+                        self.nextIndex += 1
+                        self.window.notify()
+                    if value is not DROPPED:
+                        yield value
+            if self.error != None:
+                raise self.error
+        finally:
+            self.stopped.set()
+            for thread in threads:
+                thread.join()
+            for pool in pools:
+                pool.shutdown()
+
+    def getStats(self):
+        """
+        Returns counters of each stage (see `StageStats.snapshot()`), in pipeline order.
+        """
+        return {name: stage.snapshot() for name, stage in self.stats.items()}
+
+
+# ===================================== #
+# ============ TABLE STAGES =========== #
+# ===================================== #
+class TableJob:
+    """
+    Conversion going through table stages.
+    """
+
+    __slots__ = ("source", "data", "soup", "table", "layout", "result")
+
+    def __init__(self, source):
+        self.source = source
+        self.data = None
+        self.soup = None
+        self.table = None
+        self.layout = None
+        self.result = None
+
+
+def readStage(job):
+    if isinstance(job.source, (str, os.PathLike)):
+        with open(job.source, "rb") as htmlFile:
+            job.data = htmlFile.read()
+    else:
+        # Html given as bytes
+        job.data = job.source
+    return job
+
+
+def parseStage(job, parser):
+    import bs4
+
+    job.soup = bs4.BeautifulSoup(job.data, parser)
+    job.data = None
+    return job
+
+
+def locateStage(job, tableOptions):
+    table = job.soup.find("table")
+    if table == None:
+        logger.warning("No table found in '%s', page dropped", job.source)
+        return None
+    job.table = Table(table, **tableOptions)
+    job.soup = None
+    return job
+
+
+def resolveStage(job):
+    table = job.table
+    table.getTableType()
+    table.getTableHeader()
+    if table.memoryBudget != None or table.workers != None:
+        # Spilled or parallel bodies are resolved by `Table` itself
+        table.getTableBody()
+        return job
+    headerRowLength = table.cache["tableType"]["total_header_rows"]
+    state = []
+    rowCells = []
+    rowColumns = []
+    for rowIndex, row in enumerate(islice(table.allRows, headerRowLength, None)):
+        cells = []
+        for cell in table.removeNewLines(row.contents):
+            rowspan, colspan = table.getSpans(cell, table.maxRowspan, table.maxColspan)
+            cells.append([cell, rowspan])
+        columns, state = layoutBodyRow(cells, rowIndex, state)
+        rowCells.append(cells)
+        rowColumns.append(columns)
+    job.layout = (rowCells, rowColumns)
+    return job
+
+
+def extractStage(job):
+    if job.layout == None:
+        return job
+    table = job.table
+    rowCells, rowColumns = job.layout
+    for cells, columns in zip(rowCells, rowColumns):
+        for cell, colIndex in zip(cells, columns):
+            # Dropped cells aren't extracted
+            cell[0] = table.cellText(cell[0]) if colIndex != -1 else ""
+    body = buildBodyList(rowCells, rowColumns)
+    table.cache["body"] = tuple(tuple(column) for column in body)
+    job.layout = None
+    return job
+
+
+def serialiseStage(job, method, encode, methodKwargs):
+    job.result = getattr(job.table, method)(**methodKwargs)
+    if encode:
+        job.result = json.dumps(job.result, default=list)
+    return job
+
+
+class JsonLinesSink:
+    """
+    Write stage appending one line per table to a JSON Lines file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.mode = "w"
+        self.lock = threading.Lock()
+
+    def open(self):
+        if self.file == None:
+            self.file = open(self.path, self.mode, encoding="utf-8")
+            # Next runs append to lines of previous ones
+            self.mode = "a"
+        return self
+
+    def __call__(self, job):
+        source = job.source if isinstance(job.source, (str, os.PathLike)) else None
+        line = json.dumps(
+            {"source": str(source) if source != None else None, "result": job.result},
+            ensure_ascii=False,
+            default=list,
+        )
+        with self.lock:
+            self.file.write(line)
+            self.file.write("\n")
+        return job
+
+    def close(self):
+        if self.file != None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def tablePipeline(
+    method="getTableDict",
+    output=None,
+    parser="html.parser",
+    workers=None,
+    queueSize=8,
+    encode=False,
+    ordered=True,
+    tableOptions=None,
+    **methodKwargs,
+):
+    """
+    Creates a pipeline converting tables with `Table` stages (see module documentation). Run it with `TablePipeline.run()`.
+
+    Params
+    ------
+    method : `str`
+        Name of `Table` method giving result (default is "getTableDict").
+
+    output : `str`
+        Optional path of a JSON Lines file where results are written (adds `write` stage). File is open while `run()` runs,
+        next runs append to it.
+
+    parser : `str`
+        BS4 parser used to parse html.
+
+    workers : `dict`
+        Number of threads of stages (stage name -> number, 1 by default).
+
+    queueSize : `int`
+        Size of queue in front of each stage.
+
+    encode : `bool`
+        If True, results are encoded to JSON strings in `serialise` stage.
+
+    ordered : `bool`
+        If True (default), results are yielded in input order.
+
+    tableOptions : `dict`
+        Keyword arguments passed to `Table` (`maxRowspan`, `maxColspan`, `memoryBudget`, ...).
+
+    **methodKwargs
+        Keyword arguments passed to `Table` method.
+
+    Returns
+    -------
+    `TablePipeline`
+        Pipeline yielding (source, result) of each table.
+    """
+    workers = workers or {}
+    unknown = set(workers) - set(TABLE_STAGES)
+    if unknown:
+        raise ValueError(
+            f"Unknown stage(s) {', '.join(sorted(unknown))} ! Stages are {', '.join(TABLE_STAGES)}."
+        )
+    functions = {
+        "read": readStage,
+        "parse": partial(parseStage, parser=parser),
+        "locate": partial(locateStage, tableOptions=tableOptions or {}),
+        "resolve": resolveStage,
+        "extract": extractStage,
+        "serialise": partial(
+            serialiseStage, method=method, encode=encode, methodKwargs=methodKwargs
+        ),
+    }
+    sink = None
+    if output != None:
+        sink = functions["write"] = JsonLinesSink(output)
+    stages = [
+        Stage(name, function, workers.get(name, 1), queueSize=queueSize)
+        for name, function in functions.items()
+    ]
+    return TablePipeline(stages, ordered, sink)
+
+
+class TablePipeline(Pipeline):
+    """
+    Pipeline of `Table` stages (see `tablePipeline()`), `run()` takes html file paths (or html as bytes) and yields (source, result).
+    """
+
+    def __init__(self, stages, ordered=True, sink=None):
+        super().__init__(stages, ordered)
+        self.sink = sink
+
+    def run(self, sources):
+        # Output file is only open while pipeline runs
+        if self.sink != None:
+            self.sink.open()
+        try:
+            for job in super().run(TableJob(source) for source in sources):
+                yield job.source, job.result
+        finally:
+            if self.sink != None:
+                self.sink.close()
+
+    def close(self):
+        if self.sink != None:
+            self.sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
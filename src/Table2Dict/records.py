@@ -0,0 +1,185 @@
+"""
+Module to get table body as per-row records instead of columns (see `Table.getTableRecords()` and `Table.iterTableRecords()`).
+
+A record type is generated once per table from its dictionnary keys (see `Table.createDictKeys()`) : it's a named tuple, so a record
+only holds references to its cells (no per-row dict, keys are stored once in the type). Records can be accessed by position,
+by original key (`record["Label (Company)"]`) or by attribute (`record.Label_Company`, keys are turned into identifiers).
+
+Streaming resolves body rows one by one straight from html rows, following the same layout rules as `Table.getTableBody()`
+(see `incremental.layoutBodyRow()`), so whole body is never held in memory. A rowspan is carried over to next rows as a pending run
+of its column, and a row is released as soon as every column has a cell for it.
+
+A `where` predicate can be pushed down into streaming (see `iterRows()`) : it gets a lazy row (mapping key -> cell text) and text
+is only extracted for cells the predicate reads. Rejected rows are neither extracted nor stored, cells they share with next rows
+(rowspans) stay pending and are extracted only if an accepted row needs them.
+"""
+
+from .incremental import layoutBodyRow
+from collections import namedtuple, deque
+from collections.abc import Mapping
+from itertools import islice
+import re
+
+
+def fieldName(key):
+    """
+    Turns a dictionnary key into an identifier (`"Label (Company)"` -> `"Label_Company"`).
+    """
+    return re.sub(r"\W+", "_", key).strip("_")
+
+
+def recordType(keys):
+    """
+    Generates a record type (named tuple subclass) for given keys. Invalid or duplicated field names are renamed by
+    `namedtuple` (to `_0`, `_1`, ...).
+
+    Params
+    ------
+    keys : `list`
+        Dictionnary keys of table.
+
+    Returns
+    -------
+    `type`
+        Record type, original keys are in `_keys`.
+    """
+    base = namedtuple("Record", [fieldName(key) for key in keys], rename=True)
+
+    class Record(base):
+        __slots__ = ()
+        _keys = tuple(keys)
+        _keyIndex = {key: index for index, key in enumerate(keys)}
+
+        def __getitem__(self, index):
+            if isinstance(index, str):
+                index = self._keyIndex[index]
+            return tuple.__getitem__(self, index)
+
+        def _asdict(self):
+            # Original keys, not field names
+            return dict(zip(self._keys, self))
+
+    return Record
+
+
+class LazyCell:
+    """
+    Body cell whose text is only extracted when first needed (a cell carried over by a rowspan is extracted once).
+    """
+
+    __slots__ = ("cell", "text")
+
+    def __init__(self, cell):
+        self.cell = cell
+        self.text = None
+
+    def getText(self, table):
+        if self.text == None:
+            self.text = table.cellText(self.cell)
+        return self.text
+
+
+class LazyRow(Mapping):
+    """
+    Row given to `where` predicates, a read-only mapping key -> cell text where text is extracted when a key is first read.
+    """
+
+    __slots__ = ("table", "keyIndex", "cells")
+
+    def __init__(self, table, keyIndex, cells):
+        self.table = table
+        self.keyIndex = keyIndex
+        self.cells = cells
+
+    def __getitem__(self, key):
+        return self.cells[self.keyIndex[key]].getText(self.table)
+
+    def __iter__(self):
+        return iter(self.keyIndex)
+
+    def __len__(self):
+        return len(self.keyIndex)
+
+
+def iterBodyRows(table):
+    """
+    Resolves body rows one by one from html rows, yields each row as a list of `LazyCell` (one per column). Rows are the same
+    as rows of `zip(*table.getTableBody())`.
+    """
+    headerRowLength = table.getTableType()["total_header_rows"]
+    state = []
+    pending = []
+    for rowIndex, row in enumerate(islice(table.allRows, headerRowLength, None)):
+        rowCells = []
+        for cell in table.removeNewLines(row.contents):
+            rowspan, colspan = table.getSpans(cell, table.maxRowspan, table.maxColspan)
+            rowCells.append((cell, rowspan))
+        columns, state = layoutBodyRow(rowCells, rowIndex, state)
+        if rowIndex == 0:
+            pending = [deque() for _ in columns]
+        for (cell, rowspan), colIndex in zip(rowCells, columns):
+            count = rowspan if rowspan != None else 1
+            if colIndex != -1 and count > 0:
+                # Pending run of column : [cell, number of rows left]
+                pending[colIndex].append([LazyCell(cell), count])
+        # Release every row that all columns have reached
+        while pending and all(pending):
+            rowCells = []
+            for runs in pending:
+                run = runs[0]
+                rowCells.append(run[0])
+                run[1] -= 1
+                if run[1] == 0:
+                    runs.popleft()
+            yield rowCells
+
+
+def tableKeys(table):
+    """
+    Returns dictionnary keys of a table as a list (see `Table.getDictKeys()`).
+    """
+    keys = table.getKeysTuple()
+    if keys == None:
+        raise ValueError("Table has no header, keys can't be created !")
+    return list(keys)
+
+
+def iterRows(table, tableHeaderList, keys, where=None):
+    """
+    Streams body rows of a table as lists of cell texts (one per column), only rows accepted by `where` are extracted.
+
+    Params
+    ------
+    table : `Table`
+        Table object.
+
+    tableHeaderList : `list`
+        Table header (returned by `getTableHeader()`), to check number of columns.
+
+    keys : `list`
+        Dictionnary keys of table (see `tableKeys()`).
+
+    where : `callable`
+        Optional predicate, called with a `LazyRow` and returning True to keep row.
+    """
+    keyIndex = {key: index for index, key in enumerate(keys)}
+    for rowCells in iterBodyRows(table):
+        if len(rowCells) != len(tableHeaderList):
+            raise AssertionError(
+                "Table header & body don't have the same number of columns !"
+            )
+        if where != None and not where(LazyRow(table, keyIndex, rowCells)):
+            continue
+        yield [cell.getText(table) for cell in rowCells]
+
+
+def iterRecords(table, where=None):
+    """
+    Streams records of a table (see `Table.iterTableRecords()`), only table header is resolved up front.
+    """
+    tableHeaderList = table.getTableHeader()
+    keys = tableKeys(table)
+    Record = recordType(keys)
+    for row in iterRows(table, tableHeaderList, keys, where):
+        # Extra columns are dropped, like in `getTableDict()` (duplicated keys)
+        yield Record._make(row[: len(keys)])
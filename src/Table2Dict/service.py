@@ -0,0 +1,493 @@
+"""
+Module to run a long-lived local conversion service (see `python -m Table2Dict serve`). Interpreter start, bs4 import & logging
+set up are paid once : requests are dispatched to a pool of warm worker processes that stay alive between conversions.
+
+Service speaks HTTP/1.1 on localhost or on a Unix socket, connections are kept alive so many requests can be sent on one
+connection. Endpoints :
+
+| Endpoint        | Body                                      | Response                                                        |
+|-----------------|-------------------------------------------|-----------------------------------------------------------------|
+| `POST /convert` | One request (JSON object)                 | Result (JSON, or raw bytes for "binary" output)                 |
+| `POST /convert` | List of requests (JSON array)             | List of `{"result": ...}` or `{"error": ...}` (same order)      |
+| `GET /stats`    |                                           | Latency & throughput counters (see `ServiceStats.snapshot()`)   |
+
+A request is an object with either `html` (page or table html) or `path` (html file readable by service, only accepted when
+service is bound to a loopback address or a Unix socket), an `output`
+("dict" (default), "list", "json" or "binary") and optional `dictType` / `indent` (see `Table.getTableDict()` &
+`Table.getTableJson()`). Requests of a list are pipelined : they are all handed to the pool at once and converted concurrently,
+binary results of a list are base64 encoded.
+
+If a worker process dies (crash, OOM kill), pool is rebuilt & warmed again on next request : only conversions in flight at that
+time fail.
+"""
+
+from .utils.customLogging import moduleLogging
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from collections import deque
+import http.client
+import socketserver
+import threading
+import socket
+import ipaddress
+import base64
+import json
+import time
+import os
+
+# Set up logging for module
+logger = moduleLogging()
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+OUTPUTS = ("dict", "list", "json", "binary")
+# Number of recent conversions kept to compute latency percentiles
+LATENCY_WINDOW = 10000
+
+
+# ===================================== #
+# ============== WORKERS ============== #
+# ===================================== #
+def warmWorker():
+    """
+    Initializer of worker processes, imports everything a conversion needs once.
+    """
+    import bs4
+    from . import Table2Dict, binaryFormat
+
+    logger.debug("Worker %d ready", os.getpid())
+
+
+def convertRequest(request, parser="html.parser"):
+    """
+    Converts one request in a worker process.
+
+    Params
+    ------
+    request : `dict`
+        Service request (see module documentation).
+
+    parser : `str`
+        BS4 parser used to parse html.
+
+    Returns
+    -------
+    `tuple`
+        Content type & encoded result.
+    """
+    from .Table2Dict import Table
+
+    if not isinstance(request, dict):
+        raise ValueError("Request should be a JSON object !")
+    output = request.get("output", "dict")
+    if output not in OUTPUTS:
+        raise ValueError(
+            f"'{output}' is not a valid output ! It should be one of {', '.join(OUTPUTS)}."
+        )
+    if "html" in request:
+        import bs4
+
+        table = bs4.BeautifulSoup(request["html"], parser).find("table")
+        if table == None:
+            raise ValueError("No table found in html !")
+        tableObj = Table(table, parser=parser)
+    elif "path" in request:
+        tableObj = Table(request["path"], parser=parser)
+    else:
+        raise ValueError("Request should have either 'html' or 'path' !")
+    if output == "binary":
+        from .binaryFormat import dumps
+
+        return "application/octet-stream", dumps(tableObj)
+    if output == "json":
+        result = tableObj.getTableJson(request.get("indent"))
+    elif output == "list":
+        result = json.dumps(tableObj.getTableList(), ensure_ascii=False)
+    else:
+        result = json.dumps(
+            tableObj.getTableDict(request.get("dictType", "normal")), ensure_ascii=False
+        )
+    return "application/json", result.encode("utf-8")
+
+
+# ===================================== #
+# ============= STATISTICS ============ #
+# ===================================== #
+class ServiceStats:
+    """
+    Thread-safe counters of a running service.
+
+    Attributes
+    ----------
+        `conversions` / `errors` : `int`
+            Number of conversions done (failed ones included) and number of failed ones.
+
+        `inFlight` : `int`
+            Number of conversions currently handled by workers.
+
+        `latencies` : `deque`
+            Durations (seconds) of the most recent conversions.
+    """
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.conversions = 0
+        self.errors = 0
+        self.inFlight = 0
+        self.bytesIn = 0
+        self.bytesOut = 0
+        self.latencies = deque(maxlen=window)
+
+    def begin(self, size):
+        with self.lock:
+            self.inFlight += 1
+            self.bytesIn += size
+
+    def end(self, latency, size, failed=False):
+        with self.lock:
+            self.inFlight -= 1
+            self.conversions += 1
+            self.bytesOut += size
+            if failed:
+                self.errors += 1
+            self.latencies.append(latency)
+
+    def snapshot(self):
+        """
+        Returns a copy of counters.
+
+        Returns
+        -------
+        `dict`
+            - `uptime` : Seconds since service started
+            - `conversions` / `errors` / `inFlight` : See class attributes
+            - `bytesIn` / `bytesOut` : Size of requests & results
+            - `throughput` : Conversions per second since service started
+            - `latency` : Mean, p50, p95, p99 & max latency in milliseconds (over recent conversions)
+        """
+        with self.lock:
+            uptime = time.perf_counter() - self.started
+            latencies = sorted(self.latencies)
+            stats = {
+                "uptime": uptime,
+                "conversions": self.conversions,
+                "errors": self.errors,
+                "inFlight": self.inFlight,
+                "bytesIn": self.bytesIn,
+                "bytesOut": self.bytesOut,
+                "throughput": self.conversions / uptime if uptime else 0.0,
+            }
+        latency = dict.fromkeys(("mean", "p50", "p95", "p99", "max"), 0.0)
+        if latencies:
+            latency["mean"] = sum(latencies) / len(latencies) * 1000
+
+            def percentile(ratio):
+                return latencies[min(int(len(latencies) * ratio), len(latencies) - 1)] * 1000
+
+            latency.update(
+                p50=percentile(0.5),
+                p95=percentile(0.95),
+                p99=percentile(0.99),
+                max=latencies[-1] * 1000,
+            )
+        stats["latency"] = latency
+        return stats
+
+
+# ===================================== #
+# =============== SERVER ============== #
+# ===================================== #
+class RequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP handler of service (one thread per connection, connections are kept alive).
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        # Client address is empty on Unix sockets, log through package logger only
+        logger.debug(format, *args)
+
+    def sendBody(self, status, contentType, body):
+        self.send_response(status)
+        self.send_header("Content-Type", contentType)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def sendJson(self, status, value):
+        self.sendBody(status, "application/json", json.dumps(value).encode("utf-8"))
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self.sendJson(200, self.server.service.getStats())
+        else:
+            self.sendJson(404, {"error": f"Unknown endpoint '{self.path}'"})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path != "/convert":
+            self.sendJson(404, {"error": f"Unknown endpoint '{self.path}'"})
+            return
+        try:
+            request = json.loads(body)
+        except ValueError as error:
+            self.sendJson(400, {"error": f"Invalid JSON : {error}"})
+            return
+        service = self.server.service
+        if isinstance(request, list):
+            # Pipelined requests, all submitted before waiting for any of them
+            futures = [service.submit(item) for item in request]
+            results = []
+            for future in futures:
+                try:
+                    contentType, result = future.result()
+                except Exception as error:
+                    results.append({"error": f"{type(error).__name__}: {error}"})
+                    continue
+                if contentType == "application/json":
+                    results.append({"result": json.loads(result)})
+                else:
+                    results.append({"result": base64.b64encode(result).decode("ascii")})
+            self.sendJson(200, results)
+            return
+        if not isinstance(request, dict):
+            self.sendJson(400, {"error": "Request should be a JSON object or array !"})
+            return
+        try:
+            contentType, result = service.submit(request).result()
+        except Exception as error:
+            self.sendJson(422, {"error": f"{type(error).__name__}: {error}"})
+            return
+        self.sendBody(200, contentType, result)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Threaded HTTP server listening on a Unix socket.
+    """
+
+    daemon_threads = True
+
+
+class ConversionService:
+    """
+    Local conversion service, a HTTP server in front of a pool of warm worker processes.
+
+    Attributes
+    ----------
+        `address` : `tuple` or `str`
+            (host, port) the service listens on, or path of its Unix socket.
+
+        `workers` : `int`
+            Number of worker processes (defaults to number of CPUs).
+
+        `allowPaths` : `bool`
+            True if `path` requests are accepted (service bound to a loopback address or a Unix socket).
+
+        `stats` : `ServiceStats`
+            Counters of service.
+
+    Methods
+    -------
+        `start`
+            Serves requests in a background thread (returns once service is ready).
+
+        `serveForever`
+            Serves requests in calling thread until interrupted.
+
+        `close`
+            Stops server & worker processes (services are also context managers).
+    """
+
+    def __init__(
+        self,
+        host=DEFAULT_HOST,
+        port=DEFAULT_PORT,
+        socketPath=None,
+        workers=None,
+        parser="html.parser",
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.parser = parser
+        self.stats = ServiceStats()
+        self.thread = None
+        if socketPath != None:
+            if os.path.exists(socketPath):
+                os.unlink(socketPath)
+            self.server = UnixHTTPServer(socketPath, RequestHandler)
+        else:
+            self.server = ThreadingHTTPServer((host, port), RequestHandler)
+        self.server.service = self
+        self.address = self.server.server_address
+        # Files readable by service must not be exposed to other machines
+        self.allowPaths = isinstance(self.address, str) or ipaddress.ip_address(
+            self.address[0]
+        ).is_loopback
+        self.poolLock = threading.Lock()
+        self.pool = None
+        self.startPool()
+        logger.info("Service listening on %s with %d workers", self.address, self.workers)
+
+    def startPool(self):
+        pool = ProcessPoolExecutor(self.workers, initializer=warmWorker)
+        # Start every worker now, first requests don't pay for it
+        for future in [pool.submit(os.getpid) for _ in range(self.workers)]:
+            future.result()
+        self.pool = pool
+
+    def submitToPool(self, request):
+        pool = self.pool
+        try:
+            return pool.submit(convertRequest, request, self.parser)
+        except BrokenProcessPool:
+            # A worker died, pool can't take any more work until it's rebuilt
+            with self.poolLock:
+                if self.pool is pool:
+                    logger.warning("A worker process died, restarting worker pool")
+                    pool.shutdown(wait=False)
+                    self.startPool()
+            return self.pool.submit(convertRequest, request, self.parser)
+
+    def submit(self, request):
+        """
+        Hands a request to worker pool, returns a future of (content type, result).
+        """
+        size = len(request.get("html", "")) if isinstance(request, dict) else 0
+        self.stats.begin(size)
+        started = time.perf_counter()
+        if isinstance(request, dict) and "path" in request and not self.allowPaths:
+            future = Future()
+            future.set_exception(
+                PermissionError(
+                    "'path' requests are only allowed when service is bound to "
+                    "localhost or a Unix socket !"
+                )
+            )
+        else:
+            future = self.submitToPool(request)
+
+        def done(future):
+            failed = future.exception() != None
+            resultSize = 0 if failed else len(future.result()[1])
+            self.stats.end(time.perf_counter() - started, resultSize, failed)
+
+        future.add_done_callback(done)
+        return future
+
+    def getStats(self):
+        stats = self.stats.snapshot()
+        stats["workers"] = self.workers
+        return stats
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def serveForever(self):
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        if self.thread != None:
+            self.server.shutdown()
+            self.thread.join()
+            self.thread = None
+        self.server.server_close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+        self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ===================================== #
+# =============== CLIENT ============== #
+# ===================================== #
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socketPath, timeout=None):
+        super().__init__("localhost", timeout=timeout)
+        self.socketPath = socketPath
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socketPath)
+
+
+class ServiceClient:
+    """
+    Client of a conversion service, keeps one connection alive for all requests.
+
+    Methods
+    -------
+        `convert` : html=None, path=None, output="dict", **options
+            Converts one table, returns result (`bytes` for "binary" output).
+
+        `convertMany` : requests
+            Converts many tables in one pipelined call, returns results (or `ValueError` of failed ones) in same order.
+
+        `stats`
+            Returns counters of service.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, socketPath=None, timeout=60):
+        if socketPath != None:
+            self.connection = UnixHTTPConnection(socketPath, timeout)
+        else:
+            self.connection = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def call(self, method, path, value=None):
+        body = json.dumps(value).encode("utf-8") if value != None else None
+        headers = {"Content-Type": "application/json"} if body != None else {}
+        self.connection.request(method, path, body, headers)
+        response = self.connection.getresponse()
+        data = response.read()
+        if response.status != 200:
+            raise ValueError(json.loads(data)["error"])
+        if response.getheader("Content-Type") == "application/json":
+            return json.loads(data)
+        return data
+
+    def convert(self, html=None, path=None, output="dict", **options):
+        request = dict(options, output=output)
+        if html != None:
+            request["html"] = html
+        if path != None:
+            request["path"] = path
+        return self.call("POST", "/convert", request)
+
+    def convertMany(self, requests):
+        requests = list(requests)
+        results = []
+        for request, item in zip(requests, self.call("POST", "/convert", requests)):
+            if "error" in item:
+                results.append(ValueError(item["error"]))
+            elif request.get("output") == "binary":
+                results.append(base64.b64decode(item["result"]))
+            else:
+                results.append(item["result"])
+        return results
+
+    def stats(self):
+        return self.call("GET", "/stats")
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
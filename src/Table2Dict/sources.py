@@ -0,0 +1,303 @@
+"""
+Module to read tables straight out of compressed files & archives of saved pages, without decompressing them to temporary files.
+Decompression runs in a background thread and hands pages to parsing through a bounded queue : while one page is parsed, the next
+ones are decompressed (zlib, bz2, lzma & zstd release the GIL while decompressing), and the queue bound keeps memory flat when
+parsing is slower.
+
+| Extension                                        | Content                                        |
+|--------------------------------------------------|------------------------------------------------|
+| `.gz` / `.bz2` / `.xz` / `.zst`                  | One compressed page                            |
+| `.tar`, `.tar.gz` / `.tgz`, `.tar.bz2`, `.tar.xz`| Every regular file of archive is a page        |
+| `.tar.zst` / `.tzst`                             | Same, zstd compressed                          |
+| Anything else                                    | Plain html page                                |
+
+Archives are read as streams (members one after another, in archive order). Zstandard needs `zstandard` package (or Python 3.14
+`compression.zstd`). Throughput of both stages is measured (see `StageStats`).
+"""
+
+from .utils.customLogging import moduleLogging
+from .Table2Dict import Table
+import threading
+import tarfile
+import queue
+import time
+import gzip
+import lzma
+import bz2
+import os
+
+# Set up logging for module
+logger = moduleLogging()
+
+TAR_EXTENSIONS = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+TAR_ZSTD_EXTENSIONS = (".tar.zst", ".tzst")
+OPENERS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+# Queue item marking end of pages
+END = object()
+
+
+class StageStats:
+    """
+    Throughput counters of a stage (thread-safe).
+
+    Attributes
+    ----------
+        `name` : `str`
+            Name of stage.
+
+        `items` / `bytes` : `int`
+            Number of items & bytes handled by stage.
+
+        `seconds` : `float`
+            Time spent working (waiting on queues excluded).
+
+        `waited` : `float`
+            Time spent waiting on queues (for input or for room in output).
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.waited = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, seconds, size=0, items=1):
+        with self.lock:
+            self.items += items
+            self.bytes += size
+            self.seconds += seconds
+
+    def recordWait(self, seconds):
+        with self.lock:
+            self.waited += seconds
+
+    def snapshot(self):
+        """
+        Returns counters with throughput (`itemsPerSecond` & `bytesPerSecond`, over working time).
+        """
+        with self.lock:
+            return {
+                "items": self.items,
+                "bytes": self.bytes,
+                "seconds": self.seconds,
+                "waited": self.waited,
+                "itemsPerSecond": self.items / self.seconds if self.seconds else 0.0,
+                "bytesPerSecond": self.bytes / self.seconds if self.seconds else 0.0,
+            }
+
+
+def openZstd(path):
+    """
+    Opens a zstd compressed file as a binary stream.
+    """
+    try:
+        from compression import zstd
+
+        return zstd.open(path, "rb")
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError as error:
+        raise ImportError(
+            "Reading .zst files requires zstandard (pip install zstandard) !"
+        ) from error
+    return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+
+
+def iterPages(path):
+    """
+    Reads pages of a file or archive one by one (decompressed in calling thread).
+
+    Params
+    ------
+    path : `str`
+        Path of page, compressed page or archive (see module documentation).
+
+    Returns
+    -------
+    `generator`
+        (name, bytes) of each page, name is archive path + member name for archives.
+    """
+    lowerPath = str(path).lower()
+    if lowerPath.endswith(TAR_EXTENSIONS + TAR_ZSTD_EXTENSIONS):
+        if lowerPath.endswith(TAR_ZSTD_EXTENSIONS):
+            stream = openZstd(path)
+            archive = tarfile.open(fileobj=stream, mode="r|")
+        else:
+            stream = None
+            # Stream mode, compression is detected
+            archive = tarfile.open(path, mode="r|*")
+        try:
+            for member in archive:
+                if member.isfile():
+                    yield f"{path}/{member.name}", archive.extractfile(member).read()
+        finally:
+            archive.close()
+            if stream != None:
+                stream.close()
+        return
+    extension = os.path.splitext(lowerPath)[1]
+    if extension == ".zst":
+        opener = openZstd
+    else:
+        opener = OPENERS.get(extension, lambda path: open(path, "rb"))
+    with opener(path) as file:
+        yield str(path), file.read()
+
+
+class ArchiveSource:
+    """
+    Iterates over tables of many files & archives, decompression (in a background thread) overlapping with parsing (in iterating
+    thread).
+
+    Attributes
+    ----------
+        `paths` : `list`
+            Paths of pages, compressed pages or archives.
+
+        `stats` : `dict`
+            `StageStats` of "decompress" & "parse" stages.
+
+        `skipped` : `list`
+            Names of pages without any table.
+
+    Methods
+    -------
+        `getStats`
+            Returns counters & throughput of each stage.
+
+        `close`
+            Stops decompression thread (when iteration is stopped early, sources are also context managers).
+
+    > Note : Like `Table(path)`, first table of each page is read. Iterating yields (name, `Table`), every iteration reads pages
+    again from start.
+    """
+
+    def __init__(self, paths, parser="html.parser", queueSize=8, **tableOptions):
+        self.paths = [paths] if isinstance(paths, (str, os.PathLike)) else list(paths)
+        self.parser = parser
+        self.tableOptions = tableOptions
+        self.pages = queue.Queue(maxsize=queueSize)
+        self.stopped = threading.Event()
+        self.thread = None
+        self.skipped = []
+        self.stats = {"decompress": StageStats("decompress"), "parse": StageStats("parse")}
+
+    def put(self, item):
+        # Bounded put that gives up when source is closed
+        started = time.perf_counter()
+        while not self.stopped.is_set():
+            try:
+                self.pages.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        self.stats["decompress"].recordWait(time.perf_counter() - started)
+
+    def get(self):
+        # Waits for next page, gives up when source is closed (from another thread)
+        started = time.perf_counter()
+        item = END
+        while not self.stopped.is_set():
+            try:
+                item = self.pages.get(timeout=0.1)
+                break
+            except queue.Empty:
+                continue
+        self.stats["parse"].recordWait(time.perf_counter() - started)
+        return item
+
+    def decompress(self):
+        try:
+            for path in self.paths:
+                pages = iterPages(path)
+                while not self.stopped.is_set():
+                    started = time.perf_counter()
+                    page = next(pages, None)
+                    if page == None:
+                        break
+                    self.stats["decompress"].record(
+                        time.perf_counter() - started, len(page[1])
+                    )
+                    self.put(page)
+                pages.close()
+        except Exception as error:
+            # Raised in iterating thread
+            self.put(error)
+        self.put(END)
+
+    def __iter__(self):
+        import bs4
+
+        # Source can be iterated again once closed (pages are read again from start)
+        self.close()
+        self.pages = queue.Queue(maxsize=self.pages.maxsize)
+        self.stopped = threading.Event()
+        self.skipped = []
+        self.thread = threading.Thread(target=self.decompress, daemon=True)
+        self.thread.start()
+        try:
+            while True:
+                item = self.get()
+                if item is END:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                name, data = item
+                started = time.perf_counter()
+                table = bs4.BeautifulSoup(data, self.parser).find("table")
+                self.stats["parse"].record(time.perf_counter() - started, len(data))
+                if table == None:
+                    logger.warning("No table found in '%s', page skipped", name)
+                    self.skipped.append(name)
+                    continue
+                yield name, Table(table, parser=self.parser, **self.tableOptions)
+        finally:
+            self.close()
+
+    def getStats(self):
+        """
+        Returns counters of each stage (see `StageStats.snapshot()`).
+        """
+        return {name: stage.snapshot() for name, stage in self.stats.items()}
+
+    def close(self):
+        self.stopped.set()
+        if self.thread != None:
+            self.thread.join()
+            self.thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def archiveTables(paths, parser="html.parser", queueSize=8, **tableOptions):
+    """
+    Iterates over tables of files & archives (see `ArchiveSource`).
+
+    Params
+    ------
+    paths : `str` or `iterable`
+        Paths of pages, compressed pages or archives.
+
+    parser : `str`
+        BS4 parser used to parse pages.
+
+    queueSize : `int`
+        Number of decompressed pages waiting for parsing at most.
+
+    **tableOptions
+        Keyword arguments passed to `Table` (`maxRowspan`, `maxColspan`, `workers`).
+
+    Returns
+    -------
+    `generator`
+        (name, `Table`) of each page.
+    """
+    yield from ArchiveSource(paths, parser, queueSize, **tableOptions)
@@ -0,0 +1,227 @@
+"""
+Module with a sparse (run-length) representation of resolved tables. In table list representation (see `Table.getTableList()`), a cell
+with a rowspan is physically repeated in its column as many times as its rowspan. Here a column is stored as runs of `(value, count)`,
+so a span is stored once whatever its size and is only expanded when accessed.
+
+`SpanColumn` behaves like a (read mostly) list of strings and `SparseGrid` is a list of columns. Both can be expanded back to the usual
+nested list representation with `toList()`.
+"""
+
+from bisect import bisect_right
+
+
+class SpanColumn:
+    """
+    Run-length encoded column of a table. Runs are stored as two parallel lists : values and cumulative end offsets, so that
+    random access is a binary search over runs.
+
+    Attributes
+    ----------
+        `values` : `list`
+            Value of each run.
+
+        `ends` : `list`
+            Cumulative end offset of each run (exclusive), last one is column length.
+    """
+
+    __slots__ = ("values", "ends")
+
+    def __init__(self, iterable=()):
+        self.values = []
+        self.ends = []
+        for value in iterable:
+            self.append(value)
+
+    # ===================================== #
+    # ============ CONSTRUCTION =========== #
+    # ===================================== #
+    def appendRun(self, value, count):
+        """
+        Appends `value` `count` times at the end of column (stored once).
+        """
+        if count <= 0:
+            return
+        if self.values and self.values[-1] == value:
+            # Merge with last run
+            self.ends[-1] += count
+        else:
+            self.values.append(value)
+            self.ends.append(len(self) + count)
+
+    def append(self, value):
+        self.appendRun(value, 1)
+
+    def insertRun(self, index, value, count):
+        """
+        Inserts `value` `count` times at `index` (same semantics as `list.insert()` for an index past the end : value is appended).
+        """
+        if count <= 0:
+            return
+        length = len(self)
+        if index < 0:
+            index = max(length + index, 0)
+        if index >= length:
+            self.appendRun(value, count)
+            return
+        runIndex = bisect_right(self.ends, index)
+        runStart = self.ends[runIndex - 1] if runIndex > 0 else 0
+        if self.values[runIndex] == value:
+            # Inserting in a run of same value simply makes it longer
+            pass
+        elif index == runStart:
+            self.values.insert(runIndex, value)
+            self.ends.insert(runIndex, runStart)
+        else:
+            # Split run in two and put new run in the middle
+            self.values[runIndex:runIndex] = [self.values[runIndex], value]
+            self.ends[runIndex:runIndex] = [index, index]
+            runIndex += 1
+        for i in range(runIndex, len(self.ends)):
+            self.ends[i] += count
+
+    def insert(self, index, value):
+        self.insertRun(index, value, 1)
+
+    def extendRuns(self, other):
+        """
+        Appends all runs of another `SpanColumn` (or all values of an iterable) at the end of column.
+        """
+        for value, count in SpanColumn.asRuns(other):
+            self.appendRun(value, count)
+
+    # ===================================== #
+    # ============== ACCESS =============== #
+    # ===================================== #
+    @staticmethod
+    def asRuns(column):
+        """
+        Returns runs of a `SpanColumn` or of any iterable (one run per element).
+        """
+        if isinstance(column, SpanColumn):
+            return column.runs()
+        return ((value, 1) for value in column)
+
+    def runs(self):
+        """
+        Iterates over runs of column as `(value, count)` tuples.
+        """
+        start = 0
+        for value, end in zip(self.values, self.ends):
+            yield value, end - start
+            start = end
+
+    def __len__(self):
+        return self.ends[-1] if self.ends else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("SpanColumn index out of range")
+        return self.values[bisect_right(self.ends, index)]
+
+    def __iter__(self):
+        for value, count in self.runs():
+            for _ in range(count):
+                yield value
+
+    def __eq__(self, other):
+        if isinstance(other, SpanColumn):
+            return self.values == other.values and self.ends == other.ends
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        runs = ", ".join(f"{value!r}×{count}" for value, count in self.runs())
+        return f"SpanColumn([{runs}])"
+
+    def toList(self):
+        """
+        Expands column to a list (spans are repeated).
+        """
+        expanded = []
+        for value, count in self.runs():
+            expanded.extend([value] * count)
+        return expanded
+
+
+class SparseGrid:
+    """
+    Table (or part of table) stored as a list of `SpanColumn`. It's the sparse counterpart of the nested list returned by
+    `Table.getTableHeader()`, `Table.getTableBody()` and `Table.getTableList()`.
+
+    Attributes
+    ----------
+        `columns` : `list`
+            List of `SpanColumn`.
+    """
+
+    __slots__ = ("columns",)
+
+    def __init__(self, columns=()):
+        self.columns = [
+            column if isinstance(column, SpanColumn) else SpanColumn(column)
+            for column in columns
+        ]
+
+    def __len__(self):
+        return len(self.columns)
+
+    def __getitem__(self, index):
+        return self.columns[index]
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __eq__(self, other):
+        if isinstance(other, SparseGrid):
+            return self.columns == other.columns
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self.columns, other)
+            )
+        return NotImplemented
+
+    def __repr__(self):
+        return f"SparseGrid({self.columns!r})"
+
+    def cell(self, rowIndex, colIndex):
+        """
+        Returns value of cell at given row & column index (spans are taken into account).
+        """
+        return self.columns[colIndex][rowIndex]
+
+    def totalCells(self):
+        """
+        Returns number of cells once spans are expanded.
+        """
+        return sum(len(column) for column in self.columns)
+
+    def totalRuns(self):
+        """
+        Returns number of runs actually stored.
+        """
+        return sum(len(column.values) for column in self.columns)
+
+    def concat(self, other):
+        """
+        Returns a new grid where each column of `other` is appended to the matching column of this grid (like `Table.getTableList()`
+        does with table header & body).
+        """
+        result = SparseGrid()
+        for column, otherColumn in zip(self.columns, other):
+            newColumn = SpanColumn()
+            newColumn.extendRuns(column)
+            newColumn.extendRuns(otherColumn)
+            result.columns.append(newColumn)
+        return result
+
+    def toList(self):
+        """
+        Expands grid to the usual nested list representation (list of columns).
+        """
+        return [column.toList() for column in self.columns]
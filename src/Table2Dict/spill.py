@@ -0,0 +1,289 @@
+"""
+Module to keep conversion of oversized tables within a memory budget (see `memoryBudget` argument of `Table`). A few tables resolve
+to tens of millions of cells once rowspans are expanded, which is more than a worker can hold. Before resolving table body, its
+size is estimated from html cells & spans (no text extraction). If it's over budget, body is resolved row by row (see
+`incremental.layoutBodyRow()`) and columns are written as run-length chunks (like `SpanColumn`) to an anonymous temporary file :
+only one chunk per column is in memory, whatever the size of table.
+
+Spilled columns (`SpilledColumn`) are read-only sequences that read chunks back when accessed, they are returned by the usual
+accessors (`getTableBody()`, `getTableList()`, `getTableDict()` for 1D tables, `getTableResult()`, lookups & writers), which keeps
+memory low as long as columns are iterated or indexed instead of copied to lists.
+
+Budget can also be set with the `TABLE2DICT_MEMORY_BUDGET` environment variable (bytes, or with a K/M/G suffix). Memory used by
+conversions (RSS) is reported by `Table.getMemoryStats()`.
+"""
+
+from .utils.customLogging import moduleLogging
+from .incremental import scanBodyRow, layoutBodyRow
+from bisect import bisect_right
+from itertools import islice
+import threading
+import tempfile
+import marshal
+import sys
+import os
+
+# Set up logging for module
+logger = moduleLogging()
+
+MEMORY_BUDGET_ENV = "TABLE2DICT_MEMORY_BUDGET"
+# Estimated memory of a resolved cell : one slot in cached columns & in returned lists, plus its share of text (for html cells)
+SLOT_BYTES = 16
+CELL_TEXT_BYTES = 64
+# Number of runs per chunk of a spilled column
+CHUNK_RUNS = 4096
+SIZE_SUFFIXES = {"K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def parseSize(size):
+    """
+    Turns a size like "512M" or "2G" into bytes (None stays None).
+    """
+    if size == None or size == "":
+        return None
+    if isinstance(size, int):
+        return size
+    size = size.strip().upper().rstrip("B")
+    if size[-1:] in SIZE_SUFFIXES:
+        return int(float(size[:-1]) * SIZE_SUFFIXES[size[-1]])
+    return int(size)
+
+
+DEFAULT_MEMORY_BUDGET = parseSize(os.environ.get(MEMORY_BUDGET_ENV))
+
+
+# ===================================== #
+# ============ MEASUREMENTS =========== #
+# ===================================== #
+def currentRss():
+    """
+    Returns resident memory of process in bytes (peak RSS where current RSS can't be read).
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return peakRss()
+
+
+def peakRss():
+    """
+    Returns peak resident memory of process in bytes (0 if unknown).
+    """
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def estimateBodyBytes(table):
+    """
+    Estimates memory of resolved table body from html cells & their rowspans (cell text isn't extracted).
+    """
+    headerRowLength = table.getTableType()["total_header_rows"]
+    cells = 0
+    slots = 0
+    for row in islice(table.allRows, headerRowLength, None):
+        for cell in table.removeNewLines(row.contents):
+            rowspan, colspan = table.getSpans(cell, table.maxRowspan, table.maxColspan)
+            cells += 1
+            slots += rowspan if rowspan != None and rowspan > 0 else 1
+    return slots * SLOT_BYTES + cells * CELL_TEXT_BYTES
+
+
+# ===================================== #
+# ============== STORAGE ============== #
+# ===================================== #
+class SpillFile:
+    """
+    Anonymous temporary file holding chunks of spilled columns (deleted when closed or garbage collected).
+    """
+
+    def __init__(self, directory=None):
+        self.file = tempfile.TemporaryFile(dir=directory)
+        self.lock = threading.Lock()
+        self.size = 0
+        self.chunks = 0
+
+    def write(self, values, counts):
+        data = marshal.dumps((values, counts))
+        with self.lock:
+            offset = self.size
+            self.file.seek(offset)
+            self.file.write(data)
+            self.size += len(data)
+            self.chunks += 1
+        return offset, len(data)
+
+    def read(self, offset, size):
+        with self.lock:
+            self.file.seek(offset)
+            data = self.file.read(size)
+        return marshal.loads(data)
+
+    def close(self):
+        self.file.close()
+
+
+class SpilledColumn:
+    """
+    Read-only column whose runs are stored in chunks of a `SpillFile`, it behaves like a list of strings (length, indexing,
+    slicing, iteration & comparison). Last read chunk is cached.
+
+    Attributes
+    ----------
+        `head` : `tuple`
+            Values before spilled runs (header cells in `Table.getTableList()`).
+
+        `chunks` : `list`
+            (offset, size) of each chunk in spill file.
+
+        `chunkEnds` : `list`
+            Cumulative end row of each chunk (exclusive).
+    """
+
+    __slots__ = ("spillFile", "head", "chunks", "chunkEnds", "cached")
+
+    def __init__(self, spillFile, chunks=(), chunkEnds=(), head=()):
+        self.spillFile = spillFile
+        self.head = tuple(head)
+        self.chunks = list(chunks)
+        self.chunkEnds = list(chunkEnds)
+        # (chunk index, values, cumulative ends)
+        self.cached = None
+
+    def appendChunk(self, values, counts):
+        self.chunks.append(self.spillFile.write(values, counts))
+        start = self.chunkEnds[-1] if self.chunkEnds else 0
+        self.chunkEnds.append(start + sum(counts))
+
+    def loadChunk(self, chunkIndex):
+        cached = self.cached
+        if cached != None and cached[0] == chunkIndex:
+            return cached
+        values, counts = self.spillFile.read(*self.chunks[chunkIndex])
+        ends = []
+        end = self.chunkEnds[chunkIndex - 1] if chunkIndex else 0
+        for count in counts:
+            end += count
+            ends.append(end)
+        cached = self.cached = (chunkIndex, values, ends)
+        return cached
+
+    def runs(self):
+        """
+        Iterates over runs of column as `(value, count)` tuples (head values are runs of 1).
+        """
+        for value in self.head:
+            yield value, 1
+        for offset, size in self.chunks:
+            values, counts = self.spillFile.read(offset, size)
+            yield from zip(values, counts)
+
+    def __len__(self):
+        return len(self.head) + (self.chunkEnds[-1] if self.chunkEnds else 0)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("SpilledColumn index out of range")
+        if index < len(self.head):
+            return self.head[index]
+        index -= len(self.head)
+        chunkIndex, values, ends = self.loadChunk(bisect_right(self.chunkEnds, index))
+        return values[bisect_right(ends, index)]
+
+    def __iter__(self):
+        for value, count in self.runs():
+            for _ in range(count):
+                yield value
+
+    def __radd__(self, other):
+        # `header + body` in `Table.getTableList()`, header values go in front (nothing is expanded)
+        return SpilledColumn(
+            self.spillFile, self.chunks, self.chunkEnds, tuple(other) + self.head
+        )
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, SpilledColumn)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"SpilledColumn(length={len(self)}, chunks={len(self.chunks)})"
+
+    def toList(self):
+        """
+        Expands column to a list (spans are repeated).
+        """
+        expanded = []
+        for value, count in self.runs():
+            expanded.extend([value] * count)
+        return expanded
+
+
+# ===================================== #
+# ============= RESOLUTION ============ #
+# ===================================== #
+def spillTableBody(table, directory=None):
+    """
+    Resolves table body row by row into spilled columns (same cells as `Table.getTableBody()`).
+
+    Params
+    ------
+    table : `Table`
+        Table object.
+
+    directory : `str`
+        Directory of spill file (default temporary directory).
+
+    Returns
+    -------
+    `tuple`
+        List of `SpilledColumn` & spill statistics (number of chunks, size of spill file & number of runs).
+    """
+    headerRowLength = table.getTableType()["total_header_rows"]
+    spillFile = SpillFile(directory)
+    columns = []
+    buffers = []
+    state = []
+    runs = 0
+
+    def flush(colIndex):
+        values, counts = buffers[colIndex]
+        if values:
+            columns[colIndex].appendChunk(values, counts)
+            buffers[colIndex] = ([], [])
+
+    for rowIndex, row in enumerate(islice(table.allRows, headerRowLength, None)):
+        rowCells = scanBodyRow(table, row)
+        rowColumns, state = layoutBodyRow(rowCells, rowIndex, state)
+        if rowIndex == 0:
+            columns = [SpilledColumn(spillFile) for _ in rowColumns]
+            buffers = [([], []) for _ in rowColumns]
+        for (text, rowspan), colIndex in zip(rowCells, rowColumns):
+            count = rowspan if rowspan != None else 1
+            if colIndex == -1 or count <= 0:
+                continue
+            values, counts = buffers[colIndex]
+            values.append(text)
+            counts.append(count)
+            runs += 1
+            if len(values) >= CHUNK_RUNS:
+                flush(colIndex)
+    for colIndex in range(len(columns)):
+        flush(colIndex)
+    stats = {
+        "chunks": spillFile.chunks,
+        "spillBytes": spillFile.size,
+        "runs": runs,
+    }
+    logger.info("Table body spilled to disk : %s", stats)
+    return columns, stats
@@ -0,0 +1,114 @@
+"""
+Module to look up columns, rows and cells of a resolved table without building its dictionnary (see `Table.column()`, `Table.row()`
+and `Table.cell()`). Index maps keys to positions once, then every lookup reads resolved body columns directly : columns are the
+column-major view and rows are row-major views on the same columns (nothing is transposed or copied).
+
+Lookups mirror `getTableDict()` :
+
+| Lookup                        | 1D table                           | 2D table                              |
+|-------------------------------|------------------------------------|---------------------------------------|
+| `column(colKey)`              | `getTableDict()[colKey]`           | Column of body (row titles included)  |
+| `row(rowKey)`                 | Row at index `rowKey`              | `getTableDict()[rowKey]`              |
+| `cell(rowKey, colKey)`        | `getTableDict()[colKey][rowKey]`   | `getTableDict()[rowKey][colKey]`      |
+
+Column keys can also be column indexes (`int`) and row keys row indexes (`int`), row titles are only keys of 2D tables.
+"""
+
+from collections.abc import Mapping
+
+
+class RowView(Mapping):
+    """
+    Read-only view of a table row (column key -> cell), cells are read from table columns when accessed.
+    """
+
+    __slots__ = ("columns", "columnIndex", "position")
+
+    def __init__(self, columns, columnIndex, position):
+        self.columns = columns
+        self.columnIndex = columnIndex
+        self.position = position
+
+    def __getitem__(self, key):
+        return self.columns[self.columnIndex[key]][self.position]
+
+    def __iter__(self):
+        return iter(self.columnIndex)
+
+    def __len__(self):
+        return len(self.columnIndex)
+
+    def __repr__(self):
+        return f"RowView({dict(self)!r})"
+
+
+class TableIndex:
+    """
+    Key -> position maps of a resolved table (built once by `Table.getTableIndex()`).
+
+    Attributes
+    ----------
+        `columns` : `tuple`
+            Body columns (tuples), shared with `Table.getTableResult()`.
+
+        `columnIndex` : `dict`
+            Column key -> column index (keys of `createDictKeys()`).
+
+        `rowIndex` : `dict`
+            Row title -> row index for 2D tables (first row if a title is repeated), empty for 1D tables.
+
+        `rowColumnIndex` : `dict`
+            Column keys of a row view (without row titles column for 2D tables, like `getTableDict()`).
+    """
+
+    __slots__ = ("columns", "dimensions", "columnIndex", "rowIndex", "rowColumnIndex")
+
+    def __init__(self, keys, columns, dimensions):
+        self.columns = columns
+        self.dimensions = dimensions
+        self.columnIndex = {key: index for index, key in enumerate(keys)}
+        self.rowIndex = {}
+        self.rowColumnIndex = self.columnIndex
+        if dimensions == "2D" and columns:
+            for index, title in enumerate(columns[0]):
+                self.rowIndex.setdefault(title, index)
+            self.rowColumnIndex = {key: index for key, index in self.columnIndex.items() if index != 0}
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def columnPosition(self, colKey):
+        if isinstance(colKey, int):
+            if not -len(self.columns) <= colKey < len(self.columns):
+                raise IndexError(f"Column index {colKey} out of range")
+            return colKey
+        try:
+            return self.columnIndex[colKey]
+        except KeyError:
+            raise KeyError(f"No column with key {colKey!r}") from None
+
+    def rowPosition(self, rowKey):
+        if isinstance(rowKey, int):
+            if not -len(self) <= rowKey < len(self):
+                raise IndexError(f"Row index {rowKey} out of range")
+            return rowKey % len(self)
+        try:
+            return self.rowIndex[rowKey]
+        except KeyError:
+            raise KeyError(f"No row with key {rowKey!r}") from None
+
+    def column(self, colKey):
+        return self.columns[self.columnPosition(colKey)]
+
+    def row(self, rowKey):
+        return RowView(self.columns, self.rowColumnIndex, self.rowPosition(rowKey))
+
+    def cell(self, rowKey, colKey):
+        return self.columns[self.columnPosition(colKey)][self.rowPosition(rowKey)]
+
+    def rows(self):
+        """
+        Iterates over row views of table.
+        """
+        for position in range(len(self)):
+            yield RowView(self.columns, self.rowColumnIndex, position)
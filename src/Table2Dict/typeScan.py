@@ -0,0 +1,385 @@
+"""
+Module to classify many tables at once with only what `Table.getTableType()` returns (dimensions, header rows, columns, `<th>` &
+`<td>` counts), e.g. to route millions of tables before converting some of them. Creating a `Table` parses the whole page into a
+bs4 tree and finds every row, while classification only reads the 9 first rows of first table.
+
+`classifyTables()` scans html with a single `html.parser` tokenizer (reset between pages, no tree is built) and counts cells of
+rows as they go by, reading of a page stops as soon as the 9 first rows are closed. Counts follow the tree bs4 builds with
+"html.parser" (direct children of rows, whitespace strings, implicit closing of tags), so results are the same as
+`Table(path).getTableType()`. Results are stored in one `array` per field (`TableTypes`), no object is created per table.
+
+| Dimensions code | Meaning                                                      |
+|-----------------|--------------------------------------------------------------|
+| `1` / `2`       | "1D" / "2D" table                                            |
+| `0`             | Unknown type (`getTableType()` raises a `TypeError`)         |
+| `-1`            | No table found in page                                       |
+"""
+
+from .utils.customLogging import moduleLogging
+from .wikitext import WikiTable
+from html.parser import HTMLParser
+from html import unescape
+from array import array
+import os
+
+# Set up logging for module
+logger = moduleLogging()
+
+# Rows read by `Table.getTableType()`
+TYPE_ROWS = 9
+# Characters read from a page at a time
+CHUNK_SIZE = 16384
+DIMENSIONS = {1: "1D", 2: "2D"}
+UNKNOWN = 0
+NO_TABLE = -1
+FIELDS = (
+    "dimensions",
+    "total_header_rows",
+    "total_columns",
+    "total_th_cells",
+    "total_td_cells",
+)
+# Same as bs4 (whitespace strings are collapsed to "\n" or " ")
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+# Tags closed as soon as they are opened (bs4 empty elements)
+VOID_TAGS = frozenset(
+    "area base br col embed hr img input keygen link menuitem meta param source track wbr basefont bgsound command frame "
+    "image isindex nextid spacer".split()
+)
+PRESERVE_WHITESPACE_TAGS = frozenset(("pre", "textarea"))
+
+
+class ScanDone(Exception):
+    """
+    Raised by `TypeScanner` once rows needed for classification are read (rest of page is skipped).
+    """
+
+
+class TableTypes:
+    """
+    Classification of many tables, one `array` per field (see `classifyTables()`).
+
+    Attributes
+    ----------
+        `sources` : `list`
+            Classified sources, in order.
+
+        `columns` : `dict`
+            Field -> `array` : "dimensions" (codes, see module documentation), "total_header_rows", "total_columns",
+            "total_th_cells" & "total_td_cells".
+
+    Methods
+    -------
+        `getTableType`
+            Returns classification of a table as `Table.getTableType()` does.
+
+        `indexesOf`
+            Returns indexes of tables of given dimensions.
+    """
+
+    def __init__(self, sources):
+        self.sources = sources
+        self.columns = {
+            field: array("b" if field == "dimensions" else "l") for field in FIELDS
+        }
+
+    def __len__(self):
+        return len(self.columns["dimensions"])
+
+    def getTableType(self, index):
+        """
+        Returns classification of table at `index` (same dictionnary as `Table.getTableType()`).
+
+        Raises
+        ------
+        `TypeError`
+            Table type is unknown or page has no table.
+        """
+        code = self.columns["dimensions"][index]
+        if code == NO_TABLE:
+            raise TypeError(f"No table found in '{self.sources[index]}' !")
+        if code == UNKNOWN:
+            raise TypeError("Table type is unknown !")
+        resultDict = {field: self.columns[field][index] for field in FIELDS}
+        resultDict["dimensions"] = DIMENSIONS[code]
+        return resultDict
+
+    def indexesOf(self, dimensions):
+        """
+        Returns indexes of tables of given dimensions ("1D", "2D", `UNKNOWN` or `NO_TABLE` code).
+        """
+        codes = {label: code for code, label in DIMENSIONS.items()}
+        code = codes.get(dimensions, dimensions)
+        return [
+            index
+            for index, value in enumerate(self.columns["dimensions"])
+            if value == code
+        ]
+
+    def append(self, code, headerRows=0, columns=0, thCells=0, tdCells=0):
+        values = (code, headerRows, columns, thCells, tdCells)
+        for field, value in zip(FIELDS, values):
+            self.columns[field].append(value)
+
+
+def classifyCounts(rowCounts, rowCount):
+    """
+    Classifies a table from (contents, `<th>`, `<td>`) counts of its first rows, like `Table.getTableType()`.
+
+    Returns
+    -------
+    `tuple`
+        Dimensions code, header rows, columns, `<th>` cells & `<td>` cells.
+    """
+    totalHeaderRows = 0
+    totalTitledRow = 0
+    totalThCells = 0
+    totalTdCells = 0
+    for rowIndex in range(min(rowCount, TYPE_ROWS)):
+        contentCount, thCells, tdCells = rowCounts[rowIndex]
+        totalThCells += thCells
+        totalTdCells += tdCells
+        if contentCount == thCells:
+            totalHeaderRows += 1
+        elif thCells == 1 and tdCells == (contentCount - 1):
+            totalTitledRow += 1
+    if totalHeaderRows > 0 and totalTitledRow == 0:
+        code = 1
+    elif totalHeaderRows > 0 and totalTitledRow > 0:
+        code = 2
+    elif totalThCells == 0 and totalTdCells > 0:
+        code = 1
+    else:
+        code = UNKNOWN
+    totalColumns = rowCounts[0][0] if rowCount else 0
+    return code, totalHeaderRows, totalColumns, totalThCells, totalTdCells
+
+
+class TypeScanner(HTMLParser):
+    """
+    Html tokenizer counting cells of first rows of first table of a page, without building any tree. It's reused for every page
+    (see `scanPage()`).
+
+    Attributes
+    ----------
+        `rowCounts` : `list`
+            [contents, `<th>`, `<td>`] counts of 9 first rows (reused between pages).
+
+        `rowCount` : `int`
+            Number of rows started in table.
+
+        `tableFound` : `bool`
+            True once first table is opened.
+    """
+
+    def __init__(self):
+        self.rowCounts = [[0, 0, 0] for _ in range(TYPE_ROWS)]
+        # bs4 gets character references unconverted too
+        super().__init__(convert_charrefs=False)
+
+    def reset(self):
+        super().reset()
+        # Names of open tags
+        self.stack = []
+        # Stack index of first table & (stack index, row index) of its open rows
+        self.tableDepth = None
+        self.openRows = []
+        self.rowCount = 0
+        self.tableFound = False
+        self.preserveWhitespace = 0
+        self.alreadyClosed = []
+        # Pieces of string being parsed, only kept when its parent is a counted row
+        self.text = None
+        for counts in self.rowCounts:
+            counts[0] = counts[1] = counts[2] = 0
+
+    def scanPage(self, pageFile):
+        """
+        Scans a page (text file or `str`) and returns (dimensions code, header rows, columns, `<th>` cells, `<td>` cells).
+        """
+        self.reset()
+        try:
+            if isinstance(pageFile, str):
+                self.feed(pageFile)
+            else:
+                while True:
+                    chunk = pageFile.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    self.feed(chunk)
+            self.close()
+            self.flushText()
+        except ScanDone:
+            pass
+        if not self.tableFound:
+            return NO_TABLE, 0, 0, 0, 0
+        return classifyCounts(self.rowCounts, self.rowCount)
+
+    # === Tree of rows === #
+    def rowParent(self):
+        # Counts of row whose direct child is added, None if it's not a counted row
+        if self.openRows and self.openRows[-1][0] == len(self.stack) - 1:
+            return self.rowCounts[self.openRows[-1][1]]
+        return None
+
+    def addString(self, string):
+        counts = self.rowParent()
+        if counts == None:
+            return
+        if not self.preserveWhitespace and all(char in ASCII_SPACES for char in string):
+            string = "\n" if "\n" in string else " "
+        # `Table.removeNewLines()` drops "\n" strings
+        if string != "\n":
+            counts[0] += 1
+
+    def flushText(self):
+        if self.text != None:
+            text = "".join(self.text)
+            self.text = None
+            self.addString(text)
+
+    def pushTag(self, tag):
+        counts = self.rowParent()
+        if counts != None:
+            counts[0] += 1
+            if tag == "th":
+                counts[1] += 1
+            elif tag == "td":
+                counts[2] += 1
+        if tag == "table" and not self.tableFound:
+            self.tableFound = True
+            self.tableDepth = len(self.stack)
+        elif tag == "tr" and self.tableDepth != None:
+            if self.rowCount < TYPE_ROWS:
+                self.openRows.append((len(self.stack), self.rowCount))
+            self.rowCount += 1
+            self.checkDone()
+        if tag in PRESERVE_WHITESPACE_TAGS:
+            self.preserveWhitespace += 1
+        self.stack.append(tag)
+
+    def popTag(self, tag):
+        # Pops up to and including most recent open tag of this name (nothing if there's none, like bs4)
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth] == tag:
+                break
+        else:
+            return
+        for name in self.stack[depth:]:
+            if name in PRESERVE_WHITESPACE_TAGS:
+                self.preserveWhitespace -= 1
+        del self.stack[depth:]
+        while self.openRows and self.openRows[-1][0] >= depth:
+            self.openRows.pop()
+        if self.tableDepth != None and self.tableDepth >= depth:
+            # End of first table
+            raise ScanDone()
+        self.checkDone()
+
+    def checkDone(self):
+        if self.rowCount >= TYPE_ROWS and not self.openRows:
+            raise ScanDone()
+
+    # === Tokenizer events (same as bs4 `BeautifulSoupHTMLParser`) === #
+    def handle_starttag(self, tag, attrs):
+        self.flushText()
+        self.pushTag(tag)
+        if tag in VOID_TAGS:
+            self.popTag(tag)
+            self.alreadyClosed.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.flushText()
+        self.pushTag(tag)
+        self.popTag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self.alreadyClosed:
+            # Closing tag of an empty element
+            self.alreadyClosed.remove(tag)
+            return
+        self.flushText()
+        self.popTag(tag)
+
+    def handle_data(self, data):
+        if self.text != None:
+            self.text.append(data)
+        elif self.rowParent() != None:
+            self.text = [data]
+
+    def handle_charref(self, name):
+        self.handle_data(unescape(f"&#{name};"))
+
+    def handle_entityref(self, name):
+        self.handle_data(unescape(f"&{name};"))
+
+    def handle_comment(self, data):
+        self.flushText()
+        self.addString(data)
+
+    def handle_decl(self, decl):
+        self.flushText()
+        self.addString(decl[len("DOCTYPE ") :])
+
+    def unknown_decl(self, data):
+        self.flushText()
+        if data.upper().startswith("CDATA["):
+            data = data[len("CDATA[") :]
+        self.addString(data)
+
+    def handle_pi(self, data):
+        self.flushText()
+        self.addString(data)
+
+
+def scanTable(table, rowCounts):
+    """
+    Classifies a bs4 table tag or a `WikiTable` from its 9 first rows (tree is already built, no page is scanned).
+    """
+    if isinstance(table, WikiTable):
+        rows = table.rows[:TYPE_ROWS]
+    else:
+        rows = table.find_all("tr", limit=TYPE_ROWS)
+    for rowIndex, row in enumerate(rows):
+        counts = rowCounts[rowIndex]
+        counts[0] = counts[1] = counts[2] = 0
+        for content in row.contents:
+            if content == "\n":
+                continue
+            counts[0] += 1
+            if content.name == "th":
+                counts[1] += 1
+            elif content.name == "td":
+                counts[2] += 1
+    return classifyCounts(rowCounts, len(rows))
+
+
+def classifyTables(sources):
+    """
+    Classifies many tables (see module documentation).
+
+    Params
+    ------
+    sources : `iterable`
+        Html file paths (first table of page, like `Table(path)`), html pages as `bytes`, bs4 table tags or `WikiTable`.
+
+    Returns
+    -------
+    `TableTypes`
+        Columnar classification of tables, in order of sources.
+    """
+    sources = list(sources)
+    result = TableTypes(sources)
+    scanner = TypeScanner()
+    for source in sources:
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "r") as htmlFile:
+                values = scanner.scanPage(htmlFile)
+        elif isinstance(source, (bytes, bytearray)):
+            values = scanner.scanPage(bytes(source).decode("utf-8", "replace"))
+        else:
+            values = scanTable(source, scanner.rowCounts)
+        if values[0] == NO_TABLE:
+            logger.warning("No table found in '%s'", source)
+        result.append(*values)
+    return result
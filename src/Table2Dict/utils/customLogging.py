@@ -1,21 +1,40 @@
 import logging
-import sys
 import os
 
 # ========================== #
 # ====== Logging init ====== #
 # ========================== #
 
-def moduleLogging():
-    # Get name of dir
-    dirname = os.path.dirname(__file__)
+# Set this environment variable to a file path to log everything (debug level) in this file
+LOG_FILE_ENV = "TABLE2DICT_LOG_FILE"
+
 
+def moduleLogging():
     # Init custom logger
     logger = logging.getLogger(__name__)
 
+    # Logger is shared by all modules of package, only set it up once
+    if logger.handlers:
+        return logger
+
+    # No output by default (importing package must not have any side effect)
+    logger.addHandler(logging.NullHandler())
+
+    # File logging is opt-in
+    logFile = os.environ.get(LOG_FILE_ENV)
+    if logFile:
+        enableFileLogging(logFile)
+
+    # Return logger instance
+    return logger
+
+
+def enableFileLogging(logFile, level=logging.DEBUG):
+    # Get package logger
+    logger = logging.getLogger(__name__)
+
     # Init & add handler
-    stream_handler = logging.StreamHandler(sys.stdout) # To console
-    file_handler = logging.FileHandler(f"{dirname}/../logs/ExtractTable.log", mode='w') # To file
+    file_handler = logging.FileHandler(logFile, mode='w') # To file
     logger.addHandler(file_handler)
 
     # Set format of log
@@ -23,7 +42,7 @@ def moduleLogging():
     file_handler.setFormatter(log_format)
 
     # Set min log levels I wanna see
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(level)
 
-    # Return logger instance
-    return logger
\ No newline at end of file
+    # Return handler (to remove it later if needed)
+    return file_handler
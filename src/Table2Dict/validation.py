@@ -0,0 +1,257 @@
+"""
+Module to check the structure of a table before converting it (see `Table.validate()`). Validation goes once through all cells and
+only looks at tags & span attributes (no text is extracted), it replays the layout rules of `Table.insertRows()` on column lengths.
+
+Diagnostics are either errors (conversion will fail) or warnings (conversion works but columns will probably be misaligned) :
+
+| Code               | Severity | Meaning                                                                     |
+|--------------------|----------|-----------------------------------------------------------------------------|
+| `unknownType`      | error    | Table type can't be determined (`getTableType()` raises)                    |
+| `noHeader`         | error    | Table has no header row, dictionnary keys can't be created                  |
+| `columnMismatch`   | error    | Header & body don't have the same number of columns                         |
+| `invalidSpan`      | error    | A rowspan or colspan isn't an integer (cell is checked as if it had no span) |
+| `spanOutOfTable`   | error    | A header colspan goes past last column                                      |
+| `overlappingSpan`  | warning  | A header colspan overlaps a cell already placed by a span                   |
+| `droppedCell`      | warning  | A cell found no free column in its row (row too wide), it's ignored         |
+| `shortRow`         | warning  | A row (spans included) doesn't fill all columns                             |
+| `spanOverflow`     | warning  | A rowspan goes past last row of header or body                              |
+| `ignoredColspan`   | warning  | A body cell has a colspan (not handled in table body)                       |
+"""
+
+from .incremental import layoutBodyRow
+from collections import namedtuple
+
+Diagnostic = namedtuple(
+    "Diagnostic", ["severity", "code", "rowIndex", "colIndex", "message"]
+)
+
+
+class ValidationReport:
+    """
+    Result of a table validation.
+
+    Attributes
+    ----------
+        `diagnostics` : `list`
+            List of `Diagnostic` named tuples (severity, code, rowIndex, colIndex, message). Row indexes are indexes in
+            whole table (header rows included).
+
+        `headerColumns` / `bodyColumns` : `int`
+            Number of columns of table header & body (None if unknown).
+    """
+
+    def __init__(self):
+        self.diagnostics = []
+        self.headerColumns = None
+        self.bodyColumns = None
+
+    def add(self, severity, code, rowIndex, colIndex, message):
+        self.diagnostics.append(Diagnostic(severity, code, rowIndex, colIndex, message))
+
+    @property
+    def errors(self):
+        return [diag for diag in self.diagnostics if diag.severity == "error"]
+
+    @property
+    def warnings(self):
+        return [diag for diag in self.diagnostics if diag.severity == "warning"]
+
+    @property
+    def isValid(self):
+        """
+        True if table can be converted (warnings are allowed).
+        """
+        return not self.errors
+
+    def __bool__(self):
+        return self.isValid
+
+    def __repr__(self):
+        return f"<ValidationReport {len(self.errors)} error(s), {len(self.warnings)} warning(s)>"
+
+
+class TableValidationError(ValueError):
+    """
+    Raised when a table is rejected by validation, report is available in `report` attribute.
+    """
+
+    def __init__(self, report):
+        self.report = report
+        super().__init__(
+            "Table is malformed : "
+            + " / ".join(diag.message for diag in report.errors)
+        )
+
+
+def cellSpans(table, report, cell, rowIndex):
+    """
+    Returns spans of a cell like `Table.getSpans()`, a span that isn't an integer is reported and ignored.
+    """
+    try:
+        return table.getSpans(cell, table.maxRowspan, table.maxColspan)
+    except ValueError:
+        spans = {
+            name: cell.get(name)
+            for name in ("rowspan", "colspan")
+            if cell.get(name) != None
+        }
+        message = f"Cell at row {rowIndex} has an invalid span {spans}"
+        # First row is checked as header & body row of tables without header, report it once
+        if not any(diag.message == message for diag in report.diagnostics):
+            report.add("error", "invalidSpan", rowIndex, None, message)
+        return None, None
+
+
+def validateHeader(table, report, headerRows):
+    """
+    Replays header layout on column lengths (see `Table.insertRows()` for header rows).
+    """
+    lengths = []
+    for rowIndex, row in enumerate(headerRows):
+        for cell in table.removeNewLines(row.contents):
+            rowspan, colspan = cellSpans(table, report, cell, rowIndex)
+            count = rowspan if rowspan != None else 1
+            if rowIndex == 0:
+                # First row creates columns (one per colspan)
+                lengths.extend([count] * (colspan if colspan != None else 1))
+                continue
+            for colIndex, length in enumerate(lengths):
+                if length <= rowIndex:
+                    lengths[colIndex] += count
+                    if colspan != None:
+                        target = colIndex + colspan - 1
+                        if target >= len(lengths):
+                            report.add(
+                                "error",
+                                "spanOutOfTable",
+                                rowIndex,
+                                colIndex,
+                                f"Header colspan {colspan} at row {rowIndex} goes past last column",
+                            )
+                        else:
+                            if lengths[target] > rowIndex:
+                                report.add(
+                                    "warning",
+                                    "overlappingSpan",
+                                    rowIndex,
+                                    target,
+                                    f"Header colspan at row {rowIndex} overlaps column {target}",
+                                )
+                            lengths[target] += count
+                    break
+            else:
+                report.add(
+                    "warning",
+                    "droppedCell",
+                    rowIndex,
+                    None,
+                    f"Header cell at row {rowIndex} found no free column",
+                )
+    for colIndex, length in enumerate(lengths):
+        if length < len(headerRows):
+            report.add(
+                "warning",
+                "shortRow",
+                length,
+                colIndex,
+                f"Header column {colIndex} has no cell at row {length}",
+            )
+        elif length > len(headerRows):
+            report.add(
+                "warning",
+                "spanOverflow",
+                None,
+                colIndex,
+                f"Header column {colIndex} goes {length - len(headerRows)} row(s) past header",
+            )
+    return len(lengths)
+
+
+def validateBody(table, report, bodyRows, headerRowLength):
+    """
+    Replays body layout on column lengths (see `Table.insertRows()` for body rows).
+    """
+    state = []
+    for rowIndex, row in enumerate(bodyRows):
+        tableRowIndex = rowIndex + headerRowLength
+        rowCells = []
+        for cell in table.removeNewLines(row.contents):
+            rowspan, colspan = cellSpans(table, report, cell, tableRowIndex)
+            if colspan != None and colspan > 1:
+                report.add(
+                    "warning",
+                    "ignoredColspan",
+                    tableRowIndex,
+                    None,
+                    f"Body cell at row {tableRowIndex} has a colspan of {colspan} (ignored)",
+                )
+            rowCells.append((None, rowspan))
+        previousState = state
+        columns, state = layoutBodyRow(rowCells, rowIndex, state)
+        for colIndex in columns:
+            if colIndex == -1:
+                report.add(
+                    "warning",
+                    "droppedCell",
+                    tableRowIndex,
+                    None,
+                    f"Body cell at row {tableRowIndex} found no free column",
+                )
+        for colIndex, remaining in enumerate(state):
+            # State is relative to next row, a column that doesn't reach it wasn't filled by this row (reported once,
+            # following rows of a column left behind are short too)
+            alreadyShort = colIndex < len(previousState) and previousState[colIndex] < 0
+            if remaining < 0 and not alreadyShort:
+                report.add(
+                    "warning",
+                    "shortRow",
+                    tableRowIndex,
+                    colIndex,
+                    f"Body row {tableRowIndex} has no cell in column {colIndex}",
+                )
+    for colIndex, remaining in enumerate(state):
+        if remaining > 0:
+            report.add(
+                "warning",
+                "spanOverflow",
+                None,
+                colIndex,
+                f"Body column {colIndex} goes {remaining} row(s) past last row",
+            )
+    return len(state)
+
+
+def validateTable(table):
+    """
+    Validates structure of a table (see `Table.validate()`).
+    """
+    report = ValidationReport()
+    try:
+        tableType = table.getTableType()
+    except TypeError as error:
+        report.add("error", "unknownType", None, None, str(error))
+        return report
+    headerRowLength = tableType["total_header_rows"]
+    if headerRowLength == 0:
+        report.add(
+            "error",
+            "noHeader",
+            None,
+            None,
+            "Table has no header row, dictionnary keys can't be created",
+        )
+    # Header is resolved from first row even for a table without header (same as `getTableHeader()`)
+    headerRows = table.allRows[: max(headerRowLength, 1)]
+    report.headerColumns = validateHeader(table, report, headerRows)
+    report.bodyColumns = validateBody(
+        table, report, table.allRows[headerRowLength:], headerRowLength
+    )
+    if report.headerColumns != report.bodyColumns:
+        report.add(
+            "error",
+            "columnMismatch",
+            None,
+            None,
+            f"Table header has {report.headerColumns} columns but table body has {report.bodyColumns} columns",
+        )
+    return report
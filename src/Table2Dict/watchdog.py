@@ -0,0 +1,284 @@
+"""
+Module to catch pathological tables while converting them (opt-in, see `configureWatchdog()`). Conversion methods of `Table` are
+timed, and when a conversion takes longer than `maxSeconds` or converts fewer than `minCellsPerSecond` cells per second, table is
+captured in a directory :
+
+| File             | Content                                                                                         |
+|------------------|-------------------------------------------------------------------------------------------------|
+| `<digest>.html`  | Table html, it can be converted again as is (`Table("<digest>.html")`) to reproduce slow case   |
+| `<digest>.json`  | Method, duration, cells, cells per second, stage timings & span statistics (see `spanStats()`)  |
+
+Digest is a hash of table html, so a table captured many times is stored once (slowest conversion is kept). Captured tables are
+ranked by cost with `captureReport()` or `python -m Table2Dict report <captureDir>`.
+
+Watchdog can also be turned on with environment variables : `TABLE2DICT_WATCHDOG_DIR` (capture directory),
+`TABLE2DICT_WATCHDOG_SECONDS` and `TABLE2DICT_WATCHDOG_CELLS_PER_SECOND`.
+"""
+
+from .utils.customLogging import moduleLogging
+from functools import wraps
+import threading
+import hashlib
+import time
+import os
+
+# Set up logging for module
+logger = moduleLogging()
+
+WATCHDOG_DIR_ENV = "TABLE2DICT_WATCHDOG_DIR"
+WATCHDOG_SECONDS_ENV = "TABLE2DICT_WATCHDOG_SECONDS"
+WATCHDOG_RATE_ENV = "TABLE2DICT_WATCHDOG_CELLS_PER_SECOND"
+DEFAULT_MAX_SECONDS = 1.0
+# Cells per second floor is only checked for conversions longer than this (tiny tables are dominated by fixed costs)
+MIN_RATE_SECONDS = 0.05
+
+
+class Watchdog:
+    """
+    Settings & per-thread state of watchdog.
+
+    Attributes
+    ----------
+        `captureDir` : `str`
+            Directory of captured tables, None when watchdog is off.
+
+        `maxSeconds` : `float`
+            Conversions longer than this are captured (None to disable).
+
+        `minCellsPerSecond` : `float`
+            Conversions slower than this are captured (None to disable).
+
+        `captured` : `int`
+            Number of captures written since watchdog was configured.
+    """
+
+    def __init__(self, captureDir=None, maxSeconds=DEFAULT_MAX_SECONDS, minCellsPerSecond=None):
+        self.captureDir = captureDir
+        self.maxSeconds = maxSeconds
+        self.minCellsPerSecond = minCellsPerSecond
+        self.captured = 0
+        self.lock = threading.Lock()
+        # Stage timings of conversion running in each thread
+        self.local = threading.local()
+
+
+def watchdogFromEnvironment():
+    seconds = os.environ.get(WATCHDOG_SECONDS_ENV)
+    rate = os.environ.get(WATCHDOG_RATE_ENV)
+    return Watchdog(
+        os.environ.get(WATCHDOG_DIR_ENV) or None,
+        float(seconds) if seconds else DEFAULT_MAX_SECONDS,
+        float(rate) if rate else None,
+    )
+
+
+# Process-wide watchdog
+watchdog = watchdogFromEnvironment()
+
+
+def configureWatchdog(captureDir, maxSeconds=DEFAULT_MAX_SECONDS, minCellsPerSecond=None):
+    """
+    Turns watchdog on (or off with `captureDir=None`).
+
+    Params
+    ------
+    captureDir : `str`
+        Directory where slow tables are captured (created if needed), None to turn watchdog off.
+
+    maxSeconds : `float`
+        Conversions taking longer are captured (None to disable).
+
+    minCellsPerSecond : `float`
+        Conversions converting fewer cells per second are captured (None to disable).
+    """
+    if captureDir != None:
+        os.makedirs(captureDir, exist_ok=True)
+    watchdog.maxSeconds = maxSeconds
+    watchdog.minCellsPerSecond = minCellsPerSecond
+    watchdog.captured = 0
+    watchdog.captureDir = captureDir
+
+
+def watched(method):
+    """
+    Decorator timing a `Table` method. Outermost watched call of a thread is the conversion, nested ones are its stages.
+    """
+    stage = method.__name__
+
+    @wraps(method)
+    def wrapper(table, *args, **kwargs):
+        if watchdog.captureDir == None:
+            return method(table, *args, **kwargs)
+        timings = getattr(watchdog.local, "timings", None)
+        outermost = timings == None
+        if outermost:
+            timings = watchdog.local.timings = {}
+        started = time.perf_counter()
+        try:
+            return method(table, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            timings[stage] = timings.get(stage, 0.0) + elapsed
+            if outermost:
+                try:
+                    # Watched calls made by the check itself aren't stages of conversion
+                    checkConversion(table, stage, elapsed, dict(timings))
+                finally:
+                    watchdog.local.timings = None
+
+    return wrapper
+
+
+def checkConversion(table, method, elapsed, timings):
+    """
+    Captures table if its conversion was too slow (see module documentation).
+    """
+    try:
+        tableType = table.getTableType()
+    except Exception:
+        # Table can't even be typed, capture on time only
+        tableType = {"total_columns": 0}
+    cells = len(table.allRows) * max(tableType["total_columns"], 1)
+    rate = cells / elapsed if elapsed else float("inf")
+    tooLong = watchdog.maxSeconds != None and elapsed > watchdog.maxSeconds
+    tooSlow = (
+        watchdog.minCellsPerSecond != None
+        and elapsed > MIN_RATE_SECONDS
+        and rate < watchdog.minCellsPerSecond
+    )
+    if not (tooLong or tooSlow):
+        return
+    try:
+        captureTable(table, method, elapsed, cells, rate, timings)
+    except Exception as error:
+        # Watchdog never breaks a conversion
+        logger.warning("Capture of slow table failed : %r", error)
+
+
+def spanStats(table):
+    """
+    Returns span statistics of a table.
+
+    Returns
+    -------
+    `dict`
+        - `rows` / `cells` : Number of rows & html cells
+        - `rowspans` / `colspans` : Number of cells with a rowspan / colspan
+        - `maxRowspan` / `maxColspan` : Biggest spans (after caps of table)
+        - `spannedCells` : Number of grid cells once spans are expanded
+        - `expansion` : Spanned cells / html cells
+    """
+    stats = dict.fromkeys(
+        ("cells", "rowspans", "colspans", "maxRowspan", "maxColspan", "spannedCells"), 0
+    )
+    stats["rows"] = len(table.allRows)
+    for row in table.allRows:
+        for cell in table.removeNewLines(row.contents):
+            rowspan, colspan = table.getSpans(cell, table.maxRowspan, table.maxColspan)
+            rowspan = rowspan if rowspan != None else 1
+            colspan = colspan if colspan != None else 1
+            stats["cells"] += 1
+            stats["rowspans"] += rowspan > 1
+            stats["colspans"] += colspan > 1
+            stats["maxRowspan"] = max(stats["maxRowspan"], rowspan)
+            stats["maxColspan"] = max(stats["maxColspan"], colspan)
+            stats["spannedCells"] += rowspan * colspan
+    stats["expansion"] = stats["spannedCells"] / stats["cells"] if stats["cells"] else 0.0
+    return stats
+
+
+def captureTable(table, method, elapsed, cells, rate, timings):
+    """
+    Writes table html & conversion infos in capture directory, slowest conversion of a table is kept.
+    """
+    # Imported here, watchdog is imported with `Table` but captures are rare
+    import json
+
+    html = str(table.table)
+    digest = hashlib.blake2b(html.encode("utf-8"), digest_size=12).hexdigest()
+    basePath = os.path.join(watchdog.captureDir, digest)
+    with watchdog.lock:
+        try:
+            with open(f"{basePath}.json", encoding="utf-8") as infoFile:
+                if json.load(infoFile)["elapsed"] >= elapsed:
+                    return
+        except (OSError, ValueError, KeyError):
+            pass
+        info = {
+            "digest": digest,
+            "method": method,
+            "elapsed": elapsed,
+            "cells": cells,
+            "cellsPerSecond": rate,
+            "stages": timings,
+            "spans": spanStats(table),
+            "capturedAt": time.time(),
+        }
+        with open(f"{basePath}.html", "w", encoding="utf-8") as htmlFile:
+            htmlFile.write(html)
+        with open(f"{basePath}.json", "w", encoding="utf-8") as infoFile:
+            json.dump(info, infoFile, indent=4)
+        watchdog.captured += 1
+    logger.warning(
+        "Slow table captured in %s.html (%s took %.3fs, %.0f cells/s)",
+        basePath,
+        method,
+        elapsed,
+        rate,
+    )
+
+
+def captureReport(captureDir, top=None):
+    """
+    Ranks captured tables by cost (conversion duration, slowest first).
+
+    Params
+    ------
+    captureDir : `str`
+        Capture directory of watchdog.
+
+    top : `int`
+        Only return this many tables (all by default).
+
+    Returns
+    -------
+    `list`
+        Infos of captured tables (see module documentation), with `path` of their html file.
+    """
+    import json
+
+    captures = []
+    for name in sorted(os.listdir(captureDir)):
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(captureDir, name), encoding="utf-8") as infoFile:
+                info = json.load(infoFile)
+        except (OSError, ValueError) as error:
+            logger.warning("Unreadable capture '%s' : %r", name, error)
+            continue
+        info["path"] = os.path.join(captureDir, f"{name[:-5]}.html")
+        captures.append(info)
+    captures.sort(key=lambda info: info["elapsed"], reverse=True)
+    return captures[:top] if top != None else captures
+
+
+def formatReport(captures):
+    """
+    Formats captured tables (returned by `captureReport()`) as a text table.
+    """
+    lines = [
+        f"{'Rank':>4}  {'Seconds':>8}  {'Cells':>9}  {'Cells/s':>10}  {'Expansion':>9}  {'Slowest stage':<15}  File"
+    ]
+    for rank, info in enumerate(captures, 1):
+        stages = {
+            stage: seconds
+            for stage, seconds in info["stages"].items()
+            if stage != info["method"]
+        }
+        slowest = max(stages, key=stages.get) if stages else info["method"]
+        lines.append(
+            f"{rank:>4}  {info['elapsed']:>8.3f}  {info['cells']:>9}  {info['cellsPerSecond']:>10.0f}  "
+            f"{info['spans']['expansion']:>9.1f}  {slowest:<15}  {info['path']}"
+        )
+    return "\n".join(lines)
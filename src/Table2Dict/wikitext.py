@@ -0,0 +1,317 @@
+"""
+Module to read MediaWiki wikitext tables directly, without rendering them to html and parsing html with BeautifulSoup. Wikitext
+is parsed into lightweight rows & cells that behave like bs4 tags where `Table` reads them (`contents`, `name`, `get()`, `text`),
+so a `Table` created from wikitext is resolved by the same code as html tables (see `Table.fromWikitext()`).
+
+Supported markup :
+
+| Markup            | Meaning                                                                |
+|-------------------|------------------------------------------------------------------------|
+| `{|` / `|}`       | Table start (with optional attributes) / table end                     |
+| `|+`              | Caption (not part of table rows, like html `<caption>`)                |
+| `|-`              | New row                                                                |
+| `!` / `!!`        | Header cells (`<th>`), one per line or many on one line                |
+| `|` / `||`        | Data cells (`<td>`), one per line or many on one line                  |
+| `attrs | content` | Cell attributes (`rowspan="2"`, `colspan=3`, ...) before a single pipe |
+
+Cell text is what html rendering would give : links give their label (`[[target|label]]`), bold/italic quotes, html tags,
+comments and references are removed, entities are decoded. Templates (`{{...}}`) can't be expanded without MediaWiki, they are
+dropped. A nested table adds its text to its cell, like `bs4` text of a cell holding a table.
+"""
+
+from html import escape, unescape
+import re
+
+ATTRIBUTE_PATTERN = re.compile(
+    r"""([^\s="'|]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"']+))"""
+)
+COMMENT_PATTERN = re.compile(r"<!--.*?-->", re.DOTALL)
+REF_PATTERN = re.compile(r"<ref[^>/]*/>|<ref[^>]*>.*?</ref>", re.DOTALL | re.IGNORECASE)
+TEMPLATE_PATTERN = re.compile(r"\{\{[^{}]*\}\}")
+FILE_LINK_PATTERN = re.compile(
+    r"\[\[(?:File|Image):[^\[\]]*(?:\[\[[^\]]*\]\][^\[\]]*)*\]\]", re.IGNORECASE
+)
+LINK_PATTERN = re.compile(r"\[\[:?([^\[\]|]*)(?:\|([^\[\]]*))?\]\]")
+EXTERNAL_LINK_PATTERN = re.compile(r"\[(?:https?:)?//[^\s\]]+(?:\s+([^\]]*))?\]")
+QUOTES_PATTERN = re.compile(r"'{2,}")
+TAG_PATTERN = re.compile(r"</?[a-zA-Z][^>]*>")
+
+
+# ===================================== #
+# =============== NODES =============== #
+# ===================================== #
+class WikiCell:
+    """
+    Table cell parsed from wikitext, a `<th>` or `<td>` as far as `Table` is concerned.
+
+    Attributes
+    ----------
+        `name` : `str`
+            Either "th" or "td".
+
+        `attrs` : `dict`
+            Cell attributes (lowercase names, string values).
+
+        `text` : `str`
+            Rendered cell text.
+    """
+
+    __slots__ = ("name", "attrs", "text")
+
+    def __init__(self, name, attrs, text):
+        self.name = name
+        self.attrs = attrs
+        self.text = text
+
+    def get(self, key, default=None):
+        return self.attrs.get(key, default)
+
+    def __str__(self):
+        attrs = "".join(f' {key}="{escape(value)}"' for key, value in self.attrs.items())
+        return f"<{self.name}{attrs}>{escape(self.text, quote=False)}</{self.name}>"
+
+    def __repr__(self):
+        return str(self)
+
+
+class WikiRow:
+    """
+    Table row parsed from wikitext, `contents` are its cells.
+    """
+
+    __slots__ = ("contents", "attrs")
+    name = "tr"
+
+    def __init__(self, contents, attrs=None):
+        self.contents = contents
+        self.attrs = attrs or {}
+
+    def __str__(self):
+        return "<tr>" + "".join(str(cell) for cell in self.contents) + "</tr>"
+
+    def __repr__(self):
+        return str(self)
+
+
+class WikiTable:
+    """
+    Table parsed from wikitext (see `parseWikitext()`), it stands for the table soup tag of a `Table`.
+
+    Attributes
+    ----------
+        `rows` : `list`
+            `WikiRow` of table (rows without cells are dropped, like MediaWiki does).
+
+        `attrs` : `dict`
+            Table attributes (given after `{|`).
+
+        `caption` : `str`
+            Rendered caption, None if table has none.
+    """
+
+    name = "table"
+
+    def __init__(self, rows, attrs=None, caption=None):
+        self.rows = rows
+        self.attrs = attrs or {}
+        self.caption = caption
+
+    def find_all(self, name):
+        """
+        Returns rows of table (`name` can only be "tr", it mirrors `bs4` call made by `Table`).
+        """
+        if name != "tr":
+            raise ValueError(f"Wikitext tables can only look up rows, not '{name}' !")
+        return list(self.rows)
+
+    @property
+    def text(self):
+        return "".join(cell.text for row in self.rows for cell in row.contents)
+
+    def __str__(self):
+        # Html equivalent of table, it can be parsed again by `Table` (to capture or compare a table)
+        caption = (
+            f"<caption>{escape(self.caption, quote=False)}</caption>"
+            if self.caption != None
+            else ""
+        )
+        return "<table>" + caption + "".join(str(row) for row in self.rows) + "</table>"
+
+
+# ===================================== #
+# ============== PARSING ============== #
+# ===================================== #
+def splitOutside(markup, separators):
+    """
+    Splits markup on separators that are not inside a link (`[[...]]`) or a template (`{{...}}`).
+    """
+    parts = []
+    depth = 0
+    start = 0
+    index = 0
+    while index < len(markup):
+        pair = markup[index : index + 2]
+        if pair in ("[[", "{{"):
+            depth += 1
+            index += 2
+            continue
+        if pair in ("]]", "}}") and depth > 0:
+            depth -= 1
+            index += 2
+            continue
+        if depth == 0:
+            separator = next(
+                (sep for sep in separators if markup.startswith(sep, index)), None
+            )
+            if separator != None:
+                parts.append(markup[start:index])
+                index += len(separator)
+                start = index
+                continue
+        index += 1
+    parts.append(markup[start:])
+    return parts
+
+
+def parseAttributes(markup):
+    """
+    Returns attributes of a table, row or cell (`rowspan="2" style="..."` -> `{"rowspan": "2", "style": "..."}`).
+    """
+    attrs = {}
+    for match in ATTRIBUTE_PATTERN.finditer(markup):
+        name, *values = match.groups()
+        attrs[name.lower()] = next(value for value in values if value != None)
+    return attrs
+
+
+def renderText(markup):
+    """
+    Returns text of cell markup as html rendering would display it (see module documentation).
+    """
+    text = COMMENT_PATTERN.sub("", markup)
+    text = REF_PATTERN.sub("", text)
+    # Templates can be nested, remove innermost ones first
+    previous = None
+    while previous != text:
+        previous = text
+        text = TEMPLATE_PATTERN.sub("", text)
+    text = FILE_LINK_PATTERN.sub("", text)
+    text = LINK_PATTERN.sub(
+        lambda match: match.group(2) if match.group(2) != None else match.group(1), text
+    )
+    text = EXTERNAL_LINK_PATTERN.sub(lambda match: match.group(1) or "", text)
+    text = QUOTES_PATTERN.sub("", text)
+    text = TAG_PATTERN.sub("", text)
+    return unescape(text).strip()
+
+
+class CellBuilder:
+    """
+    Cell being parsed, its content can go on over following lines.
+    """
+
+    __slots__ = ("name", "attrs", "lines", "nested")
+
+    def __init__(self, name, markup):
+        # Attributes are before first single pipe (outside links & templates)
+        parts = splitOutside(markup, ("|",))
+        if len(parts) > 1:
+            self.attrs = parseAttributes(parts[0])
+            markup = "|".join(parts[1:])
+        else:
+            self.attrs = {}
+        self.name = name
+        self.lines = [markup]
+        self.nested = []
+
+    def build(self):
+        text = renderText("\n".join(self.lines))
+        text += "".join(table.text for table in self.nested)
+        return WikiCell(self.name, self.attrs, text)
+
+
+def parseTable(lines, start):
+    """
+    Parses a table starting at line `start` (a `{|` line).
+
+    Returns
+    -------
+    `tuple`
+        `WikiTable` and index of line after table end.
+    """
+    attrs = parseAttributes(lines[start].strip()[2:])
+    rows = []
+    rowCells = []
+    rowAttrs = {}
+    cell = None
+    caption = None
+    index = start + 1
+
+    def closeRow():
+        if cell != None:
+            rowCells.append(cell.build())
+        if rowCells:
+            rows.append(WikiRow(list(rowCells), rowAttrs))
+        rowCells.clear()
+
+    while index < len(lines):
+        line = lines[index].strip()
+        if line.startswith("{|"):
+            nested, index = parseTable(lines, index)
+            if cell != None:
+                cell.nested.append(nested)
+            continue
+        index += 1
+        if line.startswith("|}"):
+            break
+        if line.startswith("|+"):
+            closeRow()
+            cell = None
+            caption = renderText(splitOutside(line[2:], ("|",))[-1])
+        elif line.startswith("|-"):
+            closeRow()
+            cell = None
+            rowAttrs = parseAttributes(line.lstrip("|-"))
+        elif line.startswith("!") or line.startswith("|"):
+            if cell != None:
+                rowCells.append(cell.build())
+            if line.startswith("!"):
+                markups = splitOutside(line[1:], ("!!", "||"))
+                name = "th"
+            else:
+                markups = splitOutside(line[1:], ("||",))
+                name = "td"
+            for markup in markups[:-1]:
+                rowCells.append(CellBuilder(name, markup).build())
+            cell = CellBuilder(name, markups[-1])
+        elif cell != None:
+            # Content of current cell goes on
+            cell.lines.append(line)
+    closeRow()
+    return WikiTable(rows, attrs, caption), index
+
+
+def parseWikitext(wikitext):
+    """
+    Parses every table of a wikitext page (nested tables are part of their cell, not returned).
+
+    Params
+    ------
+    wikitext : `str`
+        Wikitext of a page or of a table.
+
+    Returns
+    -------
+    `list`
+        `WikiTable` of each table, in page order.
+    """
+    lines = wikitext.split("\n")
+    tables = []
+    index = 0
+    while index < len(lines):
+        if lines[index].strip().startswith("{|"):
+            table, index = parseTable(lines, index)
+            tables.append(table)
+        else:
+            index += 1
+    return tables
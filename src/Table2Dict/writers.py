@@ -0,0 +1,275 @@
+"""
+Module to write converted tables to files row by row (sink writers), instead of building whole output in memory like
+`getTableJson()`. Many tables can be appended to one output file, only the table being written (and one row group for Parquet)
+is in memory at once.
+
+| Writer            | Extension  | Output                                                                        |
+|-------------------|------------|-------------------------------------------------------------------------------|
+| `CsvWriter`       | `.csv`     | Header line with dictionnary keys, then one line per body row                 |
+| `JsonLinesWriter` | `.jsonl`   | One JSON object (key -> cell) per body row                                    |
+| `ParquetWriter`   | `.parquet` | One string column per key, rows written in row groups (requires `pyarrow`)    |
+
+Keys are the ones of `getTableDict()` (see `Table.createDictKeys()`). For 2D tables, first column (row titles) is written like
+any other column.
+"""
+
+from .utils.customLogging import moduleLogging
+from .Table2Dict import Table
+from .records import tableKeys, iterRows
+import json
+import csv
+import os
+
+# Set up logging for module
+logger = moduleLogging()
+
+
+def tableRows(table, where=None):
+    """
+    Returns dictionnary keys of a table and an iterator over its body rows. Rows are read from resolved columns one at a time,
+    body is never transposed in memory. With a `where` filter, rows are streamed from html rows instead and only accepted rows
+    are extracted (see `records.iterRows()`).
+
+    Params
+    ------
+    table : `Table`
+        Table object.
+
+    where : `callable`
+        Optional row filter (see `Table.getTableDict()`).
+
+    Returns
+    -------
+    `tuple`
+        List of keys & iterator of rows (sequences of cells, one per key).
+    """
+    if where != None:
+        tableHeaderList = table.getTableHeader()
+        keys = tableKeys(table)
+        rows = iterRows(table, tableHeaderList, keys, where)
+        return keys, (row[: len(keys)] for row in rows)
+    tableType, header, body = table.getTableResult()
+    if len(header) != len(body):
+        raise AssertionError(
+            "Table header & body don't have the same number of columns !"
+        )
+    keys = tableKeys(table)
+    # Extra columns are dropped, like in `getTableDict()` (duplicated keys)
+    return keys, zip(*body[: len(keys)])
+
+
+class TableWriter:
+    """
+    Base class of writers, writes tables one after another in the same output.
+
+    Attributes
+    ----------
+        `keys` : `list`
+            Keys of output, taken from first written table (all tables written in a CSV or Parquet file must have same keys).
+
+        `rowsWritten` : `int`
+            Number of rows written so far.
+
+    Methods
+    -------
+        `write` : table
+            Appends body rows of a table (`Table` object, path to html file or table soup tag).
+
+        `close`
+            Flushes & closes output (writers are also context managers).
+    """
+
+    def __init__(self, output, parser="html.parser"):
+        self.parser = parser
+        self.keys = None
+        self.rowsWritten = 0
+        # Output can be a path or an already opened file (not closed by writer)
+        self.ownsFile = isinstance(output, (str, os.PathLike))
+        self.file = self.openFile(output) if self.ownsFile else output
+
+    def openFile(self, path):
+        return open(path, "w", encoding="utf-8", newline="")
+
+    def checkKeys(self, keys, fixedKeys=True):
+        if self.keys == None:
+            self.keys = keys
+            self.writeHeader()
+        elif fixedKeys and keys != self.keys:
+            raise ValueError(
+                f"Table keys {keys} don't match keys of output {self.keys} !"
+            )
+
+    def writeHeader(self):
+        pass
+
+    def writeRows(self, keys, rows):
+        raise NotImplementedError
+
+    def write(self, table, where=None):
+        """
+        Appends body rows of a table to output.
+
+        Params
+        ------
+        table : `Table`, `str` or `<class 'bs4.element.Tag'>`
+            Table object, absolute path to html file or table soup tag.
+
+        where : `callable`
+            Optional row filter (see `Table.getTableDict()`), only accepted rows are extracted & written.
+
+        Returns
+        -------
+        `int`
+            Number of rows written.
+        """
+        if not isinstance(table, Table):
+            table = Table(table, parser=self.parser)
+        keys, rows = tableRows(table, where)
+        before = self.rowsWritten
+        self.writeRows(keys, rows)
+        logger.debug("Wrote %d row(s)", self.rowsWritten - before)
+        return self.rowsWritten - before
+
+    def close(self):
+        if self.ownsFile:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvWriter(TableWriter):
+    """
+    Writes tables to a CSV file, header line is written once (see `TableWriter`). Keyword arguments are passed to `csv.writer`.
+    """
+
+    def __init__(self, output, parser="html.parser", **csvOptions):
+        super().__init__(output, parser)
+        self.writer = csv.writer(self.file, **csvOptions)
+
+    def writeHeader(self):
+        self.writer.writerow(self.keys)
+
+    def writeRows(self, keys, rows):
+        self.checkKeys(keys)
+        for row in rows:
+            self.writer.writerow(row)
+            self.rowsWritten += 1
+
+
+class JsonLinesWriter(TableWriter):
+    """
+    Writes tables to a JSON Lines file, one object per row (tables with different keys can be written in the same file).
+    """
+
+    def writeRows(self, keys, rows):
+        self.checkKeys(keys, fixedKeys=False)
+        for row in rows:
+            self.file.write(json.dumps(dict(zip(keys, row)), ensure_ascii=False))
+            self.file.write("\n")
+            self.rowsWritten += 1
+
+
+class ParquetWriter(TableWriter):
+    """
+    Writes tables to a Parquet file with `pyarrow` (optional dependency). Rows are buffered and written in row groups of
+    `rowGroupSize` rows, whatever the size of tables.
+    """
+
+    def __init__(self, output, parser="html.parser", rowGroupSize=10000, **parquetOptions):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as error:
+            raise ImportError(
+                "Writing Parquet files requires pyarrow (pip install pyarrow) !"
+            ) from error
+        self.pyarrow = pyarrow
+        self.rowGroupSize = rowGroupSize
+        self.parquetOptions = parquetOptions
+        self.writer = None
+        self.buffer = []
+        super().__init__(output, parser)
+        # Parquet writer handles path or binary file itself
+        self.output = output
+
+    def openFile(self, path):
+        return None
+
+    def writeHeader(self):
+        schema = self.pyarrow.schema(
+            [(key, self.pyarrow.string()) for key in self.keys]
+        )
+        self.writer = self.pyarrow.parquet.ParquetWriter(
+            self.output, schema, **self.parquetOptions
+        )
+
+    def writeRows(self, keys, rows):
+        self.checkKeys(keys)
+        for row in rows:
+            self.buffer.append(row)
+            self.rowsWritten += 1
+            if len(self.buffer) >= self.rowGroupSize:
+                self.flush()
+
+    def flush(self):
+        """
+        Writes buffered rows as a row group.
+        """
+        if not self.buffer:
+            return
+        columns = [list(column) for column in zip(*self.buffer)]
+        self.writer.write_table(
+            self.pyarrow.Table.from_arrays(columns, schema=self.writer.schema)
+        )
+        self.buffer = []
+
+    def close(self):
+        if self.writer != None:
+            self.flush()
+            self.writer.close()
+
+
+WRITERS = {
+    ".csv": CsvWriter,
+    ".jsonl": JsonLinesWriter,
+    ".parquet": ParquetWriter,
+}
+
+
+def writeTables(sources, path, parser="html.parser", where=None, **writerOptions):
+    """
+    Writes many tables in one file, writer is chosen from file extension (see `WRITERS`). Tables are converted & written one
+    after another.
+
+    Params
+    ------
+    sources : `iterable`
+        `Table` objects, absolute paths to html files or table soup tags.
+
+    path : `str`
+        Path of output file (.csv, .jsonl or .parquet).
+
+    where : `callable`
+        Optional row filter applied to every table (see `Table.getTableDict()`).
+
+    **writerOptions
+        Keyword arguments passed to writer.
+
+    Returns
+    -------
+    `int`
+        Number of rows written.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(
+            f"'{extension}' is not a supported output format ! It should be one of {', '.join(WRITERS)}."
+        )
+    with WRITERS[extension](path, parser, **writerOptions) as writer:
+        for source in sources:
+            writer.write(source, where)
+    return writer.rowsWritten
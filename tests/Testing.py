@@ -295,5 +295,1553 @@ class test_Table(unittest.TestCase):
         # ========= TEST ========== #
         self.oneOrAllCases(self.testAllTables, self.tablesFilesFolder, testTables, "getTableDict")
 
+class test_IncrementalTable(unittest.TestCase):
+    '''
+    Test incremental re-conversion of tables (`getTableSnapshot()` & `getTableUpdate()`).
+    '''
+    def setUp(self):
+        self.dirname = os.path.dirname(__file__)
+        self.tablesFilesFolder = os.path.join(self.dirname, "Test_Wiki_Table/Test_Tables")
+        self.allFiles = [os.path.join(self.tablesFilesFolder, f) for f in sorted(os.listdir(self.tablesFilesFolder))]
+
+    @staticmethod
+    def loadTable(filename):
+        with open(filename, 'r') as htmlTestFile:
+            soup = BeautifulSoup(htmlTestFile, "html.parser")
+        return soup.find('table')
+
+    def test_getTableSnapshot(self):
+        for file in self.allFiles:
+            with self.subTest(tested_file=file):
+                tableObj = Table2Dict.Table(self.loadTable(file))
+                snapshot = tableObj.getTableSnapshot()
+                self.assertEqual(snapshot["table"], tableObj.getTableDict())
+                # Snapshot can be stored as JSON
+                self.assertEqual(json.loads(json.dumps(snapshot))["table"], snapshot["table"])
+
+    def test_getTableUpdate(self):
+        for file in self.allFiles:
+            with self.subTest(tested_file=file):
+                table = self.loadTable(file)
+                snapshot = json.loads(json.dumps(Table2Dict.Table(table).getTableSnapshot()))
+                bodyRows = table.find_all("tr")[Table2Dict.Table(table).getTableType()["total_header_rows"]:]
+                # Nothing changed, everything is re-used
+                newSnapshot, diff = Table2Dict.Table(table).getTableUpdate(snapshot)
+                self.assertEqual(newSnapshot["table"], snapshot["table"])
+                self.assertEqual((diff["added"], diff["removed"], diff["changed"], diff["relaidOut"]), ([], [], [], []))
+                # Modify last cell of last row
+                lastCell = [c for c in bodyRows[-1].contents if c != "\n"][-1]
+                lastCell.string = "Changed"
+                newSnapshot, diff = Table2Dict.Table(table).getTableUpdate(snapshot)
+                self.assertEqual(newSnapshot["table"], Table2Dict.Table(table).getTableDict())
+                self.assertEqual(diff["changed"], [[len(bodyRows) - 1, len(bodyRows) - 1]])
+                self.assertEqual(diff["relaidOut"], [len(bodyRows) - 1])
+                # Duplicate last row (new row added)
+                bodyRows[-1].insert_after(BeautifulSoup(str(bodyRows[-1]), "html.parser").tr)
+                newSnapshot, diff = Table2Dict.Table(table).getTableUpdate(newSnapshot)
+                self.assertEqual(newSnapshot["table"], Table2Dict.Table(table).getTableDict())
+                self.assertEqual(diff["added"], [len(bodyRows)])
+
+    def test_getTableUpdate_spans(self):
+        html = '''<table>
+            <tr><th>Year</th><th>Album</th></tr>
+            <tr><td rowspan="2">1991</td><td>Bullhead</td></tr>
+            <tr><td>Eggnog</td></tr>
+            <tr><td>1992</td><td>Lysol</td></tr>
+        </table>'''
+        snapshot = Table2Dict.Table(BeautifulSoup(html, "html.parser").table).getTableSnapshot()
+        # Row under rowspan is re-used as long as rowspan doesn't change
+        table = BeautifulSoup(html.replace("Lysol", "Houdini"), "html.parser").table
+        newSnapshot, diff = Table2Dict.Table(table).getTableUpdate(snapshot)
+        self.assertEqual(newSnapshot["table"], Table2Dict.Table(table).getTableDict())
+        self.assertEqual(diff["relaidOut"], [2])
+        # Removing rowspan changes layout of next row even if its content didn't change
+        table = BeautifulSoup(html.replace(' rowspan="2"', ""), "html.parser").table
+        newSnapshot, diff = Table2Dict.Table(table).getTableUpdate(snapshot, dictType="ordered")
+        self.assertEqual(newSnapshot["table"], Table2Dict.Table(table).getTableDict(dictType="ordered"))
+        self.assertEqual(diff["changed"], [[0, 0]])
+        self.assertIn(1, diff["relaidOut"])
+
+class test_SparseGrid(unittest.TestCase):
+    '''
+    Test sparse (run-length) table representation and span caps.
+    '''
+    def setUp(self):
+        self.dirname = os.path.dirname(__file__)
+        folders = ["Test_Table_Header", "Test_Table_Body", "Test_Tables"]
+        self.allFiles = []
+        for folder in folders:
+            folderPath = os.path.join(self.dirname, "Test_Wiki_Table", folder)
+            self.allFiles += [os.path.join(folderPath, f) for f in sorted(os.listdir(folderPath))]
+
+    def test_SpanColumn(self):
+        from src.Table2Dict.sparseGrid import SpanColumn
+        column = SpanColumn()
+        expected = []
+        operations = [("run", "a", 3), ("run", "a", 2), ("run", "b", 1), ("insert", 2, "c"), ("insert", 0, "d"), ("insert", 4, "a"), ("insert", 99, "e")]
+        for operation in operations:
+            if operation[0] == "run":
+                column.appendRun(operation[1], operation[2])
+                expected.extend([operation[1]] * operation[2])
+            else:
+                column.insert(operation[1], operation[2])
+                expected.insert(operation[1], operation[2])
+            self.assertEqual(column.toList(), expected)
+        self.assertEqual([column[i] for i in range(len(column))], expected)
+        self.assertEqual(column[-1], expected[-1])
+        self.assertRaises(IndexError, column.__getitem__, len(expected))
+
+    def test_sparseOutputs(self):
+        for file in self.allFiles:
+            with self.subTest(tested_file=file):
+                tableObj = Table2Dict.Table(file)
+                self.assertEqual(tableObj.getTableHeader(sparse=True).toList(), tableObj.getTableHeader())
+                self.assertEqual(tableObj.getTableBody(sparse=True).toList(), tableObj.getTableBody())
+                if "Test_Tables" in file:
+                    self.assertEqual(tableObj.getTableList(sparse=True).toList(), tableObj.getTableList())
+
+    def test_spanCaps(self):
+        html = '''<table>
+            <tr><th colspan="100000">Year</th></tr>
+            <tr><td rowspan="1000000000">1991</td></tr>
+        </table>'''
+        table = BeautifulSoup(html, "html.parser").table
+        # Spans are clamped to caps
+        tableObj = Table2Dict.Table(table, maxRowspan=5, maxColspan=2)
+        self.assertEqual(tableObj.getTableHeader(), [['Year'], ['Year']])
+        self.assertEqual(tableObj.getTableBody(), [['1991'] * 5])
+        # Default caps are html standard maximums, sparse grid stores huge span only once
+        body = Table2Dict.Table(table).getTableBody(sparse=True)
+        self.assertEqual(len(body[0]), Table2Dict.Table.MAX_ROWSPAN)
+        self.assertEqual(body.totalRuns(), 1)
+
+class test_BinaryFormat(unittest.TestCase):
+    '''
+    Test binary format of resolved tables (`dump()` & `load()`).
+    '''
+    def setUp(self):
+        self.dirname = os.path.dirname(__file__)
+        self.tablesFilesFolder = os.path.join(self.dirname, "Test_Wiki_Table/Test_Tables")
+        self.allFiles = [os.path.join(self.tablesFilesFolder, f) for f in sorted(os.listdir(self.tablesFilesFolder))]
+
+    def test_dumpLoad(self):
+        import tempfile
+        from src.Table2Dict import binaryFormat
+        for file in self.allFiles:
+            with self.subTest(tested_file=file):
+                tableObj = Table2Dict.Table(file)
+                with tempfile.TemporaryDirectory() as tmpDir:
+                    path = os.path.join(tmpDir, "table.t2db")
+                    binaryFormat.dump(tableObj, path)
+                    with binaryFormat.load(path) as binaryTable:
+                        self.assertEqual(binaryTable.getTableDict(), tableObj.getTableDict())
+                        self.assertEqual(binaryTable.getTableDict(dictType="ordered"), tableObj.getTableDict(dictType="ordered"))
+                        self.assertEqual(binaryTable.getTableList(), tableObj.getTableList())
+                        self.assertEqual(binaryTable.column(0), tableObj.getTableBody()[0])
+                # Binary format is smaller than html source
+                self.assertLess(len(binaryFormat.dumps(tableObj)), os.path.getsize(file))
+        # Spans & repeated cells are stored once, so it's smaller than JSON on a big table
+        rows = "".join(f"<tr><td rowspan='4'>{1990 + i}</td><td>Album</td><td rowspan='4'>Boner Records</td></tr>" + "<tr><td>Album</td></tr>" * 3 for i in range(100))
+        tableObj = Table2Dict.Table(BeautifulSoup(f"<table><tr><th>Year</th><th>Album</th><th>Label</th></tr>{rows}</table>", "html.parser").table)
+        self.assertLess(len(binaryFormat.dumps(tableObj)), len(tableObj.getTableJson(indent=None)) / 2)
+
+    def test_columnAccess(self):
+        from src.Table2Dict import binaryFormat
+        html = '''<table>
+            <tr><th>Year</th><th>Album</th></tr>
+            <tr><td rowspan="3">1991</td><td>Bullhead</td></tr>
+            <tr><td>Eggnog</td></tr>
+            <tr><td>Lysol</td></tr>
+        </table>'''
+        tableObj = Table2Dict.Table(BeautifulSoup(html, "html.parser").table)
+        binaryTable = binaryFormat.loads(binaryFormat.dumps(tableObj))
+        self.assertEqual(binaryTable.keys, ['Year', 'Album'])
+        yearColumn = binaryTable.column("Year")
+        self.assertEqual(len(yearColumn), 3)
+        self.assertEqual(list(yearColumn.runs()), [('1991', 3)])
+        self.assertEqual(yearColumn[-1], '1991')
+        self.assertEqual(binaryTable.column("Album")[1:], ['Eggnog', 'Lysol'])
+        self.assertRaises(ValueError, binaryFormat.loads, b"NOPE" + bytes(40))
+
+    def test_closeWithColumns(self):
+        import tempfile
+        from src.Table2Dict import binaryFormat
+        tableObj = Table2Dict.Table(self.allFiles[0])
+        with tempfile.TemporaryDirectory() as tmpDir:
+            path = os.path.join(tmpDir, "table.t2db")
+            binaryFormat.dump(tableObj, path)
+            # Columns still referenced when table is closed
+            binaryTable = binaryFormat.load(path)
+            column = binaryTable.column(0)
+            self.assertEqual(column[0], tableObj.getTableBody()[0][0])
+            binaryTable.close()
+            self.assertTrue(binaryTable.mappedFile.closed)
+            with self.assertRaises(ValueError):
+                column[0]
+            binaryTable.close()
+            with binaryFormat.load(path) as binaryTable:
+                column = binaryTable.column(0)
+                self.assertEqual(column, tableObj.getTableBody()[0])
+            self.assertTrue(binaryTable.mappedFile.closed)
+
+class test_ImportTime(unittest.TestCase):
+    '''
+    Import-time budget tests, importing package must stay cheap and have no side effect (run in a fresh interpreter).
+    '''
+    # Generous budgets (in seconds) that only catch gross regressions, wall-clock time varies too much between machines to be
+    # tight. Lazy imports are proven by checking modules loaded (bs4, optional features) by name.
+    PACKAGE_BUDGET = 0.25
+    TABLE_BUDGET = 0.5
+
+    @staticmethod
+    def runFresh(code):
+        import subprocess
+        script = f"import sys, time; sys.path.insert(0, {parentdir!r})\n{code}"
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        return json.loads(output.stdout)
+
+    def test_packageImport(self):
+        res = self.runFresh(
+            "start = time.perf_counter()\n"
+            "import src.Table2Dict as T2D\n"
+            "elapsed = time.perf_counter() - start\n"
+            "import json\n"
+            "print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))"
+        )
+        self.assertLess(res["elapsed"], self.PACKAGE_BUDGET)
+        for heavyModule in ("bs4", "src.Table2Dict.Table2Dict", "logging"):
+            self.assertNotIn(heavyModule, res["modules"])
+
+    def test_lazyTable(self):
+        res = self.runFresh(
+            "import src.Table2Dict as T2D\n"
+            "start = time.perf_counter()\n"
+            "Table = T2D.Table\n"
+            "elapsed = time.perf_counter() - start\n"
+            "bs4Loaded = 'bs4' in sys.modules\n"
+            "modules = sorted(sys.modules)\n"
+            f"Table({os.path.join(currentdir, 'Test_Wiki_Table/Test_Tables/debugTable_case0.html')!r})\n"
+            "import json\n"
+            "print(json.dumps({'elapsed': elapsed, 'bs4Loaded': bs4Loaded, 'bs4LoadedAfter': 'bs4' in sys.modules, 'modules': modules}))"
+        )
+        self.assertLess(res["elapsed"], self.TABLE_BUDGET)
+        self.assertFalse(res["bs4Loaded"])
+        # Modules of optional features are only imported when used
+        for optionalModule in ("src.Table2Dict.wikitext", "src.Table2Dict.parallel", "concurrent.futures", "json", "src.Table2Dict.spill", "tempfile"):
+            self.assertNotIn(optionalModule, res["modules"])
+        self.assertTrue(res["bs4LoadedAfter"])
+        # No log file is created in package folder
+        self.assertFalse(os.path.exists(os.path.join(parentdir, "src", "Table2Dict", "logs")))
+
+class test_ThreadSafety(unittest.TestCase):
+    '''
+    Test thread-safety of `Table` and thread-pool batch conversion.
+    '''
+    def setUp(self):
+        self.dirname = os.path.dirname(__file__)
+        self.tablesFilesFolder = os.path.join(self.dirname, "Test_Wiki_Table/Test_Tables")
+        self.allFiles = [os.path.join(self.tablesFilesFolder, f) for f in sorted(os.listdir(self.tablesFilesFolder))]
+
+    def test_immutableResults(self):
+        import pickle
+        tableObj = Table2Dict.Table(os.path.join(self.tablesFilesFolder, "debugTable_case7.html"))
+        expected = tableObj.getTableDict()
+        # Modifying returned lists doesn't change next results
+        tableObj.getTableHeader()[0].append("Garbage")
+        tableObj.getTableList()[0].append("Garbage")
+        tableObj.getTableType()["dimensions"] = "Garbage"
+        self.assertEqual(tableObj.getTableDict(), expected)
+        result = tableObj.getTableResult()
+        self.assertIsInstance(result.header[0], tuple)
+        with self.assertRaises(TypeError):
+            result.tableType["dimensions"] = "2D"
+        self.assertEqual(pickle.loads(pickle.dumps(result)), result)
+        self.assertEqual(pickle.loads(pickle.dumps(tableObj)).getTableDict(), expected)
+
+    def test_sharedTable(self):
+        from concurrent.futures import ThreadPoolExecutor
+        tableObjs = [Table2Dict.Table(file) for file in self.allFiles]
+        expected = [Table2Dict.Table(file).getTableList() for file in self.allFiles]
+        # Same objects used concurrently from many threads
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: tableObjs[i % len(tableObjs)].getTableList(), range(20 * len(tableObjs))))
+        for i, result in enumerate(results):
+            self.assertEqual(result, expected[i % len(tableObjs)])
+
+    def test_convertTables(self):
+        from src.Table2Dict import batch
+        expected = [Table2Dict.Table(file).getTableDict() for file in self.allFiles]
+        self.assertEqual(batch.convertTables(self.allFiles, workers=4), expected)
+        self.assertEqual(batch.convertTables(self.allFiles, workers=1), expected)
+        malformed = os.path.join(self.dirname, "Test_Wiki_Table/Malformed_Tables/debugTable_error_case11.html")
+        results = batch.convertTables([malformed] + self.allFiles, workers=2, errors="return")
+        self.assertIsInstance(results[0], AssertionError)
+        self.assertEqual(results[1:], expected)
+        self.assertRaises(AssertionError, batch.convertTables, [malformed], workers=2)
+
+    def test_scaling(self):
+        import time
+        from src.Table2Dict import batch
+        # Big enough batch for timings to be meaningful
+        sources = self.allFiles * 30
+        start = time.perf_counter()
+        sequential = batch.convertTables(sources, workers=1)
+        sequentialTime = time.perf_counter() - start
+        start = time.perf_counter()
+        threaded = batch.convertTables(sources, workers=4)
+        threadedTime = time.perf_counter() - start
+        self.assertEqual(threaded, sequential)
+        print(f"Batch of {len(sources)} tables : sequential {sequentialTime:.3f}s, 4 threads {threadedTime:.3f}s (x{sequentialTime / threadedTime:.2f})")
+        if batch.isFreeThreaded() and (os.cpu_count() or 1) >= 4:
+            self.assertGreater(sequentialTime / threadedTime, 1.5)
+        else:
+            # No speedup with the GIL (bs4 tree building holds it whatever the parser), threads must not cost much either
+            self.assertLess(threadedTime, 2 * sequentialTime)
+
+class test_Validation(unittest.TestCase):
+    '''
+    Test structural validation of tables (`Table.validate()`).
+    '''
+    def setUp(self):
+        self.dirname = os.path.dirname(__file__)
+        self.tablesFilesFolder = os.path.join(self.dirname, "Test_Wiki_Table/Test_Tables")
+        self.allFiles = [os.path.join(self.tablesFilesFolder, f) for f in sorted(os.listdir(self.tablesFilesFolder))]
+        self.malformed = os.path.join(self.dirname, "Test_Wiki_Table/Malformed_Tables/debugTable_error_case11.html")
+
+    @staticmethod
+    def codes(report):
+        return [diag.code for diag in report.diagnostics]
+
+    def test_validTables(self):
+        for file in self.allFiles:
+            with self.subTest(tested_file=file):
+                report = Table2Dict.Table(file).validate()
+                self.assertTrue(report)
+                self.assertEqual(report.diagnostics, [])
+                self.assertEqual(report.headerColumns, len(Table2Dict.Table(file).getTableHeader()))
+
+    def test_malformedTable(self):
+        report = Table2Dict.Table(self.malformed).validate()
+        self.assertFalse(report)
+        self.assertIn("columnMismatch", self.codes(report))
+        self.assertEqual((report.headerColumns, report.bodyColumns), (3, 2))
+        self.assertRaises(AssertionError, Table2Dict.Table(self.malformed).getTableDict)
+
+    def test_diagnostics(self):
+        cases = {
+            # Body row wider than table, rowspan going past last row
+            "<tr><th>A</th><th>B</th></tr><tr><td>1</td><td rowspan='3'>2</td></tr><tr><td>3</td><td>4</td></tr>": ["droppedCell", "spanOverflow"],
+            # Short body row
+            "<tr><th>A</th><th>B</th></tr><tr><td>1</td><td>2</td></tr><tr><td>3</td></tr><tr><td>5</td><td>6</td></tr>": ["shortRow"],
+            # Header colspan past last column, body colspan
+            "<tr><th rowspan='2'>A</th><th>B</th></tr><tr><th colspan='3'>C</th></tr><tr><td>1</td><td colspan='2'>2</td></tr>": ["spanOutOfTable", "ignoredColspan"],
+            # Rows neither header nor titled
+            "<tr><th>A</th><th>B</th><td>1</td></tr>": ["unknownType"],
+            # Spans that aren't integers
+            "<tr><th>A</th><th colspan='two'>B</th></tr><tr><td>1</td><td rowspan='x'>2</td></tr>": ["invalidSpan", "invalidSpan"],
+            "<tr><td rowspan='x'>1</td><td>2</td></tr><tr><td>3</td><td>4</td></tr>": ["noHeader", "invalidSpan"],
+        }
+        for rows, expectedCodes in cases.items():
+            with self.subTest(rows=rows):
+                report = Table2Dict.Table(BeautifulSoup(f"<table>{rows}</table>", "html.parser").table).validate()
+                self.assertEqual(self.codes(report), expectedCodes)
+                if "invalidSpan" in expectedCodes:
+                    self.assertFalse(report)
+                    self.assertRaises(ValueError, Table2Dict.Table(BeautifulSoup(f"<table>{rows}</table>", "html.parser").table).getTableDict)
+
+    def test_noHeader(self):
+        # Table body only : conversion to a dictionnary fails, validation must reject it
+        bodyFolder = os.path.join(self.dirname, "Test_Wiki_Table/Test_Table_Body")
+        for file in sorted(os.listdir(bodyFolder)):
+            with self.subTest(tested_file=file):
+                tableObj = Table2Dict.Table(os.path.join(bodyFolder, file))
+                report = tableObj.validate()
+                self.assertFalse(report)
+                self.assertEqual([diag.code for diag in report.errors], ["noHeader"])
+                self.assertRaises(TypeError, tableObj.getTableDict)
+
+    def test_batchSkip(self):
+        from src.Table2Dict import batch, validation
+        results = batch.convertTables([self.malformed] + self.allFiles, workers=2, errors="return", validate=True)
+        self.assertIsInstance(results[0], validation.TableValidationError)
+        self.assertFalse(results[0].report)
+        self.assertEqual(results[1:], [Table2Dict.Table(file).getTableDict() for file in self.allFiles])
+
+class test_ConversionJob(unittest.TestCase):
+    '''
+    Test resumable conversion jobs (sqlite work queue).
+    '''
+    def setUp(self):
+        import tempfile
+        self.dirname = os.path.dirname(__file__)
+        self.tablesFilesFolder = os.path.join(self.dirname, "Test_Wiki_Table/Test_Tables")
+        self.allFiles = [os.path.join(self.tablesFilesFolder, f) for f in sorted(os.listdir(self.tablesFilesFolder))]
+        self.malformed = os.path.join(self.dirname, "Test_Wiki_Table/Malformed_Tables/debugTable_error_case11.html")
+        self.tempDir = tempfile.TemporaryDirectory()
+        self.jobPath = os.path.join(self.tempDir.name, "job.sqlite")
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    def test_run(self):
+        from src.Table2Dict import jobs
+        with jobs.ConversionJob(self.jobPath) as job:
+            self.assertEqual(job.addFiles(self.allFiles + [self.malformed], batchSize=3), len(self.allFiles) + 1)
+            # Adding same files again is harmless
+            self.assertEqual(job.addFiles(self.allFiles), 0)
+            self.assertEqual(job.run(workers=2, batchSize=4), {"done": len(self.allFiles), "failed": 1})
+            self.assertEqual(job.progress(), {"pending": 0, "running": 0, "done": len(self.allFiles), "failed": 1})
+            expected = {file: json.loads(json.dumps(Table2Dict.Table(file).getTableDict())) for file in self.allFiles}
+            self.assertEqual(dict(job.results()), expected)
+            (path, error), = job.failures()
+            self.assertEqual(path, self.malformed)
+            self.assertIn("AssertionError", error)
+            # Nothing left to do
+            self.assertEqual(job.run(), {"done": 0, "failed": 0})
+            self.assertEqual(job.requeue("failed"), 1)
+            self.assertEqual(job.progress()["pending"], 1)
+
+    def test_resume(self):
+        from src.Table2Dict import jobs
+        with jobs.ConversionJob(self.jobPath) as job:
+            job.addFiles(self.allFiles)
+            self.assertEqual(job.run(batchSize=2, limit=4), {"done": 4, "failed": 0})
+            # Simulate a crash : files leased but never checkpointed
+            crashed = job.lease(3)
+        with jobs.ConversionJob(self.jobPath) as job:
+            # Lease of crashed worker isn't expired yet, its files are left to it
+            self.assertEqual(job.run(), {"done": len(self.allFiles) - 7, "failed": 0})
+            self.assertEqual(job.progress()["running"], 3)
+        with jobs.ConversionJob(self.jobPath, leaseTimeout=0) as job:
+            self.assertEqual(job.run(), {"done": 3, "failed": 0})
+            self.assertEqual(job.progress()["done"], len(self.allFiles))
+            self.assertEqual(sorted(path for path, _ in job.results()), sorted(self.allFiles))
+            attempts = dict(job.connection.execute("SELECT path, attempts FROM files"))
+            self.assertEqual({path for path, count in attempts.items() if count == 2}, set(crashed))
+
+    def test_maxAttempts(self):
+        from src.Table2Dict import jobs
+        with jobs.ConversionJob(self.jobPath, leaseTimeout=0, maxAttempts=2) as job:
+            job.addFiles(self.allFiles[:1])
+            job.lease(1)
+            job.lease(1)
+            self.assertEqual(job.run(), {"done": 0, "failed": 0})
+            self.assertEqual(list(job.failures()), [(self.allFiles[0], "Too many attempts")])
+
+    def test_concurrentWorkers(self):
+        import subprocess
+        from src.Table2Dict import jobs
+        sources = self.allFiles
+        with jobs.ConversionJob(self.jobPath) as job:
+            job.addFiles(sources)
+        script = (
+            f"import sys, json; sys.path.insert(0, {parentdir!r})\n"
+            "from src.Table2Dict import jobs\n"
+            f"print(json.dumps(jobs.ConversionJob({self.jobPath!r}).run(workers=1, batchSize=1)))"
+        )
+        processes = [subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, text=True) for _ in range(3)]
+        counts = [json.loads(process.communicate()[0]) for process in processes]
+        # Every file is converted exactly once by one of the workers
+        self.assertEqual(sum(count["done"] for count in counts), len(sources))
+        with jobs.ConversionJob(self.jobPath) as job:
+            self.assertEqual(job.progress()["done"], len(sources))
+            self.assertEqual({count for count, in job.connection.execute("SELECT attempts FROM files")}, {1})
+
+    def test_unserializableResult(self):
+        from src.Table2Dict import jobs
+        # `getTableResult()` returns a named tuple holding a mappingproxy
+        with jobs.ConversionJob(self.jobPath, method="getTableResult") as job:
+            job.addFiles(self.allFiles[:3])
+            self.assertEqual(job.run(batchSize=2), {"done": 0, "failed": 3})
+            self.assertEqual(job.progress(), {"pending": 0, "running": 0, "done": 0, "failed": 3})
+            for path, error in job.failures():
+                self.assertIn("TypeError", error)
+
+class test_Writers(unittest.TestCase):
+    '''
+    Test streaming CSV / JSON Lines / Parquet writers.
+    '''
+    def setUp(self):
+        import tempfile
+        self.dirname = os.path.dirname(__file__)
+        self.tablesFilesFolder = os.path.join(self.dirname, "Test_Wiki_Table/Test_Tables")
+        self.allFiles = [os.path.join(self.tablesFilesFolder, f) for f in sorted(os.listdir(self.tablesFilesFolder))]
+        self.tempDir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tempDir.cleanup()
+
+    @staticmethod
+    def expectedRows(file):
+        tableObj = Table2Dict.Table(file)
+        keys = list(tableObj.createDictKeys(tableObj.getTableHeader(), tableObj.getTableType()["total_header_rows"]))
+        body = tableObj.getTableBody()
+        return keys, [[column[i] for column in body[:len(keys)]] for i in range(len(body[0]))]
+
+    def test_csv(self):
+        import csv
+        from src.Table2Dict import writers
+        file = os.path.join(self.tablesFilesFolder, "debugTable_case7.html")
+        keys, rows = self.expectedRows(file)
+        path = os.path.join(self.tempDir.name, "tables.csv")
+        # Same table appended 3 times, header line is written once
+        self.assertEqual(writers.writeTables([file, Table2Dict.Table(file), file], path), 3 * len(rows))
+        with open(path, newline="", encoding="utf-8") as csvFile:
+            self.assertEqual(list(csv.reader(csvFile)), [keys] + 3 * rows)
+        with writers.CsvWriter(os.path.join(self.tempDir.name, "mixed.csv")) as writer:
+            writer.write(file)
+            otherFile = next(other for other in self.allFiles if self.expectedRows(other)[0] != keys)
+            self.assertRaises(ValueError, writer.write, otherFile)
+
+    def test_jsonLines(self):
+        from src.Table2Dict import writers
+        path = os.path.join(self.tempDir.name, "tables.jsonl")
+        rowCount = writers.writeTables(self.allFiles, path)
+        expected = []
+        for file in self.allFiles:
+            keys, rows = self.expectedRows(file)
+            expected.extend(dict(zip(keys, row)) for row in rows)
+        self.assertEqual(rowCount, len(expected))
+        with open(path, encoding="utf-8") as jsonFile:
+            self.assertEqual([json.loads(line) for line in jsonFile], expected)
+        self.assertRaises(ValueError, writers.writeTables, self.allFiles, os.path.join(self.tempDir.name, "tables.xml"))
+
+    def test_parquet(self):
+        from src.Table2Dict import writers
+        path = os.path.join(self.tempDir.name, "tables.parquet")
+        file = os.path.join(self.tablesFilesFolder, "debugTable_case7.html")
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            self.assertRaises(ImportError, writers.ParquetWriter, path)
+            self.skipTest("pyarrow isn't installed")
+        keys, rows = self.expectedRows(file)
+        writers.writeTables([file] * 5, path, rowGroupSize=len(rows) * 2)
+        parquetFile = pyarrow.parquet.ParquetFile(path)
+        self.assertEqual(parquetFile.num_row_groups, 3)
+        self.assertEqual(parquetFile.read().to_pylist(), [dict(zip(keys, row)) for row in rows] * 5)
+
+class test_TableIndex(unittest.TestCase):
+    '''
+    Test indexed lookups (`column()`, `row()` & `cell()`) against `getTableDict()`.
+    '''
+    def setUp(self):
+        self.dirname = os.path.dirname(__file__)
+        self.tablesFilesFolder = os.path.join(self.dirname, "Test_Wiki_Table/Test_Tables")
+        self.allFiles = [os.path.join(self.tablesFilesFolder, f) for f in sorted(os.listdir(self.tablesFilesFolder))]
+
+    def test_lookups(self):
+        for file in self.allFiles:
+            with self.subTest(tested_file=file):
+                tableObj = Table2Dict.Table(file)
+                tableDict = tableObj.getTableDict()
+                body = tableObj.getTableBody()
+                if tableObj.getTableType()["dimensions"] == "1D":
+                    for colIndex, (key, column) in enumerate(tableDict.items()):
+                        self.assertEqual(list(tableObj.column(key)), column)
+                        self.assertIs(tableObj.column(key), tableObj.column(colIndex))
+                        for rowIndex, cell in enumerate(column):
+                            self.assertEqual(tableObj.cell(rowIndex, key), cell)
+                            self.assertEqual(tableObj.row(rowIndex)[key], cell)
+                    self.assertEqual(dict(tableObj.row(-1)), {key: column[-1] for key, column in tableDict.items()})
+                else:
+                    for rowIndex, (title, rowDict) in enumerate(tableDict.items()):
+                        self.assertEqual(tableObj.row(title), rowDict)
+                        for key, cell in rowDict.items():
+                            self.assertEqual(tableObj.cell(title, key), cell)
+                            self.assertEqual(tableObj.cell(rowIndex, key), cell)
+                    self.assertEqual(list(tableObj.column(0)), body[0])
+                self.assertRaises(KeyError, tableObj.column, "No such column")
+                self.assertRaises(IndexError, tableObj.row, len(body[0]))
+
+    def test_sharedStorage(self):
+        tableObj = Table2Dict.Table(os.path.join(self.tablesFilesFolder, "debugTable_case7.html"))
+        index = tableObj.getTableIndex()
+        self.assertIs(index, tableObj.getTableIndex())
+        # Columns & rows are views on resolved body, nothing is copied
+        self.assertIs(index.columns, tableObj.getTableResult().body)
+        self.assertIs(tableObj.row(0).columns, index.columns)
+        self.assertEqual([list(row.values()) for row in index.rows()], [list(row) for row in zip(*tableObj.getTableBody())])
+
+class test_Records(unittest.TestCase):
+    '''
+    Test per-row records output (`getTableRecords()` & `iterTableRecords()`).
+    '''
+    def setUp(self):
+        self.dirname = os.path.dirname(__file__)
+        self.tablesFilesFolder = os.path.join(self.dirname, "Test_Wiki_Table/Test_Tables")
+        self.allFiles = [os.path.join(self.tablesFilesFolder, f) for f in sorted(os.listdir(self.tablesFilesFolder))]
+
+    @staticmethod
+    def generatedTable(rows):
+        cells = "".join(f"<tr><td>{i}</td><td>Album {i}</td><td>Label {i % 7}</td><td>{i % 3}</td><td>Note</td></tr>" for i in range(rows))
+        html = f"<table><tr><th>Year</th><th>Album</th><th>Label (Company)</th><th>Rank</th><th>Note</th></tr>{cells}</table>"
+        return Table2Dict.Table(BeautifulSoup(html, "html.parser").table)
+
+    def test_records(self):
+        for file in self.allFiles:
+            with self.subTest(tested_file=file):
+                tableObj = Table2Dict.Table(file)
+                records = tableObj.getTableRecords()
+                rows = [list(row) for row in zip(*tableObj.getTableBody())]
+                self.assertEqual([list(record) for record in records], rows)
+                self.assertEqual(list(Table2Dict.Table(file).iterTableRecords()), records)
+                keys = list(tableObj.createDictKeys(tableObj.getTableHeader(), tableObj.getTableType()["total_header_rows"]))
+                self.assertEqual(records[0]._keys, tuple(keys))
+                if tableObj.getTableType()["dimensions"] == "1D":
+                    tableDict = tableObj.getTableDict()
+                    self.assertEqual([record._asdict() for record in records], [dict(zip(keys, row)) for row in zip(*tableDict.values())])
+        record = self.generatedTable(3).getTableRecords()[2]
+        self.assertEqual((record.Label_Company, record["Label (Company)"], record[2]), ("Label 2", "Label 2", "Label 2"))
+
+    def test_streamingLayout(self):
+        # Rowspans carried over, short rows, dropped cells & spans past last row
+        cases = [
+            "<tr><td rowspan='3'>1</td><td>2</td></tr><tr><td>3</td></tr><tr><td>4</td></tr><tr><td>5</td><td>6</td></tr>",
+            "<tr><td>1</td><td>2</td></tr><tr><td>3</td></tr><tr><td>5</td><td>6</td></tr><tr><td>7</td><td>8</td></tr>",
+            "<tr><td>1</td><td rowspan='4'>2</td></tr><tr><td>3</td><td>4</td></tr><tr><td>5</td></tr>",
+        ]
+        for rows in cases:
+            with self.subTest(rows=rows):
+                html = f"<table><tr><th>A</th><th>B</th></tr>{rows}</table>"
+                tableObj = Table2Dict.Table(BeautifulSoup(html, "html.parser").table)
+                expected = [list(row) for row in zip(*tableObj.getTableBody())]
+                streamed = Table2Dict.Table(BeautifulSoup(html, "html.parser").table).iterTableRecords()
+                self.assertEqual([list(record) for record in streamed], expected)
+
+    def test_memory(self):
+        import tracemalloc
+        tableObj = self.generatedTable(2000)
+        keys = list(tableObj.createDictKeys(tableObj.getTableHeader(), 1))
+        rows = list(zip(*tableObj.getTableBody()))
+        tracemalloc.start()
+        dicts = [dict(zip(keys, row)) for row in rows]
+        dictsSize = tracemalloc.get_traced_memory()[0]
+        del dicts
+        tracemalloc.stop()
+        tracemalloc.start()
+        records = tableObj.getTableRecords()
+        recordsSize = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        self.assertEqual(len(records), 2000)
+        print(f"2000 rows : list of dicts {dictsSize} bytes, records {recordsSize} bytes")
+        self.assertLess(recordsSize, dictsSize * 0.6)
+        # Streaming never holds whole body (not even cell texts), its peak memory doesn't grow with number of rows
+        streamingPeaks = []
+        for rows in (2000, 4000):
+            tableObj = self.generatedTable(rows)
+            tracemalloc.start()
+            count = sum(1 for _ in tableObj.iterTableRecords())
+            streamingPeaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            self.assertEqual(count, rows)
+            self.assertNotIn("body", tableObj.cache)
+        self.assertLess(streamingPeaks[1], streamingPeaks[0] * 1.25)
+
+class test_WherePushdown(unittest.TestCase):
+    '''
+    Test row filter predicates (`where=`) evaluated while rows are resolved.
+    '''
+    def setUp(self):
+        self.dirname = os.path.dirname(__file__)
+        self.tablesFilesFolder = os.path.join(self.dirname, "Test_Wiki_Table/Test_Tables")
+        self.allFiles = [os.path.join(self.tablesFilesFolder, f) for f in sorted(os.listdir(self.tablesFilesFolder))]
+
+    def test_filteredOutputs(self):
+        for file in self.allFiles:
+            with self.subTest(tested_file=file):
+                tableObj = Table2Dict.Table(file)
+                records = tableObj.getTableRecords()
+                lastKey = records[0]._keys[-1]
+                keep = lambda row: len(row[lastKey]) % 2 == 0
+                expected = [record for record in records if keep(record._asdict())]
+                self.assertEqual(Table2Dict.Table(file).getTableRecords(where=keep), expected)
+                self.assertEqual(list(tableObj.iterTableRecords(where=keep)), expected)
+                tableDict = tableObj.getTableDict(dictType="ordered", where=keep)
+                if tableObj.getTableType()["dimensions"] == "1D":
+                    self.assertEqual(tableDict, {key: [record[key] for record in expected] for key in records[0]._keys})
+                else:
+                    firstKey = records[0]._keys[0]
+                    self.assertEqual(list(tableDict), [record[firstKey] for record in expected])
+                    for record in expected:
+                        self.assertEqual(tableDict[record[firstKey]], {key: record[key] for key in record._keys[1:]})
+                self.assertEqual(tableObj.getTableDict(where=lambda row: True), tableObj.getTableDict())
+
+    def test_passEverything(self):
+        # A predicate keeping every row behaves exactly like no predicate, errors included
+        def outcome(file, **kwargs):
+            try:
+                return Table2Dict.Table(file).getTableDict(**kwargs)
+            except Exception as error:
+                return type(error)
+
+        testFolder = os.path.join(self.dirname, "Test_Wiki_Table")
+        for folder in sorted(os.listdir(testFolder)):
+            for file in sorted(os.listdir(os.path.join(testFolder, folder))):
+                with self.subTest(tested_file=f"{folder}/{file}"):
+                    file = os.path.join(testFolder, folder, file)
+                    self.assertEqual(outcome(file, where=lambda row: True), outcome(file))
+
+    def test_rowspanCarryOver(self):
+        html = """<table><tr><th>Year</th><th>Album</th><th>Label</th></tr>
+        <tr><td>1991</td><td>Bullhead</td><td rowspan='3'>Boner Records</td></tr>
+        <tr><td rowspan='2'>1992</td><td>Eggnog</td></tr>
+        <tr><td>Lysol</td></tr>
+        <tr><td>1993</td><td>Houdini</td><td>Atlantic</td></tr></table>"""
+        tableObj = Table2Dict.Table(BeautifulSoup(html, "html.parser").table)
+        extracted = []
+        def cellText(cell):
+            extracted.append(cell.text)
+            return Table2Dict.Table.cellText(cell)
+        tableObj.cellText = cellText
+        # Rows holding both rowspans are rejected, rows they carry over to are kept
+        result = tableObj.getTableDict(where=lambda row: row["Album"] in ("Lysol", "Houdini"))
+        self.assertEqual(result, {"Year": ["1992", "1993"], "Album": ["Lysol", "Houdini"], "Label": ["Boner Records", "Atlantic"]})
+        # Only "Album" cells of rejected rows were extracted
+        self.assertEqual(sorted(extracted), sorted(["Bullhead", "Eggnog", "Lysol", "1992", "Boner Records", "Houdini", "1993", "Atlantic"]))
+
+    def test_streamingApis(self):
+        import tempfile
+        from src.Table2Dict import batch, writers
+        file = os.path.join(self.tablesFilesFolder, "debugTable_case7.html")
+        keep = lambda row: row["Year"] >= "1992"
+        expected = Table2Dict.Table(file).getTableDict(where=keep)
+        self.assertLess(len(expected["Year"]), len(Table2Dict.Table(file).getTableDict()["Year"]))
+        self.assertEqual(batch.convertTables([file] * 3, workers=2, where=keep), [expected] * 3)
+        self.assertEqual(json.loads(Table2Dict.Table(file).getTableJson(where=keep)), expected)
+        with tempfile.TemporaryDirectory() as tempDir:
+            path = os.path.join(tempDir, "filtered.jsonl")
+            self.assertEqual(writers.writeTables([file], path, where=keep), len(expected["Year"]))
+            with open(path, encoding="utf-8") as jsonFile:
+                self.assertEqual([json.loads(line)["Year"] for line in jsonFile], expected["Year"])
+
+class test_CostScheduling(unittest.TestCase):
+    '''
+    Test cost-model scheduling of batch conversions (largest first, work stealing).
+    '''
+    def setUp(self):
+        self.dirname = os.path.dirname(__file__)
+        self.tablesFilesFolder = os.path.join(self.dirname, "Test_Wiki_Table/Test_Tables")
+        self.allFiles = [os.path.join(self.tablesFilesFolder, f) for f in sorted(os.listdir(self.tablesFilesFolder))]
+
+    def test_estimateCost(self):
+        from unittest import mock
+        from src.Table2Dict import batch
+        file = os.path.join(self.tablesFilesFolder, "debugTable_case7.html")
+        self.assertEqual(batch.estimateCost(file), os.path.getsize(file) // batch.BYTES_PER_CELL)
+        tableObj = Table2Dict.Table(file)
+        self.assertEqual(batch.estimateCost(tableObj), len(tableObj.allRows) * tableObj.getTableType()["total_columns"])
+        self.assertEqual(batch.estimateCost(tableObj.table), batch.estimateCost(tableObj))
+        # Soup tags are estimated without creating a Table
+        with mock.patch.object(batch.Table, "__init__", side_effect=AssertionError):
+            self.assertEqual(batch.estimateCost(tableObj.table), len(tableObj.allRows) * tableObj.getTableType()["total_columns"])
+        self.assertEqual(batch.estimateCost(BeautifulSoup("<table></table>", "html.parser").table), 0)
+        self.assertEqual(batch.estimateCost(os.path.join(self.dirname, "missing.html")), 0)
+        # Bigger tables cost more
+        small = os.path.join(self.tablesFilesFolder, "debugTable_case0.html")
+        self.assertGreater(batch.estimateCost(file), batch.estimateCost(small))
+
+    def test_largestFirst(self):
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from src.Table2Dict import batch
+        queues, loads = batch.scheduleLargestFirst([1, 1, 8, 1, 1, 1, 1, 2], 2)
+        self.assertEqual([list(queue) for queue in queues], [[2], [7, 0, 1, 3, 4, 5, 6]])
+        self.assertEqual(loads, [8, 8])
+        # Skewed batch : giant table last in input order (sleeps release the GIL, like conversions on free-threaded builds)
+        durations = [0.05] * 12 + [0.3]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            inputOrder = list(pool.map(lambda d: time.sleep(d) or d, durations))
+        inputTime = time.perf_counter() - start
+        start = time.perf_counter()
+        scheduled = batch.runScheduled(lambda d: time.sleep(d) or d, durations, durations, 4)
+        scheduledTime = time.perf_counter() - start
+        self.assertEqual(scheduled, inputOrder)
+        print(f"Skewed batch : input order {inputTime:.3f}s, largest first {scheduledTime:.3f}s")
+        self.assertLess(scheduledTime, inputTime * 0.85)
+
+    def test_workStealing(self):
+        import time
+        from src.Table2Dict import batch
+        # Estimates are wrong : first item is much slower than expected, its queue is drained by the other worker
+        durations = [0.4] + [0.05] * 7
+        start = time.perf_counter()
+        results = batch.runScheduled(lambda d: time.sleep(d) or d, durations, [1] * 8, 2)
+        elapsed = time.perf_counter() - start
+        self.assertEqual(results, durations)
+        self.assertLess(elapsed, 0.5)
+        # First error is raised and stops scheduling
+        def failing(item):
+            if item == 3:
+                raise ValueError("Failed")
+            return item
+        self.assertRaises(ValueError, batch.runScheduled, failing, list(range(6)), [1] * 6, 2)
+
+    def test_convertTables(self):
+        from src.Table2Dict import batch
+        sources = self.allFiles + [Table2Dict.Table(file) for file in self.allFiles]
+        expected = [Table2Dict.Table(file).getTableDict() for file in self.allFiles] * 2
+        self.assertEqual(batch.convertTables(sources, workers=3, schedule="cost"), expected)
+        self.assertEqual(batch.convertTables(sources, workers=3, schedule="input"), expected)
+        self.assertRaises(ValueError, batch.convertTables, sources, schedule="random")
+
+class test_HeaderMemo(unittest.TestCase):
+    '''
+    Test process-wide header memo (tables sharing header markup).
+    '''
+    def setUp(self):
+        from src.Table2Dict import headerMemo
+        self.memo = headerMemo
+        self.memo.configureHeaderMemo(enabled=True, maxSize=self.memo.DEFAULT_MAX_SIZE)
+        self.memo.clearHeaderMemo()
+        self.dirname = os.path.dirname(__file__)
+        self.tablesFilesFolder = os.path.join(self.dirname, "Test_Wiki_Table/Test_Tables")
+        self.allFiles = [os.path.join(self.tablesFilesFolder, f) for f in sorted(os.listdir(self.tablesFilesFolder))]
+
+    def tearDown(self):
+        self.memo.configureHeaderMemo(enabled=True, maxSize=self.memo.DEFAULT_MAX_SIZE)
+        self.memo.clearHeaderMemo()
+
+    def test_sharedHeaders(self):
+        self.memo.configureHeaderMemo(enabled=False)
+        expected = [(Table2Dict.Table(file).getTableHeader(), Table2Dict.Table(file).getTableDict()) for file in self.allFiles]
+        self.assertEqual(self.memo.headerMemoStats()["hits"] + self.memo.headerMemoStats()["misses"], 0)
+        self.memo.configureHeaderMemo(enabled=True)
+        for _ in range(3):
+            for file, (header, tableDict) in zip(self.allFiles, expected):
+                with self.subTest(tested_file=file):
+                    tableObj = Table2Dict.Table(file)
+                    self.assertEqual(tableObj.getTableHeader(), header)
+                    self.assertEqual(tableObj.getTableDict(), tableDict)
+                    self.assertEqual(tableObj.getTableDict(dictType="ordered"), tableDict)
+        stats = self.memo.headerMemoStats()
+        distinctHeaders = stats["size"]
+        self.assertLessEqual(distinctHeaders, len(self.allFiles))
+        self.assertEqual(stats["misses"], distinctHeaders)
+        self.assertEqual(stats["hits"], 3 * len(self.allFiles) - distinctHeaders)
+        self.assertAlmostEqual(stats["hitRate"], stats["hits"] / (3 * len(self.allFiles)))
+
+    def test_templateTables(self):
+        # Same header, different bodies : header is resolved once
+        header = "<tr><th rowspan='2'>Year</th><th colspan='2'>Album</th></tr><tr><th>Title</th><th>Label</th></tr>"
+        tables = [f"<table>{header}<tr><td>{1990 + i}</td><td>Album {i}</td><td>Label {i}</td></tr></table>" for i in range(5)]
+        results = [Table2Dict.Table(BeautifulSoup(html, "html.parser").table).getTableDict() for html in tables]
+        self.assertEqual(results[3], {"Year": ["1993"], "Album (Title)": ["Album 3"], "Album (Label)": ["Label 3"]})
+        self.assertEqual(self.memo.headerMemoStats()["hits"], 4)
+        # Span caps are part of memo key
+        capped = Table2Dict.Table(BeautifulSoup(tables[0], "html.parser").table, maxRowspan=1)
+        self.assertEqual(capped.getTableHeader()[0], ["Year", "Title"])
+        self.assertEqual(self.memo.headerMemoStats()["misses"], 2)
+
+    def test_lruBound(self):
+        self.memo.configureHeaderMemo(maxSize=2)
+        tables = [f"<table><tr><th>Key {i}</th></tr><tr><td>{i}</td></tr></table>" for i in range(4)]
+        newTable = lambda i: Table2Dict.Table(BeautifulSoup(tables[i], "html.parser").table)
+        for i in range(4):
+            newTable(i).getTableHeader()
+        self.assertEqual(self.memo.headerMemoStats()["size"], 2)
+        # Most recent headers are kept, oldest were dropped
+        self.assertEqual(newTable(3).getTableDict(), {"Key 3": ["3"]})
+        self.assertEqual(self.memo.headerMemoStats()["hits"], 1)
+        newTable(0).getTableHeader()
+        self.assertEqual(self.memo.headerMemoStats()["hits"], 1)
+
+    def test_headerLengthInKey(self):
+        # Same first row, but one table has a header row and the other has none
+        withHeader = "<table><tr><td>x</td><td>y</td></tr><tr><th>a</th><th>b</th></tr><tr><td>c</td><td>d</td></tr></table>"
+        withoutHeader = "<table><tr><td>x</td><td>y</td></tr><tr><td>c</td><td>d</td></tr></table>"
+        newTable = lambda html: Table2Dict.Table(BeautifulSoup(html, "html.parser").table)
+
+        def convert(html):
+            try:
+                return newTable(html).getTableDict()
+            except Exception as error:
+                return type(error)
+
+        self.memo.configureHeaderMemo(enabled=False)
+        expected = {html: convert(html) for html in (withHeader, withoutHeader)}
+        self.memo.configureHeaderMemo(enabled=True)
+        for order in ((withHeader, withoutHeader), (withoutHeader, withHeader)):
+            self.memo.clearHeaderMemo()
+            for html in order:
+                with self.subTest(html=html, first=order[0]):
+                    self.assertEqual(convert(html), expected[html])
+
+    def test_disabledByEnvironment(self):
+        import subprocess
+        script = (
+            f"import sys, json; sys.path.insert(0, {parentdir!r})\n"
+            "from src.Table2Dict import Table2Dict, headerMemo\n"
+            f"Table2Dict.Table({self.allFiles[0]!r}).getTableDict()\n"
+            "print(json.dumps(headerMemo.headerMemoStats()))"
+        )
+        env = dict(os.environ, TABLE2DICT_HEADER_MEMO="0")
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True, env=env)
+        stats = json.loads(output.stdout)
+        self.assertFalse(stats["enabled"])
+        self.assertEqual((stats["size"], stats["misses"]), (0, 0))
+
+class test_ParallelTable(unittest.TestCase):
+    '''
+    Test intra-table parallel body resolution (chunks laid out by threads, rowspans stitched across chunks).
+    '''
+    def setUp(self):
+        self.dirname = os.path.dirname(__file__)
+        self.tablesFilesFolder = os.path.join(self.dirname, "Test_Wiki_Table/Test_Tables")
+        self.allFiles = [os.path.join(self.tablesFilesFolder, f) for f in sorted(os.listdir(self.tablesFilesFolder))]
+
+    def assertSameBody(self, html):
+        from src.Table2Dict import parallel
+        expected = Table2Dict.Table(BeautifulSoup(html, "html.parser").table).getTableBody()
+        for chunkSize in (1, 2, 3, 5):
+            with self.subTest(chunkSize=chunkSize):
+                tableObj = Table2Dict.Table(BeautifulSoup(html, "html.parser").table)
+                self.assertEqual(parallel.parallelTableBody(tableObj, 3, chunkSize), expected)
+
+    def test_corpus(self):
+        from src.Table2Dict import parallel
+        for file in self.allFiles:
+            with self.subTest(tested_file=file):
+                expected = Table2Dict.Table(file).getTableBody()
+                for chunkSize in (1, 2, 7):
+                    self.assertEqual(parallel.parallelTableBody(Table2Dict.Table(file), 4, chunkSize), expected)
+
+    def test_crossingRowspans(self):
+        # Rowspans crossing chunk boundaries, short rows, dropped cells & spans past last row
+        cases = [
+            "<tr><td rowspan='4'>1</td><td>2</td></tr><tr><td>3</td></tr><tr><td>4</td></tr><tr><td>5</td></tr><tr><td>6</td><td>7</td></tr>",
+            "<tr><td>1</td><td>2</td></tr><tr><td>3</td></tr><tr><td>5</td><td>6</td></tr><tr><td>7</td><td>8</td></tr><tr><td>9</td></tr>",
+            "<tr><td>1</td><td rowspan='6'>2</td></tr><tr><td>3</td><td>4</td></tr><tr><td>5</td></tr><tr><td rowspan='2'>6</td></tr><tr><td>7</td></tr>",
+            "<tr><td>1</td><td>2</td></tr><tr><td>3</td><td>4</td><td>5</td></tr><tr><td rowspan='3'>6</td><td rowspan='2'>7</td></tr><tr></tr><tr><td>8</td></tr><tr><td>9</td><td>10</td></tr>",
+        ]
+        for rows in cases:
+            self.assertSameBody(f"<table><tr><th>A</th><th>B</th></tr>{rows}</table>")
+        # 2D table (row titles in first column)
+        self.assertSameBody(
+            "<table><tr><th></th><th>A</th><th>B</th></tr><tr><th>X</th><td rowspan='3'>1</td><td>2</td></tr>"
+            "<tr><th>Y</th><td>3</td></tr><tr><th>Z</th><td>4</td></tr><tr><th>W</th><td>5</td><td>6</td></tr></table>"
+        )
+
+    def test_workers(self):
+        from src.Table2Dict import parallel
+        cells = "".join(
+            f"<tr><td rowspan='3'>{i}</td><td>Album {i}</td><td>Label</td></tr><tr><td>B {i}</td><td>C {i}</td></tr><tr><td>D {i}</td><td>E {i}</td></tr>"
+            for i in range(parallel.PARALLEL_MIN_ROWS // 3 + 1)
+        )
+        html = f"<table><tr><th>Year</th><th>Album</th><th>Label</th></tr>{cells}</table>"
+        sequential = Table2Dict.Table(BeautifulSoup(html, "html.parser").table)
+        threaded = Table2Dict.Table(BeautifulSoup(html, "html.parser").table, workers=4)
+        self.assertEqual(threaded.getTableList(), sequential.getTableList())
+        self.assertEqual(threaded.getTableDict(), sequential.getTableDict())
+        self.assertEqual(threaded.getTableJson(), sequential.getTableJson())
+
+    def test_scaling(self):
+        import time
+        from unittest import mock
+        from src.Table2Dict import parallel
+        cells = "".join(
+            f"<tr><td rowspan='2'>{i}</td><td>Album {i}</td><td>Label {i}</td></tr><tr><td>B {i}</td><td>C {i}</td></tr>"
+            for i in range(parallel.PARALLEL_MIN_ROWS * 2)
+        )
+        html = f"<table><tr><th>Year</th><th>Album</th><th>Label</th></tr>{cells}</table>"
+        newTable = lambda workers=None: Table2Dict.Table(BeautifulSoup(html, "html.parser").table, workers=workers)
+        sequential = newTable()
+        start = time.perf_counter()
+        expected = sequential.getTableBody()
+        sequentialTime = time.perf_counter() - start
+        if parallel.isFreeThreaded() and (os.cpu_count() or 1) >= 4:
+            threaded = newTable(4)
+            start = time.perf_counter()
+            self.assertEqual(threaded.getTableBody(), expected)
+            threadedTime = time.perf_counter() - start
+            print(f"Body of {len(expected[0])} rows : sequential {sequentialTime:.3f}s, 4 threads {threadedTime:.3f}s")
+            self.assertGreater(sequentialTime / threadedTime, 1.3)
+        else:
+            # With the GIL, threads would only add chunking & stitching : body is resolved sequentially
+            with mock.patch.object(parallel, "parallelTableBody", side_effect=AssertionError("Parallel path used")):
+                self.assertEqual(newTable(4).getTableBody(), expected)
+
+class test_Service(unittest.TestCase):
+    '''
+    Test local conversion service (warm worker processes behind HTTP or a Unix socket).
+    '''
+    @classmethod
+    def setUpClass(cls):
+        import tempfile
+        from src.Table2Dict import service
+        cls.tempDir = tempfile.mkdtemp()
+        cls.service = service.ConversionService(port=0, workers=2).start()
+        cls.client = service.ServiceClient(*cls.service.address)
+        cls.tablesFilesFolder = os.path.join(os.path.dirname(__file__), "Test_Wiki_Table/Test_Tables")
+        cls.allFiles = [os.path.join(cls.tablesFilesFolder, f) for f in sorted(os.listdir(cls.tablesFilesFolder))]
+
+    @classmethod
+    def tearDownClass(cls):
+        import shutil
+        cls.client.close()
+        cls.service.close()
+        shutil.rmtree(cls.tempDir)
+
+    def test_outputs(self):
+        from src.Table2Dict import binaryFormat
+        file = os.path.join(self.tablesFilesFolder, "debugTable_case7.html")
+        tableObj = Table2Dict.Table(file)
+        with open(file) as htmlFile:
+            html = htmlFile.read()
+        self.assertEqual(self.client.convert(html=html), json.loads(json.dumps(tableObj.getTableDict())))
+        self.assertEqual(self.client.convert(path=file, output="list"), tableObj.getTableList())
+        self.assertEqual(self.client.convert(path=file, output="json"), json.loads(tableObj.getTableJson()))
+        binary = binaryFormat.loads(self.client.convert(html=html, output="binary"))
+        self.assertEqual(binary.getTableList(), tableObj.getTableList())
+        with self.assertRaisesRegex(ValueError, "No table found"):
+            self.client.convert(html="<p>No table</p>")
+        with self.assertRaisesRegex(ValueError, "not a valid output"):
+            self.client.convert(path=file, output="xml")
+
+    def test_pipelined(self):
+        requests = [{"path": file} for file in self.allFiles] + [{"path": "/missing.html"}, {"path": self.allFiles[0], "output": "binary"}]
+        results = self.client.convertMany(requests)
+        for file, result in zip(self.allFiles, results):
+            with self.subTest(tested_file=file):
+                self.assertEqual(result, json.loads(json.dumps(Table2Dict.Table(file).getTableDict())))
+        self.assertIsInstance(results[-2], ValueError)
+        self.assertIsInstance(results[-1], bytes)
+        # Requests can be any iterable
+        results = self.client.convertMany({"path": file, "output": "list"} for file in self.allFiles[:2])
+        self.assertEqual(results, [Table2Dict.Table(file).getTableList() for file in self.allFiles[:2]])
+
+    def test_stats(self):
+        before = self.client.stats()
+        self.client.convertMany([{"path": self.allFiles[0]}] * 5 + [{}])
+        stats = self.client.stats()
+        self.assertEqual(stats["conversions"] - before["conversions"], 6)
+        self.assertEqual(stats["errors"] - before["errors"], 1)
+        self.assertEqual((stats["inFlight"], stats["workers"]), (0, 2))
+        self.assertGreater(stats["throughput"], 0)
+        latency = stats["latency"]
+        self.assertTrue(0 < latency["p50"] <= latency["p95"] <= latency["p99"] <= latency["max"])
+
+    def test_unixSocket(self):
+        from src.Table2Dict import service
+        socketPath = os.path.join(self.tempDir, "service.sock")
+        with service.ConversionService(socketPath=socketPath, workers=1).start():
+            with service.ServiceClient(socketPath=socketPath) as client:
+                file = self.allFiles[0]
+                self.assertEqual(client.convert(path=file, output="list"), Table2Dict.Table(file).getTableList())
+                self.assertEqual(client.stats()["conversions"], 1)
+        self.assertFalse(os.path.exists(socketPath))
+
+    def test_brokenPool(self):
+        from concurrent.futures.process import BrokenProcessPool
+        from src.Table2Dict import service
+        file = self.allFiles[0]
+        with service.ConversionService(port=0, workers=1).start() as conversionService:
+            with service.ServiceClient(*conversionService.address) as client:
+                # Kill the only worker, pool is broken
+                with self.assertRaises(BrokenProcessPool):
+                    conversionService.pool.submit(os._exit, 1).result()
+                self.assertEqual(client.convert(path=file, output="list"), Table2Dict.Table(file).getTableList())
+                self.assertEqual(client.convertMany([{"path": file}] * 3), [client.convert(path=file)] * 3)
+
+    def test_remotePaths(self):
+        from src.Table2Dict import service
+        file = self.allFiles[0]
+        with open(file) as htmlFile:
+            html = htmlFile.read()
+        with service.ConversionService(host="0.0.0.0", port=0, workers=1).start() as conversionService:
+            self.assertFalse(conversionService.allowPaths)
+            with service.ServiceClient(port=conversionService.address[1]) as client:
+                with self.assertRaisesRegex(ValueError, "PermissionError"):
+                    client.convert(path=file)
+                results = client.convertMany([{"path": file}, {"html": html, "output": "list"}])
+                self.assertIsInstance(results[0], ValueError)
+                self.assertEqual(results[1], Table2Dict.Table(file).getTableList())
+        self.assertTrue(self.service.allowPaths)
+
+class test_Watchdog(unittest.TestCase):
+    '''
+    Test capture of slow conversions & report of captured tables.
+    '''
+    def setUp(self):
+        import tempfile
+        self.captureDir = tempfile.mkdtemp()
+        self.tablesFilesFolder = os.path.join(os.path.dirname(__file__), "Test_Wiki_Table/Test_Tables")
+
+    def tearDown(self):
+        import shutil
+        from src.Table2Dict import watchdog
+        watchdog.configureWatchdog(None)
+        shutil.rmtree(self.captureDir)
+
+    def test_capture(self):
+        from src.Table2Dict import watchdog
+        file = os.path.join(self.tablesFilesFolder, "debugTable_case7.html")
+        # Fast conversions aren't captured
+        watchdog.configureWatchdog(self.captureDir, maxSeconds=60)
+        Table2Dict.Table(file).getTableDict()
+        self.assertEqual(os.listdir(self.captureDir), [])
+        # Every conversion is "too long"
+        watchdog.configureWatchdog(self.captureDir, maxSeconds=0)
+        tableObj = Table2Dict.Table(file)
+        expected = tableObj.getTableDict()
+        self.assertEqual(watchdog.watchdog.captured, 1)
+        (info,) = watchdog.captureReport(self.captureDir)
+        self.assertEqual(info["method"], "getTableDict")
+        self.assertTrue({"getTableDict", "getTableHeader", "getTableBody", "getTableType"} <= set(info["stages"]))
+        self.assertLessEqual(info["stages"]["getTableBody"], info["elapsed"])
+        self.assertEqual(info["cells"], len(tableObj.allRows) * tableObj.getTableType()["total_columns"])
+        self.assertGreaterEqual(info["spans"]["spannedCells"], info["spans"]["cells"])
+        # Captured html reproduces table
+        self.assertEqual(Table2Dict.Table(info["path"]).getTableDict(), expected)
+
+    def test_checkNotTimed(self):
+        import time
+        from functools import wraps
+        from unittest import mock
+        from src.Table2Dict import watchdog
+        getTableType = Table2Dict.Table.getTableType.__wrapped__
+        @wraps(getTableType)
+        def slowTableType(table):
+            time.sleep(0.2)
+            return getTableType(table)
+        watchdog.configureWatchdog(self.captureDir, maxSeconds=0)
+        with mock.patch.object(Table2Dict.Table, "getTableType", watchdog.watched(slowTableType)):
+            Table2Dict.Table(os.path.join(self.tablesFilesFolder, "debugTable_case7.html")).getTableDict()
+        # Call made by capture check isn't counted in stages of conversion
+        (info,) = watchdog.captureReport(self.captureDir)
+        self.assertLessEqual(info["stages"]["getTableType"], info["elapsed"])
+
+    def test_cellsPerSecondFloor(self):
+        from src.Table2Dict import watchdog
+        rows = "".join(f"<tr><td rowspan='2'>{i}</td><td>{i}</td></tr><tr><td>x</td></tr>" for i in range(400))
+        html = f"<table><tr><th>A</th><th>B</th></tr>{rows}</table>"
+        watchdog.configureWatchdog(self.captureDir, maxSeconds=None, minCellsPerSecond=1e12)
+        tableObj = Table2Dict.Table(BeautifulSoup(html, "html.parser").table)
+        original = watchdog.MIN_RATE_SECONDS
+        watchdog.MIN_RATE_SECONDS = 0
+        try:
+            tableObj.getTableList()
+        finally:
+            watchdog.MIN_RATE_SECONDS = original
+        (info,) = watchdog.captureReport(self.captureDir)
+        self.assertEqual(info["method"], "getTableList")
+        self.assertEqual((info["spans"]["rowspans"], info["spans"]["maxRowspan"]), (400, 2))
+
+    def test_report(self):
+        import subprocess
+        from src.Table2Dict import watchdog
+        watchdog.configureWatchdog(self.captureDir, maxSeconds=0)
+        files = ["debugTable_case0.html", "debugTable_case7.html"]
+        for file in files:
+            Table2Dict.Table(os.path.join(self.tablesFilesFolder, file)).getTableList()
+        captures = watchdog.captureReport(self.captureDir)
+        self.assertEqual(len(captures), 2)
+        self.assertGreaterEqual(captures[0]["elapsed"], captures[1]["elapsed"])
+        self.assertEqual(len(watchdog.captureReport(self.captureDir, top=1)), 1)
+        output = subprocess.run(
+            [sys.executable, "-m", "Table2Dict", "report", self.captureDir, "--top", "1"],
+            cwd=os.path.join(parentdir, "src"), capture_output=True, text=True, check=True,
+        ).stdout
+        self.assertEqual(len(output.splitlines()), 2)
+        self.assertIn(captures[0]["path"], output)
+
+class test_Wikitext(unittest.TestCase):
+    '''
+    Test tables parsed straight from MediaWiki wikitext (same results as rendered html).
+    '''
+    def setUp(self):
+        self.dirname = os.path.dirname(__file__)
+        self.tablesFilesFolder = os.path.join(self.dirname, "Test_Wiki_Table/Test_Tables")
+        self.allFiles = [os.path.join(self.tablesFilesFolder, f) for f in sorted(os.listdir(self.tablesFilesFolder))]
+
+    @staticmethod
+    def toWikitext(tableObj):
+        # Wikitext equivalent of an html table (one cell per line, spans as attributes)
+        lines = ['{| class="wikitable"']
+        for row in tableObj.allRows:
+            lines.append("|-")
+            for cell in tableObj.removeNewLines(row.contents):
+                marker = "!" if cell.name == "th" else "|"
+                spans = "".join(f'{span}="{cell.get(span)}" ' for span in ("rowspan", "colspan") if cell.get(span) != None)
+                lines.append(f"{marker} {spans}| {tableObj.cellText(cell)}" if spans else f"{marker} {tableObj.cellText(cell)}")
+        lines.append("|}")
+        return "\n".join(lines)
+
+    def assertSameTable(self, wikiObj, htmlObj):
+        for method in ("getTableType", "getTableHeader", "getTableBody", "getTableDict", "getTableList"):
+            try:
+                expected = getattr(htmlObj, method)()
+            except Exception as error:
+                with self.assertRaises(type(error)):
+                    getattr(wikiObj, method)()
+                continue
+            self.assertEqual(getattr(wikiObj, method)(), expected, method)
+
+    def test_corpus(self):
+        for file in self.allFiles:
+            with self.subTest(tested_file=file):
+                htmlObj = Table2Dict.Table(file)
+                wikiObj = Table2Dict.Table.fromWikitext("Intro text\n" + self.toWikitext(htmlObj) + "\nOutro")
+                self.assertSameTable(wikiObj, htmlObj)
+
+    def test_markup(self):
+        wikitext = "\n".join([
+            '{| class="wikitable sortable"',
+            "|+ Albums <ref>Source</ref>",
+            '! Year !! Album !! colspan="2" | Charts',
+            "|-",
+            '! scope="row" rowspan="2" | [[1991 in music|1991]]',
+            "| ''[[Bullhead (album)|Bullhead]]'' || rowspan=2 | '''[[Boner Records]]'''{{efn|Reissued}} || 12",
+            "|-",
+            "| Eggnog<!-- EP --> || [[Oz]]",
+            "|-",
+            "! 1993",
+            "| Houdini",
+            "multi-line",
+            "| [http://example.com Atlantic] || 7&nbsp;%",
+            "|}",
+        ])
+        html = (
+            '<table><caption>Albums</caption><tr><th>Year</th><th>Album</th><th colspan="2">Charts</th></tr>'
+            '<tr><th scope="row" rowspan="2">1991</th><td><i>Bullhead</i></td><td rowspan="2"><b>Boner Records</b></td><td>12</td></tr>'
+            "<tr><td>Eggnog</td><td>Oz</td></tr>"
+            "<tr><th>1993</th><td>Houdini\nmulti-line</td><td>Atlantic</td><td>7&nbsp;%</td></tr></table>"
+        )
+        wikiObj = Table2Dict.Table.fromWikitext(wikitext)
+        self.assertEqual(wikiObj.table.caption, "Albums")
+        self.assertEqual(wikiObj.getTableType()["dimensions"], "2D")
+        self.assertSameTable(wikiObj, Table2Dict.Table(BeautifulSoup(html, "html.parser").table))
+        # Html equivalent of wikitext table gives same table
+        self.assertSameTable(wikiObj, Table2Dict.Table(BeautifulSoup(str(wikiObj.table), "html.parser").table))
+
+    def test_pages(self):
+        from src.Table2Dict import wikitext
+        page = "\n".join(["Text", "{|", "! A !! B", "|-", "| 1 ||", "{|", "| nested || table", "|}", "|}", "{|", "! C", "|-", "| [[X|x]] | 2", "|}"])
+        tables = wikitext.parseWikitext(page)
+        self.assertEqual(len(tables), 2)
+        self.assertEqual(Table2Dict.Table(tables[0]).getTableDict(), {"A": ["1"], "B": ["nestedtable"]})
+        # Pipe inside a link isn't an attributes separator
+        self.assertEqual(Table2Dict.Table.fromWikitext(page, index=1).getTableDict(), {"C": ["2"]})
+        with self.assertRaises(ValueError):
+            Table2Dict.Table.fromWikitext(page, index=2)
+        # No html parsing involved
+        self.assertIsInstance(tables[0].find_all("tr")[0].contents[0], wikitext.WikiCell)
+
+class test_ArchiveSources(unittest.TestCase):
+    '''
+    Test tables streamed out of compressed files & archives (pipelined decompression).
+    '''
+    def setUp(self):
+        import tempfile
+        self.tempDir = tempfile.mkdtemp()
+        self.tablesFilesFolder = os.path.join(os.path.dirname(__file__), "Test_Wiki_Table/Test_Tables")
+        self.allFiles = [os.path.join(self.tablesFilesFolder, f) for f in sorted(os.listdir(self.tablesFilesFolder))]
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tempDir)
+
+    def expected(self, files):
+        return [Table2Dict.Table(file).getTableList() for file in files]
+
+    def test_compressedPages(self):
+        import gzip, bz2, lzma
+        from src.Table2Dict import sources
+        paths = []
+        for file, opener, extension in zip(self.allFiles, (gzip.open, bz2.open, lzma.open, open), (".gz", ".bz2", ".xz", "")):
+            path = os.path.join(self.tempDir, os.path.basename(file) + extension)
+            with open(file, "rb") as source, opener(path, "wb") as target:
+                target.write(source.read())
+            paths.append(path)
+        tables = list(sources.archiveTables(paths))
+        self.assertEqual([name for name, tableObj in tables], paths)
+        self.assertEqual([tableObj.getTableList() for name, tableObj in tables], self.expected(self.allFiles[:4]))
+
+    def test_tarArchives(self):
+        import io
+        import tarfile
+        from src.Table2Dict import sources
+        paths = []
+        for mode, extension in (("w:gz", ".tar.gz"), ("w:bz2", ".tar.bz2"), ("w", ".tar")):
+            path = os.path.join(self.tempDir, "pages" + extension)
+            with tarfile.open(path, mode) as archive:
+                for file in self.allFiles:
+                    archive.add(file, arcname=os.path.basename(file))
+                info = tarfile.TarInfo("notes.txt")
+                info.size = 5
+                archive.addfile(info, io.BytesIO(b"notes"))
+            paths.append(path)
+        with sources.ArchiveSource(paths, queueSize=2) as source:
+            tables = list(source)
+        self.assertEqual([tableObj.getTableList() for name, tableObj in tables], self.expected(self.allFiles) * 3)
+        self.assertEqual(tables[0][0], f"{paths[0]}/{os.path.basename(self.allFiles[0])}")
+        self.assertEqual(len(source.skipped), 3)
+        stats = source.getStats()
+        size = sum(os.path.getsize(file) for file in self.allFiles) + 5
+        self.assertEqual((stats["decompress"]["items"], stats["decompress"]["bytes"]), (3 * (len(self.allFiles) + 1), 3 * size))
+        self.assertEqual(stats["parse"]["bytes"], 3 * size)
+        self.assertGreater(stats["parse"]["bytesPerSecond"], 0)
+
+    def test_earlyStop(self):
+        import gzip
+        from src.Table2Dict import sources
+        paths = []
+        for index in range(20):
+            path = os.path.join(self.tempDir, f"page{index}.html.gz")
+            with open(self.allFiles[0], "rb") as source, gzip.open(path, "wb") as target:
+                target.write(source.read())
+            paths.append(path)
+        source = sources.ArchiveSource(paths, queueSize=1)
+        for name, tableObj in source:
+            break
+        # Decompression thread stopped, not blocked on full queue
+        self.assertIsNone(source.thread)
+        self.assertLess(source.getStats()["decompress"]["items"], 20)
+        # Errors of decompression thread are raised while iterating
+        with open(os.path.join(self.tempDir, "broken.gz"), "wb") as broken:
+            broken.write(b"not gzip")
+        with self.assertRaises(OSError):
+            list(sources.archiveTables([paths[0], os.path.join(self.tempDir, "broken.gz")]))
+
+    def test_iterateAgain(self):
+        import gzip
+        import threading
+        from src.Table2Dict import sources
+        path = os.path.join(self.tempDir, "page.html.gz")
+        with open(self.allFiles[0], "rb") as source, gzip.open(path, "wb") as target:
+            target.write(source.read())
+        source = sources.ArchiveSource([path] * 3, queueSize=1)
+        results = []
+
+        def iterate():
+            for name, tableObj in source:
+                break
+            results.append([tableObj.getTableList() for name, tableObj in source])
+            results.append([name for name, tableObj in source])
+
+        # Iterations are run in a thread, a hang fails test instead of blocking suite
+        thread = threading.Thread(target=iterate, daemon=True)
+        thread.start()
+        thread.join(timeout=30)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(results, [self.expected(self.allFiles[:1]) * 3, [path] * 3])
+
+    def test_zstd(self):
+        from src.Table2Dict import sources
+        try:
+            import zstandard
+        except ImportError:
+            self.skipTest("zstandard isn't installed")
+        path = os.path.join(self.tempDir, "page.html.zst")
+        with open(self.allFiles[0], "rb") as source, open(path, "wb") as target:
+            target.write(zstandard.ZstdCompressor().compress(source.read()))
+        self.assertEqual([tableObj.getTableList() for name, tableObj in sources.archiveTables(path)], self.expected(self.allFiles[:1]))
+
+class test_MemoryBudget(unittest.TestCase):
+    '''
+    Test memory budget of conversions (oversized table bodies spilled to disk).
+    '''
+    def setUp(self):
+        from src.Table2Dict import spill
+        self.dirname = os.path.dirname(__file__)
+        self.tablesFilesFolder = os.path.join(self.dirname, "Test_Wiki_Table/Test_Tables")
+        self.allFiles = [os.path.join(self.tablesFilesFolder, f) for f in sorted(os.listdir(self.tablesFilesFolder))]
+        self.chunkRuns = spill.CHUNK_RUNS
+
+    def tearDown(self):
+        from src.Table2Dict import spill
+        spill.CHUNK_RUNS = self.chunkRuns
+
+    def test_sameResults(self):
+        from src.Table2Dict import spill
+        # Tiny chunks, so that columns span many chunks
+        spill.CHUNK_RUNS = 2
+        for file in self.allFiles:
+            with self.subTest(tested_file=file):
+                expected = Table2Dict.Table(file)
+                try:
+                    expectedBody = expected.getTableBody()
+                except Exception as error:
+                    with self.assertRaises(type(error)):
+                        Table2Dict.Table(file, memoryBudget=0).getTableBody()
+                    continue
+                tableObj = Table2Dict.Table(file, memoryBudget=0)
+                body = tableObj.getTableBody()
+                self.assertTrue(all(isinstance(column, spill.SpilledColumn) for column in body))
+                self.assertEqual(body, expectedBody)
+                self.assertEqual([column[::-1] for column in body], [column[::-1] for column in expectedBody])
+                for method in ("getTableList", "getTableDict", "getTableJson", "getTableRecords"):
+                    try:
+                        result = getattr(expected, method)()
+                    except Exception as error:
+                        with self.assertRaises(type(error)):
+                            getattr(tableObj, method)()
+                        continue
+                    self.assertEqual(getattr(tableObj, method)(), result)
+                stats = tableObj.getMemoryStats()
+                self.assertTrue(stats["spilled"])
+                self.assertGreater(stats["chunks"], 0)
+                self.assertGreater(stats["peakRss"], 0)
+        # Under budget, nothing is spilled
+        tableObj = Table2Dict.Table(self.allFiles[0], memoryBudget=10**9)
+        self.assertIsInstance(tableObj.getTableBody()[0], list)
+        self.assertFalse(tableObj.getMemoryStats()["spilled"])
+
+    def test_hugeSpans(self):
+        import tracemalloc
+        # Spans past last row expand to 60000 cells per column
+        html = "<table><tr><th>A</th><th>B</th><th>C</th></tr>" + "<tr><td rowspan='60000'>a</td><td rowspan='60000'>b</td><td rowspan='60000'>c</td></tr>" + "<tr><td>dropped</td></tr>" * 10 + "</table>"
+        peaks = []
+        for budget in (None, 1024 * 1024):
+            tableObj = Table2Dict.Table(BeautifulSoup(html, "html.parser").table, memoryBudget=budget)
+            tracemalloc.start()
+            tableDict = tableObj.getTableDict()
+            self.assertEqual(len(tableDict["B"]), 60000)
+            self.assertEqual(tableDict["C"][59999], "c")
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        self.assertLess(peaks[1], peaks[0] / 20)
+
+    def test_parseSize(self):
+        from src.Table2Dict import spill
+        self.assertEqual([spill.parseSize(size) for size in ("512", "2K", "1.5M", "2G", "64mb", None)], [512, 2048, 1572864, 2 * 1024**3, 64 * 1024**2, None])
+
+class test_Pipeline(unittest.TestCase):
+    '''
+    Test staged pipeline (bounded queues between stages, per-stage parallelism & metrics).
+    '''
+    def setUp(self):
+        import tempfile
+        self.tempDir = tempfile.mkdtemp()
+        self.tablesFilesFolder = os.path.join(os.path.dirname(__file__), "Test_Wiki_Table/Test_Tables")
+        self.allFiles = [os.path.join(self.tablesFilesFolder, f) for f in sorted(os.listdir(self.tablesFilesFolder))]
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tempDir)
+
+    def test_tablePipeline(self):
+        from src.Table2Dict import pipeline
+        output = os.path.join(self.tempDir, "tables.jsonl")
+        sources = self.allFiles * 3 + [b"<p>No table</p>"]
+        with pipeline.tablePipeline(output=output, workers={"parse": 3, "resolve": 2, "extract": 2}, queueSize=2) as tablePipeline:
+            results = list(tablePipeline.run(sources))
+            # Output file is closed as soon as run is over
+            self.assertIsNone(tablePipeline.sink.file)
+        expected = [(file, Table2Dict.Table(file).getTableDict()) for file in self.allFiles * 3]
+        self.assertEqual(results, expected)
+        stats = tablePipeline.getStats()
+        self.assertEqual(list(stats), list(pipeline.TABLE_STAGES))
+        self.assertEqual([stats[name]["items"] for name in ("read", "parse", "locate", "resolve")], [len(sources)] * 3 + [len(expected)])
+        self.assertTrue(all(stage["itemsPerSecond"] > 0 for stage in stats.values()))
+        with open(output) as jsonLines:
+            lines = [json.loads(line) for line in jsonLines]
+        self.assertEqual(sorted((line["source"], json.dumps(line["result"])) for line in lines), sorted((file, json.dumps(result)) for file, result in expected))
+
+    def test_sameAsGetters(self):
+        from src.Table2Dict import pipeline
+        for method in ("getTableList", "getTableJson", "getTableBody"):
+            with self.subTest(method=method):
+                results = dict(pipeline.tablePipeline(method, workers={"extract": 2}).run(self.allFiles[:8]))
+                for file in self.allFiles[:8]:
+                    self.assertEqual(results[file], getattr(Table2Dict.Table(file), method)())
+        encoded = list(pipeline.tablePipeline(encode=True, ordered=False).run(self.allFiles[:3]))
+        self.assertEqual(sorted(encoded), sorted((file, json.dumps(Table2Dict.Table(file).getTableDict())) for file in self.allFiles[:3]))
+        with self.assertRaises(ValueError):
+            pipeline.tablePipeline(workers={"unknown": 2})
+
+    def test_errors(self):
+        from src.Table2Dict import pipeline
+        with self.assertRaises(FileNotFoundError):
+            list(pipeline.tablePipeline().run(self.allFiles[:2] + ["/missing.html"] + self.allFiles))
+
+    def test_backpressure(self):
+        import time
+        from src.Table2Dict import pipeline
+        counts = {"fast": 0, "slow": 0, "ahead": 0}
+        def fast(item):
+            counts["fast"] += 1
+            counts["ahead"] = max(counts["ahead"], counts["fast"] - counts["slow"])
+            return item
+        def slow(item):
+            counts["slow"] += 1
+            time.sleep(0.005)
+            return item * 2
+        stages = [pipeline.Stage("fast", fast, queueSize=1), pipeline.Stage("slow", slow, queueSize=1)]
+        flow = pipeline.Pipeline(stages)
+        self.assertEqual(list(flow.run(range(50))), [item * 2 for item in range(50)])
+        # Fast stage never runs far ahead of slow one (bounded queues)
+        self.assertLessEqual(counts["ahead"], 4)
+        self.assertGreater(flow.getStats()["fast"]["waited"], 0.05)
+        # Stage running in worker processes
+        stages = [pipeline.Stage("length", len, workers=2, processes=True)]
+        self.assertEqual(list(pipeline.Pipeline(stages).run(["a", "bb", "ccc"])), [1, 2, 3])
+
+    def test_reorderBound(self):
+        import time
+        from src.Table2Dict import pipeline
+        done = []
+        def work(item):
+            if item == 0:
+                time.sleep(0.2)
+            done.append(item)
+            return item
+        flow = pipeline.Pipeline([pipeline.Stage("work", work, workers=2, queueSize=4)])
+        self.assertEqual(list(flow.run(range(50))), list(range(50)))
+        # Items after a slow one are held back once reorder buffer is full
+        self.assertLess(done.index(0), flow.reorderSize)
+
+class test_TypeScan(unittest.TestCase):
+    '''
+    Test batched classification of tables (same results as getTableType(), columnar arrays).
+    '''
+    def setUp(self):
+        self.tablesFilesFolder = os.path.join(os.path.dirname(__file__), "Test_Wiki_Table/Test_Tables")
+        self.allFiles = [os.path.join(self.tablesFilesFolder, f) for f in sorted(os.listdir(self.tablesFilesFolder))]
+
+    def test_sameAsGetTableType(self):
+        from array import array
+        from src.Table2Dict import typeScan, wikitext
+        tableTypes = typeScan.classifyTables(self.allFiles)
+        self.assertEqual(len(tableTypes), len(self.allFiles))
+        self.assertTrue(all(isinstance(column, array) for column in tableTypes.columns.values()))
+        for index, file in enumerate(self.allFiles):
+            with self.subTest(file=file):
+                self.assertEqual(tableTypes.getTableType(index), Table2Dict.Table(file).getTableType())
+        expected2D = [index for index, file in enumerate(self.allFiles) if Table2Dict.Table(file).getTableType()["dimensions"] == "2D"]
+        self.assertEqual(tableTypes.indexesOf("2D"), expected2D)
+        self.assertEqual(len(tableTypes.indexesOf("1D")) + len(expected2D), len(self.allFiles))
+        # Tags & wikitext tables are classified from their rows
+        with open(self.allFiles[0]) as htmlFile:
+            tag = BeautifulSoup(htmlFile, "html.parser").find("table")
+        wikiTable = wikitext.parseWikitext('{|\n! Year !! Album\n|-\n| 1996 || Fantasy\n|}')[0]
+        tableTypes = typeScan.classifyTables([tag, wikiTable])
+        self.assertEqual(tableTypes.getTableType(0), Table2Dict.Table(tag).getTableType())
+        self.assertEqual(tableTypes.getTableType(1), Table2Dict.Table(wikiTable).getTableType())
+
+    def test_markupEdgeCases(self):
+        from src.Table2Dict import typeScan
+        pages = [
+            b"<table><tr>\n  <th>a</th>\n\t<th>b</th></tr><tr><td>1<td>2</tr></table>",
+            b"<table><tr><th>a</th><th>b</th></tr><tr><th>t</th><!-- c --><td>2</td></tr></table>",
+            b"<table><tr><th>a<br>x</br></th><th>b</th></tr><tr><th>t</th><td>2</td></tr></table>",
+            b"<table><tr><th>a</th><td><table><tr><th>n</th></tr></table></td></tr><tr><td>x</td><td>y</td></tr></table>",
+            b"<table>" + b"<tr><th>h</th><th>g</th></tr>" * 3 + b"<tr><td>a</td><td>b</td></tr>" * 20 + b"</table>",
+            b"<table><tr><th>a</th><th>b</th></tr><tr><th>t</th>&nbsp;<td>2</td></tr></table>",
+            b"<div><table><tr><th>a</th></div><tr><td>1</td></tr></table>",
+            b"<table><tr><th>a</th>\n\n<th/>\n</tr><tr><th>1</th><td>2</td></tr></table>",
+        ]
+        tableTypes = typeScan.classifyTables(pages)
+        for index, page in enumerate(pages):
+            with self.subTest(page=page):
+                table = BeautifulSoup(page.decode(), "html.parser").find("table")
+                self.assertEqual(tableTypes.getTableType(index), Table2Dict.Table(table).getTableType())
+        tableTypes = typeScan.classifyTables([b"<p>No table</p>", b"<table><tr><td>a</td><th>b</th></tr></table>"])
+        self.assertEqual(list(tableTypes.columns["dimensions"]), [typeScan.NO_TABLE, typeScan.UNKNOWN])
+        for index in range(2):
+            with self.assertRaises(TypeError):
+                tableTypes.getTableType(index)
+
 if __name__ == "__main__":
   unittest.main()
\ No newline at end of file